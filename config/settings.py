@@ -5,9 +5,6 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
-
 # Project paths
 BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR / "data"
@@ -16,15 +13,23 @@ PROCESSED_DATA_DIR = DATA_DIR / "processed"
 REPORTS_DIR = BASE_DIR / "reports"
 LOGS_DIR = BASE_DIR / "logs"
 
-# Create directories if not exist
-for dir_path in [RAW_DATA_DIR, PROCESSED_DATA_DIR, REPORTS_DIR, LOGS_DIR]:
-    dir_path.mkdir(parents=True, exist_ok=True)
+# Load environment variables (skip when env is injected, e.g. Docker/systemd)
+ENV_FILE = BASE_DIR / ".env"
+if os.getenv("SKIP_DOTENV") != "1" and ENV_FILE.exists():
+    load_dotenv(ENV_FILE)
+
+
+def ensure_dirs():
+    """데이터/리포트/로그 디렉토리 생성 (파일을 쓰는 컴포넌트에서 호출)"""
+    for dir_path in [RAW_DATA_DIR, PROCESSED_DATA_DIR, REPORTS_DIR, LOGS_DIR]:
+        dir_path.mkdir(parents=True, exist_ok=True)
+
 
 # API Configuration
 MUSICOW_API_URL = "https://data.musicow.com/files/v1/market/orders.json"
 API_TIMEOUT = 30  # seconds
 API_RETRY_COUNT = 3
-API_RETRY_DELAY = 5  # seconds
+API_RETRY_DELAY = 5  # seconds (미사용 - 재시도 간격은 urllib3 Retry 의 backoff 로 결정)
 
 # Data Collection
 COLLECTION_INTERVAL_MINUTES = 5  # 데이터 수집 주기 (분)
@@ -41,6 +46,7 @@ REFERENCE_PRICE = 10000  # 정규화 수익률 계산 기준가
 
 # Alert Configuration
 ALERT_SPREAD_THRESHOLD = 3.0  # 스프레드율 알림 기준 (%)
+ALERT_PREMIUM_THRESHOLD = ALERT_SPREAD_THRESHOLD  # 프리미엄율 알림 기준 (%) - 하위호환성 유지
 ALERT_YIELD_CHANGE = 2.0  # 수익률 변동 알림 기준 (%)
 ALERT_TIME_WINDOW = 10  # 변동 감지 시간 윈도우 (분)
 
@@ -1,8 +1,10 @@
 """
 지표 계산 엔진
 """
-from typing import Dict, List, Any, Optional
+from collections import defaultdict
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 
 from config.settings import (
@@ -10,15 +12,81 @@ from config.settings import (
     PREMIUM_THRESHOLD_LOW,
     LIQUIDITY_HIGH_SCORE,
     LIQUIDITY_LOW_SCORE,
-    REFERENCE_PRICE
+    REFERENCE_PRICE,
+    DATE_FORMAT
 )
 from src.utils.logger import setup_logger
 from src.utils.helpers import calculate_percentage, safe_get
 
 
+def _depth_score_ladder(counts: np.ndarray) -> np.ndarray:
+    """대기 주문 수 -> 깊이 점수 (0개 = 0점, 5개 = 50점, 10개 = 75점, 20개+ = 100점)"""
+    counts = counts.astype(np.float64)
+    score = np.select(
+        [counts == 0, counts <= 5, counts <= 10, counts <= 20],
+        [0.0, counts * 10, 50 + ((counts - 5) * 5), 75 + ((counts - 10) * 2.5)],
+        default=100.0
+    )
+    return np.clip(score, 0.0, 100.0)
+
+
+def _frequency_score_ladder(counts: np.ndarray) -> np.ndarray:
+    """최근 30분 주문 수 -> 빈도 점수 (0개 = 0점, 3개 = 50점, 10개+ = 100점)"""
+    counts = counts.astype(np.float64)
+    score = np.select(
+        [counts == 0, counts <= 3, counts <= 10],
+        [0.0, counts * 16.7, 50 + ((counts - 3) * 7.1)],
+        default=100.0
+    )
+    return np.clip(score, 0.0, 100.0)
+
+
+# 시그널 판정 기준 (모듈 로드 시 float 으로 한 번만 고정)
+SIGNAL_SPREAD_HIGH = float(PREMIUM_THRESHOLD_HIGH)
+SIGNAL_SPREAD_LOW = float(PREMIUM_THRESHOLD_LOW)
+SIGNAL_LIQUIDITY_HIGH = float(LIQUIDITY_HIGH_SCORE)
+SIGNAL_LIQUIDITY_LOW = float(LIQUIDITY_LOW_SCORE)
+
+# 시그널 테이블: (스프레드 구간, 유동성 구간) -> 시그널
+# 스프레드 구간: -1 저평가 / 0 보통 / 1 고평가
+# 유동성 구간: -1 유동성↓ / 0 보통 / 1 유동성↑
+SIGNAL_TABLE: Dict[Tuple[int, int], str] = {
+    (-1, -1): "저평가, 유동성↓",
+    (-1, 0): "저평가",
+    (-1, 1): "저평가, 유동성↑",
+    (0, -1): "유동성↓",
+    (0, 0): "보통",
+    (0, 1): "유동성↑",
+    (1, -1): "주의",  # 고평가 + 유동성 낮음
+    (1, 0): "고평가",
+    (1, 1): "고평가, 유동성↑",
+}
+
+# 배치 계산용: (스프레드 구간 + 1) * 3 + (유동성 구간 + 1) 위치에 시그널 배치
+SIGNAL_LABELS = np.array(
+    [SIGNAL_TABLE[(spread, liquidity)] for spread in (-1, 0, 1) for liquidity in (-1, 0, 1)],
+    dtype=object
+)
+
+# 점수 룩업 테이블 (마지막 칸 = 상한 이상 구간 점수)
+DEPTH_SCORE_TABLE = _depth_score_ladder(np.arange(22))
+FREQUENCY_SCORE_TABLE = _frequency_score_ladder(np.arange(12))
+
+
 class MetricsEngine:
     """지표 계산 엔진"""
 
+    # 배치 계산에 사용하는 주문 필드
+    BATCH_COLUMNS = [
+        "song_name",
+        "order_type",
+        "order_status",
+        "order_date",
+        "order_price",
+        "recent_price",
+        "order_royalty_rate"
+    ]
+
     def __init__(self):
         """초기화"""
         self.logger = setup_logger(__name__, "metrics_engine.log")
@@ -81,7 +149,8 @@ class MetricsEngine:
     def calculate_liquidity_score(
         self,
         orders: List[Dict[str, Any]],
-        song_name: str
+        song_name: str,
+        song_orders: Optional[List[Dict[str, Any]]] = None
     ) -> float:
         """
         유동성 점수 계산 (0-100)
@@ -94,22 +163,26 @@ class MetricsEngine:
         Args:
             orders: 전체 주문 데이터
             song_name: 곡 이름
+            song_orders: 미리 곡별로 묶인 주문 데이터 (있으면 재필터링 생략)
 
         Returns:
             유동성 점수 (0-100)
         """
         try:
             # 해당 곡의 주문만 필터링
-            song_orders = [o for o in orders if o.get("song_name") == song_name]
+            if song_orders is None:
+                song_orders = [o for o in orders if o.get("song_name") == song_name]
 
             if not song_orders:
                 return 0.0
 
+            max_buy_price, min_sell_price, waiting_count = self._summarize_order_book(song_orders)
+
             # 1. 호가 스프레드 점수 (40%)
-            spread_score = self._calculate_spread_score(song_orders)
+            spread_score = self._score_spread(max_buy_price, min_sell_price)
 
             # 2. 주문 깊이 점수 (30%)
-            depth_score = self._calculate_depth_score(song_orders)
+            depth_score = self._score_depth(waiting_count)
 
             # 3. 갱신 빈도 점수 (30%)
             frequency_score = self._calculate_frequency_score(song_orders)
@@ -127,100 +200,164 @@ class MetricsEngine:
             self.logger.warning(f"유동성 점수 계산 실패 ({song_name}): {e}")
             return 0.0
 
-    def _calculate_spread_score(self, song_orders: List[Dict[str, Any]]) -> float:
+    def _summarize_order_book(
+        self,
+        song_orders: List[Dict[str, Any]]
+    ) -> Tuple[Optional[float], Optional[float], int]:
         """
-        호가 스프레드 점수 계산
-
-        스프레드가 작을수록 높은 점수
+        대기 중인 호가 요약 (한 번의 순회로 계산)
 
         Args:
             song_orders: 특정 곡의 주문 데이터
 
+        Returns:
+            (최고 매수가, 최저 매도가, 대기 주문 수) - 매수/매도 호가가 없으면 None
+        """
+        max_buy_price = None
+        min_sell_price = None
+        waiting_count = 0
+
+        for o in song_orders:
+            if o.get("order_status") != "대기":
+                continue
+            waiting_count += 1
+
+            order_type = o.get("order_type")
+            if order_type == "구매":
+                price = o.get("order_price", 0)
+                if max_buy_price is None or price > max_buy_price:
+                    max_buy_price = price
+            elif order_type == "판매" and "order_price" in o:
+                price = o["order_price"]
+                if min_sell_price is None or price < min_sell_price:
+                    min_sell_price = price
+
+        return max_buy_price, min_sell_price, waiting_count
+
+    def _score_spread(
+        self,
+        max_buy_price: Optional[float],
+        min_sell_price: Optional[float]
+    ) -> float:
+        """
+        최고 매수가/최저 매도가로 호가 스프레드 점수 계산
+
+        Args:
+            max_buy_price: 대기 중인 최고 매수가 (없으면 None/NaN)
+            min_sell_price: 대기 중인 최저 매도가 (없으면 None/NaN)
+
         Returns:
             스프레드 점수 (0-100)
         """
-        try:
-            # 대기 중인 매수/매도 주문 필터링
-            buy_orders = [
-                o for o in song_orders
-                if o.get("order_type") == "구매" and o.get("order_status") == "대기"
-            ]
-            sell_orders = [
-                o for o in song_orders
-                if o.get("order_type") == "판매" and o.get("order_status") == "대기"
-            ]
+        scores = self._score_spread_array(
+            np.array([np.nan if max_buy_price is None else max_buy_price], dtype=np.float64),
+            np.array([np.nan if min_sell_price is None else min_sell_price], dtype=np.float64)
+        )
+        return float(scores[0])
 
-            if not buy_orders or not sell_orders:
-                return 50.0  # 기본 점수
+    def _score_spread_array(
+        self,
+        max_buy_prices: np.ndarray,
+        min_sell_prices: np.ndarray
+    ) -> np.ndarray:
+        """
+        호가 스프레드 점수 (배열 버전)
+
+        스프레드율이 작을수록 높은 점수
+        0% = 100점, 5% = 75점, 10% = 50점, 20%+ = 0점
+        매수/매도 호가 중 하나라도 없으면 기본 점수 50점
+
+        Args:
+            max_buy_prices: 곡별 최고 매수가 (없으면 NaN)
+            min_sell_prices: 곡별 최저 매도가 (없으면 NaN)
+
+        Returns:
+            스프레드 점수 배열 (0-100)
+        """
+        # 호가가 온전한 곡만 계산하고 나머지는 기본 점수 50점
+        valid = (
+            np.isfinite(max_buy_prices) & np.isfinite(min_sell_prices) &
+            (max_buy_prices != 0)
+        )
+        scores = np.full(max_buy_prices.shape, 50.0)
+
+        max_buy = max_buy_prices[valid]
+        spread_rate = ((min_sell_prices[valid] - max_buy) / max_buy) * 100
+        score = np.select(
+            [spread_rate <= 0, spread_rate <= 5, spread_rate <= 10, spread_rate <= 20],
+            [100.0, 100 - (spread_rate * 5), 75 - ((spread_rate - 5) * 5), 50 - ((spread_rate - 10) * 5)],
+            default=0.0
+        )
+        scores[valid] = np.clip(score, 0.0, 100.0)
+        return scores
+
+    def _score_depth(self, waiting_count: int) -> float:
+        """
+        대기 주문 수로 주문 깊이 점수 계산
 
-            # 최고 매수가와 최저 매도가
-            max_buy_price = max(o.get("order_price", 0) for o in buy_orders)
-            min_sell_price = min(o.get("order_price", float('inf')) for o in sell_orders)
+        Args:
+            waiting_count: 대기 중인 주문 개수
 
-            if min_sell_price == float('inf') or max_buy_price == 0:
-                return 50.0
+        Returns:
+            깊이 점수 (0-100)
+        """
+        return float(self._score_depth_array(np.array([waiting_count]))[0])
 
-            # 스프레드율 계산
-            spread_rate = ((min_sell_price - max_buy_price) / max_buy_price) * 100
+    def _score_depth_array(self, waiting_counts: np.ndarray) -> np.ndarray:
+        """
+        주문 깊이 점수 (배열 버전)
 
-            # 스프레드율이 작을수록 높은 점수
-            # 0% = 100점, 5% = 75점, 10% = 50점, 20%+ = 0점
-            if spread_rate <= 0:
-                score = 100.0
-            elif spread_rate <= 5:
-                score = 100 - (spread_rate * 5)
-            elif spread_rate <= 10:
-                score = 75 - ((spread_rate - 5) * 5)
-            elif spread_rate <= 20:
-                score = 50 - ((spread_rate - 10) * 5)
-            else:
-                score = 0.0
+        DEPTH_SCORE_TABLE 룩업 (20개 초과는 마지막 칸으로 클램프)
 
-            return max(0.0, min(100.0, score))
+        Args:
+            waiting_counts: 곡별 대기 주문 개수
 
-        except Exception as e:
-            self.logger.warning(f"스프레드 점수 계산 실패: {e}")
-            return 50.0
+        Returns:
+            깊이 점수 배열 (0-100)
+        """
+        counts = np.asarray(waiting_counts, dtype=np.int64)
+        return DEPTH_SCORE_TABLE[np.clip(counts, 0, len(DEPTH_SCORE_TABLE) - 1)]
 
-    def _calculate_depth_score(self, song_orders: List[Dict[str, Any]]) -> float:
+    def _score_frequency_array(self, recent_counts: np.ndarray) -> np.ndarray:
         """
-        주문 깊이 점수 계산
+        갱신 빈도 점수 (배열 버전)
 
-        대기 중인 주문이 많을수록 높은 점수
+        FREQUENCY_SCORE_TABLE 룩업 (10개 초과는 마지막 칸으로 클램프)
 
         Args:
-            song_orders: 특정 곡의 주문 데이터
+            recent_counts: 곡별 최근 30분 주문 개수
 
         Returns:
-            깊이 점수 (0-100)
+            빈도 점수 배열 (0-100)
         """
-        try:
-            # 대기 중인 주문 개수
-            waiting_orders = [
-                o for o in song_orders
-                if o.get("order_status") == "대기"
-            ]
+        counts = np.asarray(recent_counts, dtype=np.int64)
+        return FREQUENCY_SCORE_TABLE[np.clip(counts, 0, len(FREQUENCY_SCORE_TABLE) - 1)]
 
-            waiting_count = len(waiting_orders)
+    def _count_recent_orders(self, song_orders: List[Dict[str, Any]]) -> int:
+        """
+        최근 30분 이내 주문 개수 계산
 
-            # 주문 개수에 따른 점수
-            # 0개 = 0점, 5개 = 50점, 10개 = 75점, 20개+ = 100점
-            if waiting_count == 0:
-                score = 0.0
-            elif waiting_count <= 5:
-                score = waiting_count * 10
-            elif waiting_count <= 10:
-                score = 50 + ((waiting_count - 5) * 5)
-            elif waiting_count <= 20:
-                score = 75 + ((waiting_count - 10) * 2.5)
-            else:
-                score = 100.0
-
-            return max(0.0, min(100.0, score))
+        Args:
+            song_orders: 특정 곡의 주문 데이터
 
-        except Exception as e:
-            self.logger.warning(f"깊이 점수 계산 실패: {e}")
-            return 50.0
+        Returns:
+            최근 주문 개수
+        """
+        now = datetime.now()
+        recent_threshold = now - timedelta(minutes=30)  # 최근 30분
+
+        recent_count = 0
+        for order in song_orders:
+            order_date_str = order.get("order_date")
+            if order_date_str:
+                try:
+                    order_date = datetime.strptime(order_date_str, "%Y-%m-%d %H:%M:%S")
+                    if order_date >= recent_threshold:
+                        recent_count += 1
+                except (ValueError, TypeError):
+                    continue
+
+        return recent_count
 
     def _calculate_frequency_score(self, song_orders: List[Dict[str, Any]]) -> float:
         """
@@ -234,39 +371,8 @@ class MetricsEngine:
         Returns:
             빈도 점수 (0-100)
         """
-        try:
-            now = datetime.now()
-            recent_threshold = now - timedelta(minutes=30)  # 최근 30분
-
-            recent_orders = []
-            for order in song_orders:
-                order_date_str = order.get("order_date")
-                if order_date_str:
-                    try:
-                        order_date = datetime.strptime(order_date_str, "%Y-%m-%d %H:%M:%S")
-                        if order_date >= recent_threshold:
-                            recent_orders.append(order)
-                    except ValueError:
-                        continue
-
-            recent_count = len(recent_orders)
-
-            # 최근 30분 주문 개수에 따른 점수
-            # 0개 = 0점, 3개 = 50점, 10개+ = 100점
-            if recent_count == 0:
-                score = 0.0
-            elif recent_count <= 3:
-                score = recent_count * 16.7
-            elif recent_count <= 10:
-                score = 50 + ((recent_count - 3) * 7.1)
-            else:
-                score = 100.0
-
-            return max(0.0, min(100.0, score))
-
-        except Exception as e:
-            self.logger.warning(f"빈도 점수 계산 실패: {e}")
-            return 50.0
+        recent_count = self._count_recent_orders(song_orders)
+        return float(self._score_frequency_array(np.array([recent_count]))[0])
 
     def calculate_fair_value(
         self,
@@ -315,36 +421,55 @@ class MetricsEngine:
         Returns:
             시그널 문자열
         """
-        signals = []
-
-        # 스프레드율 기준 평가
+        # 스프레드율 구간
+        spread_bucket = 0
         if spread_rate is not None:
-            if spread_rate < PREMIUM_THRESHOLD_LOW:  # -10% 이하
-                signals.append("저평가")
-            elif spread_rate > PREMIUM_THRESHOLD_HIGH:  # +10% 이상
-                signals.append("고평가")
-
-        # 유동성 기반 시그널
-        if liquidity_score > LIQUIDITY_HIGH_SCORE:
-            signals.append("유동성↑")
-        elif liquidity_score < LIQUIDITY_LOW_SCORE:
-            signals.append("유동성↓")
-
-        # 주의 시그널 (고평가 + 유동성 낮음)
-        is_overvalued = "고평가" in signals
-        if is_overvalued and liquidity_score < LIQUIDITY_LOW_SCORE:
-            return "주의"
-
-        # 시그널 조합
-        if signals:
-            return ", ".join(signals)
-        else:
-            return "보통"
+            if spread_rate < SIGNAL_SPREAD_LOW:  # -10% 이하
+                spread_bucket = -1
+            elif spread_rate > SIGNAL_SPREAD_HIGH:  # +10% 이상
+                spread_bucket = 1
+
+        # 유동성 구간
+        liquidity_bucket = 0
+        if liquidity_score > SIGNAL_LIQUIDITY_HIGH:
+            liquidity_bucket = 1
+        elif liquidity_score < SIGNAL_LIQUIDITY_LOW:
+            liquidity_bucket = -1
+
+        return SIGNAL_TABLE[(spread_bucket, liquidity_bucket)]
+
+    def _generate_signal_array(
+        self,
+        spread_rates: np.ndarray,
+        liquidity_scores: np.ndarray
+    ) -> np.ndarray:
+        """
+        시그널 생성 (배열 버전)
+
+        generate_signal 과 같은 구간 판정을 배열로 수행한 뒤 SIGNAL_LABELS 에서 꺼낸다.
+
+        Args:
+            spread_rates: 스프레드율 배열 (계산 불가 시 NaN)
+            liquidity_scores: 유동성 점수 배열
+
+        Returns:
+            시그널 문자열 배열 (object)
+        """
+        spread_buckets = (
+            (spread_rates > SIGNAL_SPREAD_HIGH).astype(np.int64) -
+            (spread_rates < SIGNAL_SPREAD_LOW).astype(np.int64)
+        )
+        liquidity_buckets = (
+            (liquidity_scores > SIGNAL_LIQUIDITY_HIGH).astype(np.int64) -
+            (liquidity_scores < SIGNAL_LIQUIDITY_LOW).astype(np.int64)
+        )
+        return SIGNAL_LABELS[(spread_buckets + 1) * 3 + (liquidity_buckets + 1)]
 
     def calculate_order_metrics(
         self,
         order: Dict[str, Any],
-        all_orders: List[Dict[str, Any]]
+        all_orders: List[Dict[str, Any]],
+        liquidity_score: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         단일 주문의 모든 지표 계산
@@ -352,6 +477,7 @@ class MetricsEngine:
         Args:
             order: 주문 데이터
             all_orders: 전체 주문 데이터 (유동성 계산용)
+            liquidity_score: 미리 계산된 유동성 점수 (배치 처리 시 곡별 재사용)
 
         Returns:
             계산된 지표가 포함된 주문 데이터
@@ -366,21 +492,20 @@ class MetricsEngine:
             # 지표 계산
             spread_rate = self.calculate_spread_rate(order_price, recent_price)
             expected_yield = self.calculate_expected_yield(order_royalty_rate, order_price)
-            liquidity_score = self.calculate_liquidity_score(all_orders, song_name)
+            if liquidity_score is None:
+                liquidity_score = self.calculate_liquidity_score(all_orders, song_name)
             fair_value = self.calculate_fair_value(order_royalty_rate)
             signal = self.generate_signal(spread_rate, liquidity_score, recent_price, fair_value)
 
             # 결과 생성
-            result = order.copy()
-            result.update({
+            return {
+                **order,
                 "spread_rate": spread_rate,
                 "expected_yield": expected_yield,
                 "liquidity_score": liquidity_score,
                 "fair_value": fair_value,
                 "signal": signal
-            })
-
-            return result
+            }
 
         except Exception as e:
             self.logger.error(f"지표 계산 실패: {e}")
@@ -389,7 +514,8 @@ class MetricsEngine:
     def calculate_price_momentum(
         self,
         all_orders: List[Dict[str, Any]],
-        song_name: str
+        song_name: str,
+        song_orders: Optional[List[Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
         """
         가격 모멘텀 지표 계산
@@ -399,18 +525,45 @@ class MetricsEngine:
         Args:
             all_orders: 전체 주문 데이터
             song_name: 곡명
+            song_orders: 미리 곡별로 묶인 주문 데이터 (있으면 곡명 필터링 생략)
 
         Returns:
             모멘텀 지표 딕셔너리
         """
         try:
-            # 해당 곡의 대기 중인 주문만 필터링
-            song_orders = [
-                o for o in all_orders
-                if o.get("song_name") == song_name and o.get("order_status") == "대기"
-            ]
+            if song_orders is None:
+                song_orders = [o for o in all_orders if o.get("song_name") == song_name]
+
+            # 대기 주문만 한 번 순회하며 최근가/최고 매수가/최저 매도가/가격 범위 집계
+            waiting_count = 0
+            recent_price = 0
+            max_buy_price = None
+            min_sell_price = None
+            min_price = None
+            max_price = None
+
+            for o in song_orders:
+                if o.get("order_status") != "대기":
+                    continue
+                if waiting_count == 0:
+                    recent_price = safe_get(o, "recent_price", 0)
+                waiting_count += 1
+
+                order_price = o.get("order_price", 0)
+                if min_price is None or order_price < min_price:
+                    min_price = order_price
+                if max_price is None or order_price > max_price:
+                    max_price = order_price
+
+                order_type = o.get("order_type")
+                if order_type == "구매":
+                    if max_buy_price is None or order_price > max_buy_price:
+                        max_buy_price = order_price
+                elif order_type == "판매" and "order_price" in o:
+                    if min_sell_price is None or order_price < min_sell_price:
+                        min_sell_price = order_price
 
-            if not song_orders:
+            if waiting_count == 0:
                 return {
                     "momentum_score": 0.0,
                     "buy_pressure": 0.0,
@@ -419,53 +572,35 @@ class MetricsEngine:
                     "price_range": (0, 0)
                 }
 
-            # 최근가 가져오기
-            recent_price = safe_get(song_orders[0], "recent_price", 0)
+            # 최근가가 없으면 압력 계산 불가
             if recent_price <= 0:
                 return {
                     "momentum_score": 0.0,
                     "buy_pressure": 0.0,
                     "sell_pressure": 0.0,
-                    "waiting_count": len(song_orders),
+                    "waiting_count": waiting_count,
                     "price_range": (0, 0)
                 }
 
-            # 매수/매도 주문 분리
-            buy_orders = [
-                o for o in song_orders
-                if o.get("order_type") == "구매"
-            ]
-            sell_orders = [
-                o for o in song_orders
-                if o.get("order_type") == "판매"
-            ]
-
             # 매수 압력 계산: (최고 매수가 / 최근가 - 1) × 100
             buy_pressure = 0.0
-            if buy_orders:
-                max_buy_price = max(o.get("order_price", 0) for o in buy_orders)
+            if max_buy_price is not None:
                 buy_pressure = ((max_buy_price / recent_price) - 1) * 100
 
             # 매도 압력 계산: (최저 매도가 / 최근가 - 1) × 100
             sell_pressure = 0.0
-            if sell_orders:
-                min_sell_price = min(o.get("order_price", float('inf')) for o in sell_orders)
-                if min_sell_price != float('inf'):
-                    sell_pressure = ((min_sell_price / recent_price) - 1) * 100
+            if min_sell_price is not None:
+                sell_pressure = ((min_sell_price / recent_price) - 1) * 100
 
             # 모멘텀 점수 = 매수 압력 - 매도 압력
             momentum_score = buy_pressure - sell_pressure
 
-            # 가격 범위
-            all_prices = [o.get("order_price", 0) for o in song_orders]
-            price_range = (min(all_prices), max(all_prices))
-
             return {
                 "momentum_score": round(momentum_score, 2),
                 "buy_pressure": round(buy_pressure, 2),
                 "sell_pressure": round(sell_pressure, 2),
-                "waiting_count": len(song_orders),
-                "price_range": price_range
+                "waiting_count": waiting_count,
+                "price_range": (min_price, max_price)
             }
 
         except Exception as e:
@@ -478,6 +613,219 @@ class MetricsEngine:
                 "price_range": (0, 0)
             }
 
+    def calculate_batch_momentum(
+        self,
+        all_orders: List[Dict[str, Any]],
+        song_names: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        여러 곡의 가격 모멘텀 일괄 계산
+
+        주문을 곡별로 한 번만 묶고, 곡당 한 번만 calculate_price_momentum 을 호출한다.
+
+        Args:
+            all_orders: 전체 주문 데이터
+            song_names: 계산할 곡명 목록 (기본값: 주문에 등장하는 모든 곡)
+
+        Returns:
+            곡명 -> 모멘텀 지표 딕셔너리
+        """
+        by_song = defaultdict(list)
+        for order in all_orders:
+            by_song[order.get("song_name")].append(order)
+
+        if song_names is None:
+            song_names = list(by_song)
+
+        momentum_cache: Dict[str, Dict[str, Any]] = {}
+        for song_name in song_names:
+            if song_name not in momentum_cache:
+                momentum_cache[song_name] = self.calculate_price_momentum(
+                    all_orders, song_name, song_orders=by_song.get(song_name, [])
+                )
+
+        return momentum_cache
+
+    def _build_order_frame(
+        self,
+        orders: List[Dict[str, Any]],
+        records: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
+        """
+        배치 계산에 필요한 컬럼만 담은 DataFrame 생성
+
+        주문 dict 를 한 번만 순회해 필요한 필드를 컬럼(SoA)으로 옮긴다.
+        숫자 컬럼은 float64 로 변환한다. 키가 없는 필드는 calculate_order_metrics 의
+        safe_get 기본값과 같이 0 으로 채우고, None 이나 변환할 수 없는 값은 NaN 으로 둔다.
+        (매도 호가 집계용으로 order_price 키 존재 여부를 has_order_price 컬럼에 기록)
+
+        Args:
+            orders: 주문 데이터 리스트
+            records: orders 전체를 이미 변환한 DataFrame (있으면 dict 를 다시 순회하지 않고 컬럼만 선택)
+
+        Returns:
+            주문 순서를 그대로 유지한 DataFrame
+        """
+        if records is None:
+            frame = pd.DataFrame.from_records(orders, columns=self.BATCH_COLUMNS)
+        else:
+            frame = records.reindex(columns=self.BATCH_COLUMNS)
+        frame["order_date"] = pd.to_datetime(
+            frame["order_date"],
+            format=DATE_FORMAT,
+            errors="coerce",
+            cache=True
+        )
+        for key in ("order_price", "recent_price", "order_royalty_rate"):
+            values = frame[key].to_numpy(dtype=object, copy=True)
+            # 값이 비어 있는 행만 원본 dict 에서 키 존재 여부 확인
+            absent = np.array(
+                [i for i in np.flatnonzero(pd.isna(values)) if key not in orders[i]], dtype=np.intp
+            )
+            values[absent] = 0
+            frame[key] = pd.to_numeric(values, errors="coerce").astype(np.float64)
+            if key == "order_price":
+                has_key = np.ones(len(frame), dtype=bool)
+                has_key[absent] = False
+                frame["has_order_price"] = has_key
+        return frame
+
+    def _compute_song_aggregates(
+        self,
+        frame: pd.DataFrame,
+        now: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """
+        곡별 호가 집계 계산
+
+        곡명을 정수 코드로 바꾼 뒤, 평탄한 배열 위에서 bincount / fmax.at / fmin.at
+        으로 모든 곡을 한 번에 집계한다 (곡별 마스킹·groupby 반복 없음).
+
+        Args:
+            frame: _build_order_frame 결과
+            now: 최근 주문 판단 기준 시각 (기본값: 현재 시각)
+
+        Returns:
+            곡명 인덱스, max_buy_price / min_sell_price / waiting_count / recent_count 컬럼
+        """
+        # 곡명이 없는 주문은 코드 -1 (어느 곡의 호가에도 포함하지 않음)
+        song_codes, songs = pd.factorize(frame["song_name"])
+        song_count = len(songs)
+        has_song = song_codes >= 0
+
+        prices = frame["order_price"].to_numpy()
+        waiting = (frame["order_status"] == "대기").to_numpy() & has_song
+        is_buy = waiting & (frame["order_type"] == "구매").to_numpy()
+        # 매도 호가는 order_price 키가 있는 주문만 (_summarize_order_book 과 동일)
+        is_sell = waiting & (frame["order_type"] == "판매").to_numpy() & frame["has_order_price"].to_numpy()
+
+        # NaN 에서 시작해 fmax/fmin 으로 축약 (NaN 은 무시되므로 호가가 없는 곡만 NaN 으로 남음)
+        max_buy_prices = np.full(song_count, np.nan)
+        np.fmax.at(max_buy_prices, song_codes[is_buy], prices[is_buy])
+        min_sell_prices = np.full(song_count, np.nan)
+        np.fmin.at(min_sell_prices, song_codes[is_sell], prices[is_sell])
+
+        # 최근 30분 주문 수 (order_date 는 프레임 생성 시 한 번만 파싱됨)
+        now = now or datetime.now()
+        recent_threshold = pd.Timestamp(now - timedelta(minutes=30))
+        recent = (frame["order_date"] >= recent_threshold).to_numpy() & has_song
+
+        return pd.DataFrame(
+            {
+                "max_buy_price": max_buy_prices,
+                "min_sell_price": min_sell_prices,
+                "waiting_count": np.bincount(song_codes[waiting], minlength=song_count),
+                "recent_count": np.bincount(song_codes[recent], minlength=song_count),
+            },
+            index=pd.Index(songs, name="song_name")
+        )
+
+    def _calculate_price_metrics(self, frame: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        가격 기반 지표를 배열 단위로 한 번에 계산
+
+        calculate_spread_rate / calculate_expected_yield / calculate_fair_value 의
+        벡터화 버전. 계산할 수 없는 값은 NaN 으로 채운다.
+
+        Args:
+            frame: _build_order_frame 결과
+
+        Returns:
+            지표명 -> 주문 순서와 같은 float64 배열
+        """
+        order_price = frame["order_price"].to_numpy()
+        recent_price = frame["recent_price"].to_numpy()
+        royalty_rate = frame["order_royalty_rate"].to_numpy()
+
+        # 0 나누기/결측 행은 미리 마스킹하고 유효한 행만 계산
+        spread_rate = np.full(len(frame), np.nan)
+        valid = np.isfinite(order_price) & np.isfinite(recent_price) & (recent_price != 0)
+        spread_rate[valid] = (order_price[valid] - recent_price[valid]) / recent_price[valid] * 100
+
+        # 공정가치는 컬럼 전체에 한 번만 곱하고, 예상 수익률 계산에 그대로 재사용
+        # (royalty_rate × 기준단가 / order_price 와 같은 연산 순서)
+        fair_value = royalty_rate * self.reference_price
+
+        expected_yield = np.full(len(frame), np.nan)
+        valid = np.isfinite(fair_value) & np.isfinite(order_price) & (order_price != 0)
+        expected_yield[valid] = fair_value[valid] / order_price[valid] * 100
+
+        return {
+            "spread_rate": np.round(spread_rate, 2),
+            "expected_yield": np.round(expected_yield, 2),
+            "fair_value": fair_value
+        }
+
+    def _calculate_metric_columns(
+        self,
+        orders: List[Dict[str, Any]],
+        records: Optional[pd.DataFrame] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        배치 주문 지표를 컬럼(배열) 단위로 계산
+
+        Args:
+            orders: 주문 데이터 리스트
+            records: orders 전체를 이미 변환한 DataFrame (선택사항)
+
+        Returns:
+            지표명 -> 주문 순서와 같은 배열 (계산 불가 값은 NaN)
+        """
+        batch_started_at = datetime.now()
+
+        frame = self._build_order_frame(orders, records)
+
+        # 가격 지표는 전체 주문에 대해 배열 연산으로 한 번에 계산
+        price_metrics = self._calculate_price_metrics(frame)
+
+        # 유동성 점수는 곡별 집계로 곡당 한 번만 계산한 뒤 주문별로 펼침
+        aggregates = self._compute_song_aggregates(frame, now=batch_started_at)
+        spread_scores = self._score_spread_array(
+            aggregates["max_buy_price"].to_numpy(dtype=np.float64),
+            aggregates["min_sell_price"].to_numpy(dtype=np.float64)
+        )
+        depth_scores = self._score_depth_array(aggregates["waiting_count"].to_numpy())
+        frequency_scores = self._score_frequency_array(aggregates["recent_count"].to_numpy())
+        liquidity_scores = np.round(
+            spread_scores * 0.4 + depth_scores * 0.3 + frequency_scores * 0.3, 1
+        )
+        # 곡명이 없는 주문은 호가가 없으므로 0점 (calculate_liquidity_score 와 동일)
+        song_positions = aggregates.index.get_indexer(frame["song_name"])
+        has_book = song_positions >= 0
+        order_liquidity = np.zeros(len(frame))
+        order_liquidity[has_book] = liquidity_scores[song_positions[has_book]]
+
+        # 시그널은 구간 코드로 테이블에서 한 번에 조회
+        signals = self._generate_signal_array(price_metrics["spread_rate"], order_liquidity)
+
+        return {
+            "spread_rate": price_metrics["spread_rate"],
+            "expected_yield": price_metrics["expected_yield"],
+            "liquidity_score": order_liquidity,
+            "fair_value": price_metrics["fair_value"],
+            "signal": signals
+        }
+
     def calculate_batch_metrics(
         self,
         orders: List[Dict[str, Any]]
@@ -494,17 +842,45 @@ class MetricsEngine:
         try:
             self.logger.info(f"배치 지표 계산 시작: {len(orders)}개 주문")
 
-            results = []
-            for i, order in enumerate(orders):
-                result = self.calculate_order_metrics(order, orders)
-                results.append(result)
-
-                if (i + 1) % 100 == 0:
-                    self.logger.info(f"진행: {i + 1}/{len(orders)} 완료")
+            # 지표 컬럼을 한 번에 레코드로 변환 (NaN -> None) 후 원본 주문과 병합
+            metrics = pd.DataFrame(self._calculate_metric_columns(orders))
+            metrics = metrics.astype(object).where(metrics.notna(), None)
+            results = [
+                {**order, **order_metrics}
+                for order, order_metrics in zip(orders, metrics.to_dict(orient="records"))
+            ]
 
             self.logger.info(f"배치 지표 계산 완료: {len(results)}개")
             return results
 
         except Exception as e:
             self.logger.error(f"배치 지표 계산 실패: {e}")
-            return orders
\ No newline at end of file
+            return orders
+
+    def calculate_batch_metrics_frame(self, orders: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        배치 주문 지표 계산 (DataFrame 반환)
+
+        calculate_batch_metrics 와 같은 지표를 주문별 dict 로 펼치지 않고
+        원본 필드 DataFrame 에 지표 배열을 컬럼으로 바로 붙인다 (대시보드용).
+
+        Args:
+            orders: 주문 데이터 리스트
+
+        Returns:
+            원본 필드 + 지표 컬럼 DataFrame (계산 불가 지표는 NaN)
+        """
+        frame = pd.DataFrame.from_records(orders)
+        try:
+            self.logger.info(f"배치 지표 계산 시작: {len(orders)}개 주문")
+
+            # 원본 필드 DataFrame 에서 계산용 컬럼을 바로 선택 (주문 dict 재순회 없음)
+            for key, values in self._calculate_metric_columns(orders, frame).items():
+                frame[key] = values
+
+            self.logger.info(f"배치 지표 계산 완료: {len(frame)}개")
+
+        except Exception as e:
+            self.logger.error(f"배치 지표 계산 실패: {e}")
+
+        return frame
\ No newline at end of file
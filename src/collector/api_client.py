@@ -1,8 +1,8 @@
 """
 뮤직카우 API 클라이언트
 """
-import time
 from typing import List, Dict, Any, Optional
+from urllib.parse import urlsplit
 import requests
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
@@ -10,11 +10,11 @@ from requests.packages.urllib3.util.retry import Retry
 from config.settings import (
     MUSICOW_API_URL,
     API_TIMEOUT,
-    API_RETRY_COUNT,
-    API_RETRY_DELAY
+    API_RETRY_COUNT
 )
 from src.utils.logger import setup_logger
 from src.utils.validators import DataValidator
+from src.utils.serialization import loads
 
 
 class MusicowAPIClient:
@@ -43,12 +43,18 @@ class MusicowAPIClient:
             total=API_RETRY_COUNT,
             status_forcelist=[429, 500, 502, 503, 504],
             allowed_methods=["GET"],
-            backoff_factor=1
+            backoff_factor=1,
+            respect_retry_after_header=True
         )
 
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
+        # 뮤직카우 호스트 전용 커넥션 풀 (단일 호스트 폴링이므로 연결 1개를 계속 재사용)
+        api_url = urlsplit(self.api_url)
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=1,
+            max_retries=retry_strategy
+        )
+        session.mount(f"{api_url.scheme}://{api_url.netloc}", adapter)
 
         # 헤더 설정
         session.headers.update({
@@ -75,8 +81,8 @@ class MusicowAPIClient:
             # 상태 코드 확인
             response.raise_for_status()
 
-            # JSON 파싱
-            data = response.json()
+            # JSON 파싱 (바이트 그대로 파싱 - orjson 사용 가능 시 orjson)
+            data = loads(response.content)
 
             if not isinstance(data, list):
                 self.logger.error(f"예상치 못한 응답 형식: {type(data)}")
@@ -101,31 +107,14 @@ class MusicowAPIClient:
             self.logger.error(f"요청 에러: {e}")
             return None
 
+        except ValueError as e:
+            self.logger.error(f"JSON 파싱 에러: {e}")
+            return None
+
         except Exception as e:
             self.logger.error(f"예상치 못한 에러: {e}")
             return None
 
-    def fetch_orders_with_retry(self) -> Optional[List[Dict[str, Any]]]:
-        """
-        재시도 로직이 포함된 주문 데이터 가져오기
-
-        Returns:
-            주문 데이터 리스트 또는 None
-        """
-        for attempt in range(API_RETRY_COUNT):
-            self.logger.info(f"API 호출 시도 {attempt + 1}/{API_RETRY_COUNT}")
-
-            data = self.fetch_orders()
-            if data is not None:
-                return data
-
-            if attempt < API_RETRY_COUNT - 1:
-                self.logger.info(f"{API_RETRY_DELAY}초 후 재시도...")
-                time.sleep(API_RETRY_DELAY)
-
-        self.logger.error(f"API 호출 실패: {API_RETRY_COUNT}번 시도 후 포기")
-        return None
-
     def validate_orders(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         주문 데이터 검증 및 필터링
@@ -136,20 +125,21 @@ class MusicowAPIClient:
         Returns:
             검증된 주문 데이터
         """
-        validated_orders = []
-        invalid_count = 0
+        # 유효성 판정은 에러 메시지 생성 없는 빠른 경로 사용
+        validated_orders = list(filter(self.validator.is_valid_order, orders))
+        invalid_count = len(orders) - len(validated_orders)
 
-        for order in orders:
-            is_valid, errors = self.validator.validate_order(order)
-
-            if is_valid:
-                validated_orders.append(order)
-            else:
-                invalid_count += 1
-                if invalid_count <= 3:  # 처음 3개만 로깅
+        if invalid_count > 0:
+            # 처음 3개만 상세 에러 로깅
+            logged = 0
+            for order in orders:
+                is_valid, errors = self.validator.validate_order(order)
+                if not is_valid:
                     self.logger.warning(f"유효하지 않은 주문: {errors}")
+                    logged += 1
+                    if logged >= 3:
+                        break
 
-        if invalid_count > 0:
             self.logger.warning(f"총 {invalid_count}개의 유효하지 않은 주문 제외")
 
         self.logger.info(f"검증 완료: {len(validated_orders)}/{len(orders)} 유효")
@@ -162,8 +152,8 @@ class MusicowAPIClient:
         Returns:
             검증된 주문 데이터 리스트 또는 None
         """
-        # API 호출
-        orders = self.fetch_orders_with_retry()
+        # API 호출 (재시도는 세션의 urllib3 Retry 가 처리)
+        orders = self.fetch_orders()
         if orders is None:
             return None
 
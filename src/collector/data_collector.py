@@ -1,10 +1,11 @@
 """
 데이터 수집기
 """
+import heapq
 import json
-import time
-import schedule
+import threading
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
@@ -20,6 +21,13 @@ from src.utils.logger import setup_logger
 from src.utils.helpers import save_json, load_json, get_timestamp, remove_duplicates
 
 
+# 일일 통계 집계 슬롯 (총 거래: 0, 구매: 1, 판매: 2, 대기: 3, 곡명: 4)
+TRADE_TYPE_INDEX = {"구매": 1, "판매": 2}
+
+# 스케줄 루프 최대 대기 시간 (초)
+SCHEDULER_MAX_IDLE_SECONDS = 60
+
+
 class DataCollector:
     """데이터 수집기"""
 
@@ -29,6 +37,7 @@ class DataCollector:
         self.api_client = MusicowAPIClient()
         self.raw_data_dir = RAW_DATA_DIR
         self.is_running = False
+        self._wakeup = threading.Event()  # 중지 시 대기 중인 스케줄 루프를 즉시 깨움
 
         # 오늘 날짜로 디렉토리 생성
         self.today = datetime.now().strftime("%Y%m%d")
@@ -61,8 +70,8 @@ class DataCollector:
             filename = f"{timestamp}_orders.json"
             filepath = self.today_dir / filename
 
-            # 데이터 저장
-            if save_json(orders, filepath):
+            # 데이터 저장 (압축 JSON, 들여쓰기 없음)
+            if save_json(orders, filepath, indent=None):
                 self.logger.info(f"데이터 저장 완료: {filepath} ({len(orders)}개)")
 
                 # 일일 데이터 누적 (중복 제거)
@@ -87,11 +96,10 @@ class DataCollector:
         Args:
             orders: 새로운 주문 데이터
         """
-        for order in orders:
-            order_no = order.get("order_no")
-            if order_no:
-                # 최신 데이터로 업데이트
-                self.daily_orders[order_no] = order
+        # 최신 데이터로 업데이트 (order_no 없는 주문 제외)
+        self.daily_orders.update(
+            (order_no, order) for order in orders if (order_no := order.get("order_no"))
+        )
 
         self.logger.info(f"일일 누적 주문: {len(self.daily_orders)}개 (중복 제거)")
 
@@ -103,10 +111,20 @@ class DataCollector:
             orders: 주문 데이터
         """
         try:
-            buy_count = sum(1 for o in orders if o.get("order_type") == "구매")
-            sell_count = sum(1 for o in orders if o.get("order_type") == "판매")
-            wait_count = sum(1 for o in orders if o.get("order_status") == "대기")
-            done_count = sum(1 for o in orders if o.get("order_status") in ["완료", "체결"])
+            # 한 번의 순회로 타입/상태별 개수 집계
+            buy_count = sell_count = wait_count = done_count = 0
+            for o in orders:
+                order_type = o.get("order_type")
+                if order_type == "구매":
+                    buy_count += 1
+                elif order_type == "판매":
+                    sell_count += 1
+
+                order_status = o.get("order_status")
+                if order_status == "대기":
+                    wait_count += 1
+                elif order_status == "완료" or order_status == "체결":
+                    done_count += 1
 
             self.logger.info(
                 f"수집 통계 - 총: {len(orders)}, "
@@ -123,11 +141,11 @@ class DataCollector:
                 self.logger.warning("저장할 일일 데이터가 없습니다")
                 return
 
-            # 일일 요약 파일 저장
+            # 일일 요약 파일 저장 (기계 판독용이므로 들여쓰기 없이 압축 저장)
             summary_file = self.raw_data_dir / f"{self.today}_daily_summary.json"
             orders_list = list(self.daily_orders.values())
 
-            if save_json(orders_list, summary_file):
+            if save_json(orders_list, summary_file, indent=None):
                 self.logger.info(f"일일 요약 저장 완료: {summary_file} ({len(orders_list)}개)")
 
                 # 일일 통계 로깅
@@ -146,33 +164,30 @@ class DataCollector:
             orders: 일일 전체 주문 데이터
         """
         try:
-            # 곡별 거래 통계
+            # 곡별 거래 통계 [총 거래, 구매, 판매, 대기, 곡명] (총 거래는 누적 중 함께 계산)
             song_stats = {}
             for order in orders:
                 song = order.get("song_name", "Unknown")
-                if song not in song_stats:
-                    song_stats[song] = {"구매": 0, "판매": 0, "대기": 0}
+                stats = song_stats.get(song)
+                if stats is None:
+                    stats = song_stats[song] = [0, 0, 0, 0, song]
 
-                order_type = order.get("order_type", "")
-                if order_type in ["구매", "판매"]:
-                    song_stats[song][order_type] += 1
+                type_idx = TRADE_TYPE_INDEX.get(order.get("order_type"))
+                if type_idx is not None:
+                    stats[type_idx] += 1
+                    stats[0] += 1
 
                 if order.get("order_status") == "대기":
-                    song_stats[song]["대기"] += 1
+                    stats[3] += 1
 
-            # 상위 10개 곡
-            top_songs = sorted(
-                song_stats.items(),
-                key=lambda x: x[1]["구매"] + x[1]["판매"],
-                reverse=True
-            )[:10]
+            # 상위 10개 곡 (전체 정렬 대신 부분 선택, 동률은 등장 순서 유지)
+            top_songs = heapq.nlargest(10, song_stats.values(), key=itemgetter(0))
 
             self.logger.info("=== 일일 거래 상위 10개 곡 ===")
-            for i, (song, stats) in enumerate(top_songs, 1):
-                total = stats["구매"] + stats["판매"]
+            for i, (total, buy, sell, waiting, song) in enumerate(top_songs, 1):
                 self.logger.info(
                     f"{i:2}. {song[:20]:20} | "
-                    f"총 {total:3}건 (구매: {stats['구매']}, 판매: {stats['판매']}, 대기: {stats['대기']})"
+                    f"총 {total:3}건 (구매: {buy}, 판매: {sell}, 대기: {waiting})"
                 )
 
         except Exception as e:
@@ -180,6 +195,8 @@ class DataCollector:
 
     def start_scheduler(self):
         """스케줄러 시작"""
+        import schedule  # 스케줄러 모드에서만 필요
+
         try:
             self.logger.info(f"스케줄러 시작 - {COLLECTION_INTERVAL_MINUTES}분 간격")
 
@@ -196,11 +213,15 @@ class DataCollector:
             schedule.every().day.at("00:00").do(self._reset_daily_data)
 
             self.is_running = True
+            self._wakeup.clear()
 
-            # 스케줄 실행
+            # 스케줄 실행 (다음 작업까지 대기, 최대 60초)
             while self.is_running:
                 schedule.run_pending()
-                time.sleep(1)
+                idle = schedule.idle_seconds()
+                if idle is None or idle < 0:
+                    idle = 1
+                self._wakeup.wait(timeout=min(idle, SCHEDULER_MAX_IDLE_SECONDS))
 
         except KeyboardInterrupt:
             self.logger.info("사용자가 스케줄러를 중지했습니다")
@@ -231,6 +252,7 @@ class DataCollector:
     def stop_scheduler(self):
         """스케줄러 중지"""
         self.is_running = False
+        self._wakeup.set()
 
         # 마지막 요약 저장
         self.save_daily_summary()
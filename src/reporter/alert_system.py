@@ -1,9 +1,10 @@
 """
 실시간 알림 시스템
 """
-import requests
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple, TYPE_CHECKING
+from datetime import datetime
 
 from config.settings import (
     ALERT_PREMIUM_THRESHOLD,
@@ -15,10 +16,42 @@ from config.settings import (
 )
 from src.utils.logger import setup_logger
 
+if TYPE_CHECKING:
+    import requests
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+# 알림 대상 시그널 및 심각도
+SIGNAL_SEVERITY = {
+    "주의": "high",
+    "저평가": "medium",
+    "고평가": "low"
+}
+SIGNAL_TRIGGERS = frozenset(SIGNAL_SEVERITY)
+
+
+def _to_epoch_seconds(date_string: str) -> float:
+    """
+    주문 일시 문자열을 초 단위 값으로 변환
+
+    "%Y-%m-%d %H:%M:%S" 형식은 ISO 8601 이므로 strptime 대신
+    C 구현인 fromisoformat 으로 파싱
+
+    Args:
+        date_string: 주문 일시 문자열
+
+    Returns:
+        1970-01-01 기준 경과 초 (시간대 변환 없음)
+    """
+    return (datetime.fromisoformat(date_string) - _EPOCH).total_seconds()
+
 
 class AlertSystem:
     """실시간 알림 시스템"""
 
+    DUPLICATE_WINDOW_SECONDS = 3600.0  # 중복 알림 방지 시간 (1시간)
+
     def __init__(self):
         """초기화"""
         self.logger = setup_logger(__name__, "alert_system.log")
@@ -26,8 +59,46 @@ class AlertSystem:
         self.alert_yield_change = ALERT_YIELD_CHANGE
         self.time_window = ALERT_TIME_WINDOW
 
-        # 알림 이력 (중복 방지용)
-        self.alert_history = {}
+        # 웹훅 발송용 세션 (Slack/Telegram 연결 재사용, 첫 발송 시 생성)
+        self._session: Optional["requests.Session"] = None
+        self.telegram_url = (
+            f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+            if TELEGRAM_BOT_TOKEN else None
+        )
+
+        # 알림 이력 (중복 방지용, 기록 순서 = 시간 순서)
+        self.alert_history: "OrderedDict[str, float]" = OrderedDict()
+
+    @property
+    def session(self) -> "requests.Session":
+        """알림 발송용 세션 (콘솔 알림만 쓰는 경우 requests 를 불러오지 않도록 지연 생성)"""
+        if self._session is None:
+            self._session = self._create_session()
+        return self._session
+
+    def _create_session(self) -> "requests.Session":
+        """
+        알림 발송용 세션 생성
+
+        POST 는 재시도 대상 메서드가 아니므로 연결 실패 시에만 재시도 (중복 발송 방지)
+
+        Returns:
+            설정된 requests 세션
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from requests.packages.urllib3.util.retry import Retry
+
+        session = requests.Session()
+
+        adapter = HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=4,
+            max_retries=Retry(total=2, backoff_factor=0.3)
+        )
+        session.mount("https://", adapter)
+
+        return session
 
     def check_alerts(
         self,
@@ -37,6 +108,13 @@ class AlertSystem:
         """
         알림 조건 체크
 
+        주문 목록을 한 번만 순회하며 세 가지 조건을 함께 체크
+        (결과는 프리미엄율 → 수익률 변동 → 시그널 순으로 반환)
+
+        1. 프리미엄율: 대기 주문의 프리미엄율 > ±3%
+        2. 수익률 변동: 10분 내 수익률 변동 > 2%
+        3. 시그널: 주의, 저평가, 고평가 시그널
+
         Args:
             orders: 현재 주문 데이터
             previous_orders: 이전 주문 데이터 (수익률 변동 체크용)
@@ -44,20 +122,80 @@ class AlertSystem:
         Returns:
             알림 목록
         """
-        alerts = []
+        premium_alerts = []
+        yield_alerts = []
+        signal_alerts = []
 
-        # 1. 프리미엄율 알림
-        premium_alerts = self._check_premium_alerts(orders)
-        alerts.extend(premium_alerts)
+        prev_index = self._index_previous_orders(previous_orders) if previous_orders else {}
+        # 같은 체크에서 생성된 알림은 같은 시각을 공유
+        timestamp = datetime.now().isoformat()
+        now = time.monotonic()
 
-        # 2. 수익률 변동 알림
-        if previous_orders:
-            yield_alerts = self._check_yield_change_alerts(orders, previous_orders)
-            alerts.extend(yield_alerts)
+        premium_threshold = self.alert_premium_threshold
+        yield_threshold = self.alert_yield_change
+        time_window = self.time_window
 
-        # 3. 시그널 기반 알림
-        signal_alerts = self._check_signal_alerts(orders)
-        alerts.extend(signal_alerts)
+        for order in orders:
+            order_no = order.get("order_no")
+            song_name = order.get("song_name", "Unknown")
+
+            # 1. 프리미엄율 알림 (대기 주문만)
+            if order.get("order_status") == "대기":
+                premium = order.get("premium")
+                if (
+                    premium is not None
+                    and abs(premium) > premium_threshold
+                    and not self._is_duplicate_alert(order_no, "premium", now)
+                ):
+                    premium_alerts.append({
+                        "type": "premium",
+                        "severity": "high" if abs(premium) > 5 else "medium",
+                        "message": f"프리미엄율 {premium:.2f}% - {song_name}",
+                        "order": order,
+                        "timestamp": timestamp
+                    })
+                    self._add_to_history(order_no, "premium", now)
+
+            # 2. 수익률 변동 알림
+            prev = prev_index.get(order_no)
+            if prev is not None:
+                prev_yield, prev_time = prev
+                current_yield = order.get("normalized_yield")
+                if current_yield is not None:
+                    yield_change = abs(current_yield - prev_yield)
+
+                    if yield_change > yield_threshold:
+                        # 시간 윈도우 체크
+                        order_time = _to_epoch_seconds(order.get("order_date", ""))
+                        time_diff = (order_time - prev_time) / 60.0
+
+                        if (
+                            time_diff <= time_window
+                            and not self._is_duplicate_alert(order_no, "yield_change", now)
+                        ):
+                            yield_alerts.append({
+                                "type": "yield_change",
+                                "severity": "high",
+                                "message": f"수익률 {yield_change:.2f}% 변동 - {song_name}",
+                                "order": order,
+                                "change": yield_change,
+                                "timestamp": timestamp
+                            })
+                            self._add_to_history(order_no, "yield_change", now)
+
+            # 3. 시그널 기반 알림
+            signal = order.get("signal", "")
+            if signal in SIGNAL_TRIGGERS and not self._is_duplicate_alert(order_no, "signal", now):
+                signal_alerts.append({
+                    "type": "signal",
+                    "severity": SIGNAL_SEVERITY[signal],
+                    "message": f"시그널: {signal} - {song_name}",
+                    "order": order,
+                    "timestamp": timestamp
+                })
+                self._add_to_history(order_no, "signal", now)
+
+        alerts = premium_alerts + yield_alerts + signal_alerts
 
         # 알림 로깅
         if alerts:
@@ -67,177 +205,76 @@ class AlertSystem:
 
         return alerts
 
-    def _check_premium_alerts(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """
-        프리미엄율 알림 체크
-
-        조건: 프리미엄율 > ±3%
-
-        Args:
-            orders: 주문 데이터
-
-        Returns:
-            알림 목록
-        """
-        alerts = []
-
-        for order in orders:
-            # 대기 주문만 체크
-            if order.get("order_status") != "대기":
-                continue
-
-            premium = order.get("premium")
-            if premium is None:
-                continue
-
-            # 프리미엄율 기준 체크
-            if abs(premium) > self.alert_premium_threshold:
-                # 중복 체크
-                order_no = order.get("order_no")
-                if not self._is_duplicate_alert(order_no, "premium"):
-                    alert = {
-                        "type": "premium",
-                        "severity": "high" if abs(premium) > 5 else "medium",
-                        "message": f"프리미엄율 {premium:.2f}% - {order.get('song_name', 'Unknown')}",
-                        "order": order,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    alerts.append(alert)
-                    self._add_to_history(order_no, "premium")
-
-        return alerts
-
-    def _check_yield_change_alerts(
+    def _index_previous_orders(
         self,
-        orders: List[Dict[str, Any]],
         previous_orders: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+    ) -> Dict[str, Tuple[float, float]]:
         """
-        수익률 변동 알림 체크
+        이전 주문 색인 생성 (수익률 변동 체크용)
 
-        조건: 10분 내 수익률 변동 > 2%
+        order_no, 수익률, 주문 시각이 없는 주문은 비교할 수 없으므로 제외
 
         Args:
-            orders: 현재 주문 데이터
             previous_orders: 이전 주문 데이터
 
         Returns:
-            알림 목록
+            order_no → (수익률, 주문 시각) 딕셔너리
         """
-        alerts = []
-
-        # 이전 주문을 딕셔너리로 변환 (order_no 기준)
-        prev_dict = {o.get("order_no"): o for o in previous_orders}
-
-        for order in orders:
-            order_no = order.get("order_no")
-            if order_no not in prev_dict:
+        prev_index = {}
+        for prev_order in previous_orders:
+            order_no = prev_order.get("order_no")
+            if not order_no:
                 continue
-
-            prev_order = prev_dict[order_no]
-
-            # 수익률 비교
-            current_yield = order.get("normalized_yield")
             prev_yield = prev_order.get("normalized_yield")
-
-            if current_yield is None or prev_yield is None:
+            try:
+                prev_time = _to_epoch_seconds(prev_order.get("order_date") or "")
+            except (TypeError, ValueError):
+                prev_yield = None
+            if prev_yield is None:
+                prev_index.pop(order_no, None)
                 continue
+            prev_index[order_no] = (prev_yield, prev_time)
 
-            yield_change = abs(current_yield - prev_yield)
-
-            if yield_change > self.alert_yield_change:
-                # 시간 윈도우 체크
-                order_time = datetime.strptime(order.get("order_date", ""), "%Y-%m-%d %H:%M:%S")
-                prev_time = datetime.strptime(prev_order.get("order_date", ""), "%Y-%m-%d %H:%M:%S")
-
-                time_diff = (order_time - prev_time).total_seconds() / 60
-
-                if time_diff <= self.time_window:
-                    if not self._is_duplicate_alert(order_no, "yield_change"):
-                        alert = {
-                            "type": "yield_change",
-                            "severity": "high",
-                            "message": f"수익률 {yield_change:.2f}% 변동 - {order.get('song_name', 'Unknown')}",
-                            "order": order,
-                            "change": yield_change,
-                            "timestamp": datetime.now().isoformat()
-                        }
-                        alerts.append(alert)
-                        self._add_to_history(order_no, "yield_change")
-
-        return alerts
-
-    def _check_signal_alerts(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """
-        시그널 기반 알림 체크
-
-        조건: 주의, 저평가, 고평가 시그널
+        return prev_index
 
-        Args:
-            orders: 주문 데이터
-
-        Returns:
-            알림 목록
-        """
-        alerts = []
-
-        for order in orders:
-            signal = order.get("signal", "")
-
-            # 알림 대상 시그널
-            if signal in ["주의", "저평가", "고평가"]:
-                order_no = order.get("order_no")
-
-                if not self._is_duplicate_alert(order_no, "signal"):
-                    severity_map = {
-                        "주의": "high",
-                        "저평가": "medium",
-                        "고평가": "low"
-                    }
-
-                    alert = {
-                        "type": "signal",
-                        "severity": severity_map.get(signal, "low"),
-                        "message": f"시그널: {signal} - {order.get('song_name', 'Unknown')}",
-                        "order": order,
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    alerts.append(alert)
-                    self._add_to_history(order_no, "signal")
-
-        return alerts
-
-    def _is_duplicate_alert(self, order_no: str, alert_type: str) -> bool:
+    def _is_duplicate_alert(
+        self,
+        order_no: str,
+        alert_type: str,
+        now: Optional[float] = None
+    ) -> bool:
         """
         중복 알림 체크
 
         Args:
             order_no: 주문 번호
             alert_type: 알림 타입
+            now: 기준 시각 (time.monotonic 값, None 이면 현재 시각)
 
         Returns:
             중복 여부
         """
-        key = f"{order_no}_{alert_type}"
-
-        if key in self.alert_history:
-            # 1시간 이내 중복 알림 방지
-            last_time = self.alert_history[key]
-            if datetime.now() - last_time < timedelta(hours=1):
-                return True
+        last_time = self.alert_history.get(f"{order_no}_{alert_type}")
+        if last_time is None:
+            return False
 
-        return False
+        # 1시간 이내 중복 알림 방지
+        if now is None:
+            now = time.monotonic()
+        return now - last_time < self.DUPLICATE_WINDOW_SECONDS
 
-    def _add_to_history(self, order_no: str, alert_type: str):
+    def _add_to_history(self, order_no: str, alert_type: str, now: Optional[float] = None):
         """
         알림 이력 추가
 
         Args:
             order_no: 주문 번호
             alert_type: 알림 타입
+            now: 기록 시각 (time.monotonic 값, None 이면 현재 시각)
         """
         key = f"{order_no}_{alert_type}"
-        self.alert_history[key] = datetime.now()
+        self.alert_history[key] = time.monotonic() if now is None else now
+        self.alert_history.move_to_end(key)
 
     def send_alerts(
         self,
@@ -314,7 +351,7 @@ class AlertSystem:
 
             payload = {"text": text}
 
-            response = requests.post(
+            response = self.session.post(
                 SLACK_WEBHOOK_URL,
                 json=payload,
                 timeout=10
@@ -343,13 +380,12 @@ class AlertSystem:
             for alert in alerts[:5]:  # 최대 5개만 표시
                 text += f"• [{alert['type']}] {alert['message']}\n"
 
-            url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
             payload = {
                 "chat_id": TELEGRAM_CHAT_ID,
                 "text": text
             }
 
-            response = requests.post(url, json=payload, timeout=10)
+            response = self.session.post(self.telegram_url, json=payload, timeout=10)
 
             if response.status_code == 200:
                 self.logger.info("Telegram 알림 발송 성공")
@@ -369,14 +405,19 @@ class AlertSystem:
         Args:
             hours: 유지 시간 (기본 24시간)
         """
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-
-        keys_to_remove = [
-            key for key, timestamp in self.alert_history.items()
-            if timestamp < cutoff_time
-        ]
-
-        for key in keys_to_remove:
-            del self.alert_history[key]
-
-        self.logger.info(f"알림 이력 정리: {len(keys_to_remove)}개 제거")
\ No newline at end of file
+        cutoff_time = time.monotonic() - hours * 3600
+
+        # 오래된 이력이 앞쪽에 있으므로 만료된 항목만 앞에서부터 제거
+        removed = 0
+        while self.alert_history and next(iter(self.alert_history.values())) < cutoff_time:
+            self.alert_history.popitem(last=False)
+            removed += 1
+
+        self.logger.info(f"알림 이력 정리: {removed}개 제거")
+
+    def close(self):
+        """세션 종료"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        self.logger.info("알림 시스템 세션 종료")
@@ -1,12 +1,23 @@
 """
 Markdown 리포트 생성기
 """
-from typing import List, Dict, Any
+from collections import Counter
+from typing import List, Dict, Any, Optional
 from pathlib import Path
 from datetime import datetime
+from io import StringIO
+import numpy as np
 
-from config.settings import REPORTS_DIR, REPORT_TOP_N
+from config.settings import REPORTS_DIR, REPORT_TOP_N, ensure_dirs
 from src.utils.logger import setup_logger
+from src.utils.helpers import largest_n_positions, write_lines
+
+
+# 표 행 템플릿 (섹션별 한 번만 정의)
+TOP_YIELD_ROW = "| {} | {} | {} | {:.2f}% | {:.2f}% | {:.1f} | {} |".format
+PREMIUM_ROW = "| {} | {} | {} | {:.2f}% | {:.2f}% | {} |".format
+LIQUIDITY_ROW = "| {} | {} | {} | {:.1f} | {:.2f}% | {} |".format
+SONG_ROW = "| {} | {} | {} | {}개 |".format
 
 
 class MarkdownReporter:
@@ -16,6 +27,7 @@ class MarkdownReporter:
         """초기화"""
         self.logger = setup_logger(__name__, "markdown_reporter.log")
         self.reports_dir = REPORTS_DIR
+        ensure_dirs()
         self.top_n = REPORT_TOP_N
 
     def generate_daily_report(
@@ -34,50 +46,39 @@ class MarkdownReporter:
             생성된 파일 경로
         """
         try:
+            # 생성 시각 (파일명/헤더/푸터 공통)
+            now = datetime.now()
+
             # 파일명 생성
             if filename is None:
-                date_str = datetime.now().strftime("%Y%m%d")
-                filename = f"daily_report_{date_str}.md"
+                filename = f"daily_report_{now:%Y%m%d}.md"
 
             filepath = self.reports_dir / filename
 
-            # 리포트 생성
-            report_lines = []
-
-            # 헤더
-            report_lines.extend(self._generate_header())
-            report_lines.append("")
-
-            # 요약 통계
-            report_lines.extend(self._generate_summary(orders))
-            report_lines.append("")
-
-            # Top 수익률
-            report_lines.extend(self._generate_top_yield(orders))
-            report_lines.append("")
-
-            # 프리미엄율 상/하위
-            report_lines.extend(self._generate_premium_analysis(orders))
-            report_lines.append("")
-
-            # 유동성 상/하위
-            report_lines.extend(self._generate_liquidity_analysis(orders))
-            report_lines.append("")
-
-            # 시그널 분석
-            report_lines.extend(self._generate_signal_analysis(orders))
-            report_lines.append("")
-
-            # 곡별 통계
-            report_lines.extend(self._generate_song_statistics(orders))
-            report_lines.append("")
-
-            # 푸터
-            report_lines.extend(self._generate_footer())
-
-            # 파일 쓰기
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(report_lines))
+            # 지표 컬럼 추출 (섹션 간 공유)
+            columns = self._extract_columns(orders)
+
+            # 리포트 본문 섹션
+            section_calls = [
+                (self._generate_summary, (orders, columns)),
+                (self._generate_top_yield, (orders, columns)),
+                (self._generate_premium_analysis, (orders, columns)),
+                (self._generate_liquidity_analysis, (orders, columns)),
+                (self._generate_signal_analysis, (orders,)),
+                (self._generate_song_statistics, (orders,)),
+            ]
+            body = [fn(*args) for fn, args in section_calls]
+
+            # 리포트 섹션 (섹션 사이에 빈 줄)
+            sections = [self._generate_header(now), *body]
+
+            # 메모리 버퍼에 섹션 단위로 출력한 뒤 파일에 한 번에 쓰기
+            buf = StringIO()
+            for section in sections:
+                write_lines(buf, section)
+                buf.write("\n\n")
+            write_lines(buf, self._generate_footer(now))
+            filepath.write_text(buf.getvalue(), encoding='utf-8')
 
             self.logger.info(f"일일 리포트 생성: {filepath}")
             return filepath
@@ -86,28 +87,60 @@ class MarkdownReporter:
             self.logger.error(f"리포트 생성 실패: {e}")
             raise
 
-    def _generate_header(self) -> List[str]:
+    def _extract_columns(self, orders: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """
+        주문 데이터에서 지표 컬럼을 NumPy 배열로 추출
+
+        Args:
+            orders: 지표가 계산된 주문 데이터
+
+        Returns:
+            컬럼명 → 배열 딕셔너리 (결측 지표는 NaN)
+        """
+        order_types = np.array([o.get("order_type") for o in orders], dtype=object)
+        statuses = np.array([o.get("order_status") for o in orders], dtype=object)
+        waiting = statuses == "대기"
+
+        return {
+            "buy": order_types == "구매",
+            "sell": order_types == "판매",
+            "waiting": waiting,
+            "waiting_idx": np.flatnonzero(waiting),  # 대기 주문 인덱스 (섹션 간 공유)
+            "premium": np.array([o.get("premium") for o in orders], dtype=np.float64),
+            "yield": np.array([o.get("normalized_yield") for o in orders], dtype=np.float64),
+            "liquidity": np.array([o.get("liquidity_score", 0) for o in orders], dtype=np.float64),
+        }
+
+    def _generate_header(self, now: Optional[datetime] = None) -> List[str]:
         """리포트 헤더 생성"""
-        now = datetime.now()
+        if now is None:
+            now = datetime.now()
         lines = [
             "# 🎵 뮤직카우 시장 분석 일일 리포트",
             "",
-            f"**생성 일시**: {now.strftime('%Y년 %m월 %d일 %H:%M')}",
+            f"**생성 일시**: {now:%Y년 %m월 %d일 %H:%M}",
             "",
             "---",
         ]
         return lines
 
-    def _generate_summary(self, orders: List[Dict[str, Any]]) -> List[str]:
+    def _generate_summary(
+        self,
+        orders: List[Dict[str, Any]],
+        columns: Optional[Dict[str, np.ndarray]] = None
+    ) -> List[str]:
         """요약 통계 생성"""
         lines = ["## 📊 시장 요약"]
         lines.append("")
 
+        if columns is None:
+            columns = self._extract_columns(orders)
+
         # 전체 통계
         total = len(orders)
-        buy_count = sum(1 for o in orders if o.get("order_type") == "구매")
-        sell_count = sum(1 for o in orders if o.get("order_type") == "판매")
-        waiting_count = sum(1 for o in orders if o.get("order_status") == "대기")
+        buy_count = int(columns["buy"].sum())
+        sell_count = int(columns["sell"].sum())
+        waiting_count = int(columns["waiting"].sum())
 
         lines.append(f"- **총 주문 수**: {total:,}개")
         lines.append(f"- **구매 주문**: {buy_count:,}개 ({buy_count/total*100:.1f}%)")
@@ -115,21 +148,21 @@ class MarkdownReporter:
         lines.append(f"- **대기 주문**: {waiting_count:,}개")
         lines.append("")
 
-        # 지표 통계
-        premiums = [o.get("premium") for o in orders if o.get("premium") is not None]
-        yields = [o.get("normalized_yield") for o in orders if o.get("normalized_yield") is not None]
-        liquidities = [o.get("liquidity_score", 0) for o in orders]
+        # 지표 통계 (결측값 제외 평균)
+        premiums = columns["premium"][~np.isnan(columns["premium"])]
+        yields = columns["yield"][~np.isnan(columns["yield"])]
+        liquidities = columns["liquidity"]
 
-        if premiums:
-            avg_premium = sum(premiums) / len(premiums)
+        if premiums.size:
+            avg_premium = premiums.mean()
             lines.append(f"- **평균 프리미엄율**: {avg_premium:.2f}%")
 
-        if yields:
-            avg_yield = sum(yields) / len(yields)
+        if yields.size:
+            avg_yield = yields.mean()
             lines.append(f"- **평균 정규화 수익률**: {avg_yield:.2f}%")
 
-        if liquidities:
-            avg_liquidity = sum(liquidities) / len(liquidities)
+        if liquidities.size:
+            avg_liquidity = liquidities.mean()
             lines.append(f"- **평균 유동성 점수**: {avg_liquidity:.1f}/100")
 
         lines.append("")
@@ -137,23 +170,24 @@ class MarkdownReporter:
 
         return lines
 
-    def _generate_top_yield(self, orders: List[Dict[str, Any]]) -> List[str]:
+    def _generate_top_yield(
+        self,
+        orders: List[Dict[str, Any]],
+        columns: Optional[Dict[str, np.ndarray]] = None
+    ) -> List[str]:
         """고수익률 주문 섹션 생성"""
         lines = [f"## 💰 고수익률 주문 (Top {self.top_n})"]
         lines.append("")
 
-        # 대기 중인 주문만 필터링
-        waiting_orders = [
-            o for o in orders
-            if o.get("order_status") == "대기" and o.get("normalized_yield") is not None
-        ]
+        if columns is None:
+            columns = self._extract_columns(orders)
 
-        # 수익률 높은 순 정렬
-        top_yields = sorted(
-            waiting_orders,
-            key=lambda x: x.get("normalized_yield", 0),
-            reverse=True
-        )[:self.top_n]
+        # 대기 중인 주문 중 수익률 높은 순 상위 N개
+        yields = columns["yield"]
+        waiting_idx = columns["waiting_idx"]
+        candidates = waiting_idx[~np.isnan(yields[waiting_idx])]
+        selected = candidates[largest_n_positions(yields[candidates], self.top_n)]
+        top_yields = [orders[i] for i in selected]
 
         if top_yields:
             lines.append("| 순위 | 곡명 | 아티스트 | 수익률 | 프리미엄율 | 유동성 | 시그널 |")
@@ -168,8 +202,7 @@ class MarkdownReporter:
                 signal = order.get("signal", "")
 
                 lines.append(
-                    f"| {i} | {song} | {artist} | {yield_val:.2f}% | "
-                    f"{premium:.2f}% | {liquidity:.1f} | {signal} |"
+                    TOP_YIELD_ROW(i, song, artist, yield_val, premium, liquidity, signal)
                 )
         else:
             lines.append("*대기 중인 주문이 없습니다.*")
@@ -179,28 +212,29 @@ class MarkdownReporter:
 
         return lines
 
-    def _generate_premium_analysis(self, orders: List[Dict[str, Any]]) -> List[str]:
+    def _generate_premium_analysis(
+        self,
+        orders: List[Dict[str, Any]],
+        columns: Optional[Dict[str, np.ndarray]] = None
+    ) -> List[str]:
         """프리미엄율 분석 섹션 생성"""
         lines = [f"## 📈 프리미엄율 분석 (상위/하위 {self.top_n}개)"]
         lines.append("")
 
-        # 대기 중인 주문만 필터링
-        waiting_orders = [
-            o for o in orders
-            if o.get("order_status") == "대기" and o.get("premium") is not None
-        ]
+        if columns is None:
+            columns = self._extract_columns(orders)
 
-        # 프리미엄율 기준 정렬
-        sorted_by_premium = sorted(
-            waiting_orders,
-            key=lambda x: x.get("premium", 0)
-        )
+        # 대기 중인 주문만 필터링
+        premiums = columns["premium"]
+        waiting_idx = columns["waiting_idx"]
+        candidates = waiting_idx[~np.isnan(premiums[waiting_idx])]
 
         # 하위 N개 (저평가)
         lines.append(f"### 🔽 저평가 주문 (프리미엄율 낮은 순)")
         lines.append("")
 
-        low_premium = sorted_by_premium[:self.top_n]
+        selected = candidates[largest_n_positions(-premiums[candidates], self.top_n)]
+        low_premium = [orders[i] for i in selected]
         if low_premium:
             lines.append("| 순위 | 곡명 | 아티스트 | 프리미엄율 | 수익률 | 시그널 |")
             lines.append("|------|------|----------|--------|--------|--------|")
@@ -212,10 +246,7 @@ class MarkdownReporter:
                 yield_val = order.get("normalized_yield", 0)
                 signal = order.get("signal", "")
 
-                lines.append(
-                    f"| {i} | {song} | {artist} | {premium:.2f}% | "
-                    f"{yield_val:.2f}% | {signal} |"
-                )
+                lines.append(PREMIUM_ROW(i, song, artist, premium, yield_val, signal))
         else:
             lines.append("*데이터 없음*")
 
@@ -225,7 +256,12 @@ class MarkdownReporter:
         lines.append(f"### 🔼 고평가 주문 (프리미엄율 높은 순)")
         lines.append("")
 
-        high_premium = sorted_by_premium[-self.top_n:][::-1]
+        # 동률은 나중 주문이 먼저 오도록 역순 후보에서 선택 (기존 정렬 결과와 동일)
+        reversed_candidates = candidates[::-1]
+        selected = reversed_candidates[
+            largest_n_positions(premiums[reversed_candidates], self.top_n)
+        ]
+        high_premium = [orders[i] for i in selected]
         if high_premium:
             lines.append("| 순위 | 곡명 | 아티스트 | 프리미엄율 | 수익률 | 시그널 |")
             lines.append("|------|------|----------|--------|--------|--------|")
@@ -237,10 +273,7 @@ class MarkdownReporter:
                 yield_val = order.get("normalized_yield", 0)
                 signal = order.get("signal", "")
 
-                lines.append(
-                    f"| {i} | {song} | {artist} | {premium:.2f}% | "
-                    f"{yield_val:.2f}% | {signal} |"
-                )
+                lines.append(PREMIUM_ROW(i, song, artist, premium, yield_val, signal))
         else:
             lines.append("*데이터 없음*")
 
@@ -249,23 +282,24 @@ class MarkdownReporter:
 
         return lines
 
-    def _generate_liquidity_analysis(self, orders: List[Dict[str, Any]]) -> List[str]:
+    def _generate_liquidity_analysis(
+        self,
+        orders: List[Dict[str, Any]],
+        columns: Optional[Dict[str, np.ndarray]] = None
+    ) -> List[str]:
         """유동성 분석 섹션 생성"""
         lines = [f"## 💧 유동성 분석"]
         lines.append("")
 
-        # 유동성 점수 기준 정렬
-        sorted_by_liquidity = sorted(
-            orders,
-            key=lambda x: x.get("liquidity_score", 0),
-            reverse=True
-        )
+        if columns is None:
+            columns = self._extract_columns(orders)
 
         # 상위 N개 (고유동성)
         lines.append(f"### ⬆️ 고유동성 곡 (Top {self.top_n})")
         lines.append("")
 
-        high_liquidity = sorted_by_liquidity[:self.top_n]
+        selected = largest_n_positions(columns["liquidity"], self.top_n)
+        high_liquidity = [orders[i] for i in selected]
         if high_liquidity:
             lines.append("| 순위 | 곡명 | 아티스트 | 유동성 | 프리미엄율 | 시그널 |")
             lines.append("|------|------|----------|--------|--------|--------|")
@@ -277,10 +311,7 @@ class MarkdownReporter:
                 premium = order.get("premium", 0) if order.get("premium") is not None else 0
                 signal = order.get("signal", "")
 
-                lines.append(
-                    f"| {i} | {song} | {artist} | {liquidity:.1f} | "
-                    f"{premium:.2f}% | {signal} |"
-                )
+                lines.append(LIQUIDITY_ROW(i, song, artist, liquidity, premium, signal))
         else:
             lines.append("*데이터 없음*")
 
@@ -295,17 +326,14 @@ class MarkdownReporter:
         lines.append("")
 
         # 시그널별 카운트
-        signal_counts = {}
-        for order in orders:
-            signal = order.get("signal", "Unknown")
-            signal_counts[signal] = signal_counts.get(signal, 0) + 1
+        signal_counts = Counter(order.get("signal", "Unknown") for order in orders)
 
         # 테이블 생성
         lines.append("| 시그널 | 개수 | 비율 |")
         lines.append("|--------|------|------|")
 
         total = len(orders)
-        for signal, count in sorted(signal_counts.items(), key=lambda x: x[1], reverse=True):
+        for signal, count in signal_counts.most_common():
             percentage = count / total * 100
             lines.append(f"| {signal} | {count:,}개 | {percentage:.1f}% |")
 
@@ -320,25 +348,20 @@ class MarkdownReporter:
         lines.append("")
 
         # 곡별 주문 수 카운트
-        song_counts = {}
-        for order in orders:
-            song = order.get("song_name", "Unknown")
-            artist = order.get("song_artist", "Unknown")
-            key = (song, artist)
-
-            if key not in song_counts:
-                song_counts[key] = 0
-            song_counts[key] += 1
+        song_counts = Counter(
+            (order.get("song_name", "Unknown"), order.get("song_artist", "Unknown"))
+            for order in orders
+        )
 
         # 상위 10개
-        top_songs = sorted(song_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+        top_songs = song_counts.most_common(10)
 
         if top_songs:
             lines.append("| 순위 | 곡명 | 아티스트 | 주문 수 |")
             lines.append("|------|------|----------|---------|")
 
             for i, ((song, artist), count) in enumerate(top_songs, 1):
-                lines.append(f"| {i} | {song[:25]} | {artist[:15]} | {count}개 |")
+                lines.append(SONG_ROW(i, song[:25], artist[:15], count))
         else:
             lines.append("*데이터 없음*")
 
@@ -347,15 +370,16 @@ class MarkdownReporter:
 
         return lines
 
-    def _generate_footer(self) -> List[str]:
+    def _generate_footer(self, now: Optional[datetime] = None) -> List[str]:
         """리포트 푸터 생성"""
-        now = datetime.now()
+        if now is None:
+            now = datetime.now()
         lines = [
             "",
             "---",
             "",
             "*본 리포트는 자동 생성되었습니다.*",
             "",
-            f"*생성 시각: {now.strftime('%Y-%m-%d %H:%M:%S')}*"
+            f"*생성 시각: {now:%Y-%m-%d %H:%M:%S}*"
         ]
         return lines
\ No newline at end of file
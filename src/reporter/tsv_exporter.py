@@ -1,12 +1,53 @@
 """
 TSV 출력 모듈 (스프레드시트 호환)
 """
+import heapq
+from itertools import chain
 from typing import List, Dict, Any
 from pathlib import Path
 from datetime import datetime
 
-from config.settings import TSV_DELIMITER, REPORTS_DIR, DATE_FORMAT
+from config.settings import TSV_DELIMITER, REPORTS_DIR, DATE_FORMAT, ensure_dirs
 from src.utils.logger import setup_logger
+from src.utils.helpers import write_lines
+
+
+def _format_text(value: Any) -> str:
+    """문자열 필드 포맷팅 (None 은 빈 칸)"""
+    return "" if value is None else str(value)
+
+
+def _format_percent(value: Any) -> str:
+    """백분율 지표 포맷팅 (소수점 2자리, None 은 빈 칸)"""
+    return "" if value is None else f"{value:.2f}"
+
+
+def _format_score(value: Any) -> str:
+    """점수 포맷팅 (소수점 1자리, None 은 빈 칸)"""
+    return "" if value is None else f"{value:.1f}"
+
+
+# TSV 파일 쓰기 버퍼 크기 (대용량 출력 시 write 시스템 콜 감소)
+TSV_WRITE_BUFFER_SIZE = 1 << 20
+
+# 필터 대상 상태/시그널
+COMPLETED_STATUSES = frozenset({"완료", "체결"})
+ALERT_SIGNALS = frozenset({"주의", "저평가", "고평가"})
+
+# 주문 TSV 행 스키마: (필드, 기본값, 포맷터) - 헤더 순서와 동일
+ORDER_ROW_SCHEMA = (
+    ("order_date", "", _format_text),
+    ("song_name", "", _format_text),
+    ("song_artist", "", _format_text),
+    ("order_type", "", _format_text),
+    ("order_price", 0, str),
+    ("recent_price", 0, str),
+    ("normalized_yield", None, _format_percent),
+    ("premium", None, _format_percent),
+    ("liquidity_score", 0, _format_score),
+    ("signal", "", _format_text),
+    ("url_link", "", _format_text),
+)
 
 
 class TSVExporter:
@@ -17,6 +58,7 @@ class TSVExporter:
         self.logger = setup_logger(__name__, "tsv_exporter.log")
         self.delimiter = TSV_DELIMITER
         self.reports_dir = REPORTS_DIR
+        ensure_dirs()
 
     def export_to_tsv(
         self,
@@ -43,8 +85,8 @@ class TSVExporter:
 
             filepath = self.reports_dir / filename
 
-            # TSV 데이터 생성
-            lines = []
+            # 데이터 행
+            rows = (self._format_order_row(order) for order in orders)
 
             # 헤더
             if include_headers:
@@ -61,16 +103,11 @@ class TSVExporter:
                     "signal",
                     "url"
                 ]
-                lines.append(self.delimiter.join(headers))
+                rows = chain([self.delimiter.join(headers)], rows)
 
-            # 데이터 행
-            for order in orders:
-                row = self._format_order_row(order)
-                lines.append(row)
-
-            # 파일 쓰기
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(lines))
+            # 파일 쓰기 (행 단위로 바로 출력)
+            with open(filepath, 'w', encoding='utf-8', buffering=TSV_WRITE_BUFFER_SIZE) as f:
+                write_lines(f, rows)
 
             self.logger.info(f"TSV 파일 생성: {filepath} ({len(orders)}개 주문)")
             return filepath
@@ -89,47 +126,10 @@ class TSVExporter:
         Returns:
             TSV 형식 문자열
         """
-        try:
-            # 각 필드 추출 및 포맷팅
-            time = order.get("order_date", "")
-            song = order.get("song_name", "")
-            artist = order.get("song_artist", "")
-            side = order.get("order_type", "")
-            price = order.get("order_price", 0)
-            recent = order.get("recent_price", 0)
-
-            # 계산된 지표
-            yield_val = order.get("normalized_yield")
-            premium = order.get("premium")
-            liquidity = order.get("liquidity_score", 0)
-            signal = order.get("signal", "")
-            url = order.get("url_link", "")
-
-            # 숫자 포맷팅
-            yield_str = f"{yield_val:.2f}" if yield_val is not None else ""
-            premium_str = f"{premium:.2f}" if premium is not None else ""
-            liquidity_str = f"{liquidity:.1f}"
-
-            # TSV 행 생성
-            row_data = [
-                time,
-                song,
-                artist,
-                side,
-                str(price),
-                str(recent),
-                yield_str,
-                premium_str,
-                liquidity_str,
-                signal,
-                url
-            ]
-
-            return self.delimiter.join(row_data)
-
-        except Exception as e:
-            self.logger.warning(f"행 포맷팅 실패: {e}")
-            return ""
+        return self.delimiter.join([
+            formatter(order.get(key, default))
+            for key, default, formatter in ORDER_ROW_SCHEMA
+        ])
 
     def export_filtered_orders(
         self,
@@ -153,7 +153,7 @@ class TSVExporter:
             if filter_type == "waiting":
                 filtered = [o for o in orders if o.get("order_status") == "대기"]
             elif filter_type == "completed":
-                filtered = [o for o in orders if o.get("order_status") in ["완료", "체결"]]
+                filtered = [o for o in orders if o.get("order_status") in COMPLETED_STATUSES]
             elif filter_type == "buy":
                 filtered = [o for o in orders if o.get("order_type") == "구매"]
             elif filter_type == "sell":
@@ -163,7 +163,7 @@ class TSVExporter:
             elif filter_type == "overvalued":
                 filtered = [o for o in orders if "고평가" in o.get("signal", "")]
             elif filter_type == "alert":
-                filtered = [o for o in orders if o.get("signal", "") in ["주의", "저평가", "고평가"]]
+                filtered = [o for o in orders if o.get("signal", "") in ALERT_SIGNALS]
             else:
                 filtered = orders
 
@@ -207,16 +207,10 @@ class TSVExporter:
 
             sort_key = sort_key_map.get(sort_by, "premium")
 
-            # 정렬 (None 값 필터링)
+            # 상위 N개 추출 (None 값 필터링, 전체 정렬 없이 부분 선택)
             valid_orders = [o for o in orders if o.get(sort_key) is not None]
-            sorted_orders = sorted(
-                valid_orders,
-                key=lambda x: x.get(sort_key, 0),
-                reverse=not ascending
-            )
-
-            # 상위 N개 추출
-            top_orders = sorted_orders[:top_n]
+            select = heapq.nsmallest if ascending else heapq.nlargest
+            top_orders = select(top_n, valid_orders, key=lambda x: x.get(sort_key, 0))
 
             self.logger.info(f"상위 {top_n}개 추출 완료 (정렬: {sort_by}, {'오름차순' if ascending else '내림차순'})")
 
@@ -248,29 +242,40 @@ class TSVExporter:
 
             for order in orders:
                 song = order.get("song_name", "Unknown")
-                if song not in song_stats:
-                    song_stats[song] = {
+                stats = song_stats.get(song)
+                if stats is None:
+                    stats = song_stats[song] = {
                         "artist": order.get("song_artist", ""),
                         "buy_count": 0,
                         "sell_count": 0,
-                        "avg_premium": [],
-                        "avg_yield": [],
+                        "premium_sum": 0.0,
+                        "premium_count": 0,
+                        "yield_sum": 0.0,
+                        "yield_count": 0,
                         "liquidity": order.get("liquidity_score", 0)
                     }
 
                 # 통계 누적
-                if order.get("order_type") == "구매":
-                    song_stats[song]["buy_count"] += 1
-                elif order.get("order_type") == "판매":
-                    song_stats[song]["sell_count"] += 1
+                order_type = order.get("order_type")
+                if order_type == "구매":
+                    stats["buy_count"] += 1
+                elif order_type == "판매":
+                    stats["sell_count"] += 1
+
+                # 평균은 합계/개수로 누적 (값 목록을 보관하지 않음)
+                if (premium := order.get("premium")) is not None:
+                    stats["premium_sum"] += premium
+                    stats["premium_count"] += 1
+                if (yield_val := order.get("normalized_yield")) is not None:
+                    stats["yield_sum"] += yield_val
+                    stats["yield_count"] += 1
 
-                if order.get("premium") is not None:
-                    song_stats[song]["avg_premium"].append(order["premium"])
-                if order.get("normalized_yield") is not None:
-                    song_stats[song]["avg_yield"].append(order["normalized_yield"])
+            # 파일명 생성
+            if filename is None:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M")
+                filename = f"song_summary_{timestamp}.tsv"
 
-            # TSV 데이터 생성
-            lines = []
+            filepath = self.reports_dir / filename
 
             # 헤더
             headers = [
@@ -282,38 +287,43 @@ class TSVExporter:
                 "avg_yield(%)",
                 "liquidity"
             ]
-            lines.append(self.delimiter.join(headers))
-
-            # 데이터 행
-            for song, stats in sorted(song_stats.items()):
-                avg_premium = sum(stats["avg_premium"]) / len(stats["avg_premium"]) if stats["avg_premium"] else 0
-                avg_yield = sum(stats["avg_yield"]) / len(stats["avg_yield"]) if stats["avg_yield"] else 0
-
-                row = [
-                    song,
-                    stats["artist"],
-                    str(stats["buy_count"]),
-                    str(stats["sell_count"]),
-                    f"{avg_premium:.2f}",
-                    f"{avg_yield:.2f}",
-                    f"{stats['liquidity']:.1f}"
-                ]
-                lines.append(self.delimiter.join(row))
-
-            # 파일명 생성
-            if filename is None:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-                filename = f"song_summary_{timestamp}.tsv"
 
-            filepath = self.reports_dir / filename
-
-            # 파일 쓰기
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(lines))
+            # 파일 쓰기 (행 단위로 바로 출력)
+            with open(filepath, 'w', encoding='utf-8', buffering=TSV_WRITE_BUFFER_SIZE) as f:
+                rows = (
+                    self._format_song_summary_row(song, stats)
+                    for song, stats in sorted(song_stats.items())
+                )
+                write_lines(f, chain([self.delimiter.join(headers)], rows))
 
             self.logger.info(f"곡별 요약 TSV 생성: {filepath} ({len(song_stats)}곡)")
             return filepath
 
         except Exception as e:
             self.logger.error(f"곡별 요약 출력 실패: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    def _format_song_summary_row(self, song: str, stats: Dict[str, Any]) -> str:
+        """
+        곡별 통계를 TSV 행으로 포맷팅
+
+        Args:
+            song: 곡명
+            stats: 곡별 누적 통계
+
+        Returns:
+            TSV 형식 문자열
+        """
+        avg_premium = stats["premium_sum"] / stats["premium_count"] if stats["premium_count"] else 0
+        avg_yield = stats["yield_sum"] / stats["yield_count"] if stats["yield_count"] else 0
+
+        row = [
+            song,
+            stats["artist"],
+            str(stats["buy_count"]),
+            str(stats["sell_count"]),
+            f"{avg_premium:.2f}",
+            f"{avg_yield:.2f}",
+            f"{stats['liquidity']:.1f}"
+        ]
+        return self.delimiter.join(row)
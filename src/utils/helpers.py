@@ -1,34 +1,67 @@
 """
 공통 헬퍼 함수
 """
-import json
+import re
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, IO, Iterable, List, Optional
 
+import numpy as np
 
-def save_json(data: Any, filepath: Path, indent: int = 2) -> bool:
+from src.utils.serialization import dumps, loads
+
+
+# 기본 주문 일시 형식 ("%Y-%m-%d %H:%M:%S") 전용 빠른 파서
+_DEFAULT_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+_DEFAULT_DATETIME_RE = re.compile(
+    r"([0-9]{4})-([0-9]{2})-([0-9]{2}) ([0-9]{2}):([0-9]{2}):([0-9]{2})"
+)
+
+
+def save_json(data: Any, filepath: Path, indent: Optional[int] = 2) -> bool:
     """
     JSON 파일 저장
 
     Args:
         data: 저장할 데이터
         filepath: 파일 경로
-        indent: 들여쓰기 크기
+        indent: 들여쓰기 크기 (None 이면 압축 출력)
 
     Returns:
         저장 성공 여부
     """
     try:
         filepath.parent.mkdir(parents=True, exist_ok=True)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=indent)
+        with open(filepath, 'wb') as f:
+            f.write(dumps(data, indent=indent))
         return True
     except Exception as e:
         print(f"JSON 저장 실패: {e}")
         return False
 
 
+def write_lines(file: IO[str], lines: Iterable[str]) -> int:
+    """
+    줄 단위로 파일에 바로 쓰기 ('\n'.join 과 같은 결과, 마지막 줄바꿈 없음)
+
+    전체 문자열을 메모리에 만들지 않고 한 줄씩 출력
+
+    Args:
+        file: 쓰기 모드로 열린 텍스트 파일
+        lines: 출력할 줄 (줄바꿈 제외)
+
+    Returns:
+        출력한 줄 수
+    """
+    count = 0
+    for line in lines:
+        if count:
+            file.write("\n")
+        file.write(line)
+        count += 1
+    return count
+
+
 def load_json(filepath: Path) -> Optional[Any]:
     """
     JSON 파일 로드
@@ -41,8 +74,8 @@ def load_json(filepath: Path) -> Optional[Any]:
     """
     try:
         if filepath.exists():
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(filepath, 'rb') as f:
+                return loads(f.read())
     except Exception as e:
         print(f"JSON 로드 실패: {e}")
     return None
@@ -119,15 +152,37 @@ def remove_duplicates(items: List[Dict], key: str = "order_no") -> List[Dict]:
         key: 중복 체크 키
 
     Returns:
-        중복 제거된 리스트
+        중복 제거된 리스트 (키별 첫 번째 아이템, 원래 순서 유지)
     """
-    seen = set()
-    result = []
+    # 키 → 첫 아이템 (dict 가 삽입 순서를 유지하므로 별도 결과 리스트 불필요)
+    unique = {}
     for item in items:
-        if item.get(key) not in seen:
-            seen.add(item.get(key))
-            result.append(item)
-    return result
+        unique.setdefault(item.get(key), item)
+    return list(unique.values())
+
+
+def largest_n_positions(values: np.ndarray, n: int) -> np.ndarray:
+    """
+    값이 큰 순으로 상위 n개 위치 선택 (heapq.nlargest / DataFrame.nlargest 와 같은 순서, 동률은 앞쪽 우선)
+
+    argpartition 으로 경계값을 찾은 뒤 그 이상 후보만 안정 정렬
+    (하위 n개는 부호를 바꾼 배열을 넘기면 heapq.nsmallest 와 같은 순서)
+
+    Args:
+        values: 점수 배열 (NaN 제외)
+        n: 선택 개수
+
+    Returns:
+        선택된 위치 배열 (내림차순)
+    """
+    if n <= 0 or values.size == 0:
+        return np.empty(0, dtype=np.intp)
+    if values.size > n:
+        kth = values[np.argpartition(-values, n - 1)[n - 1]]
+        candidates = np.flatnonzero(values >= kth)
+    else:
+        candidates = np.arange(values.size)
+    return candidates[np.argsort(-values[candidates], kind="stable")[:n]]
 
 
 def parse_datetime(date_string: str, format: str = "%Y-%m-%d %H:%M:%S") -> Optional[datetime]:
@@ -142,6 +197,11 @@ def parse_datetime(date_string: str, format: str = "%Y-%m-%d %H:%M:%S") -> Optio
         datetime 객체 또는 None
     """
     try:
+        # 기본 형식은 정규식 + datetime 생성자로 처리 (strptime 보다 빠름, 달력 검증 포함)
+        if format == _DEFAULT_DATETIME_FORMAT:
+            match = _DEFAULT_DATETIME_RE.fullmatch(date_string)
+            if match:
+                return datetime(*map(int, match.groups()))
         return datetime.strptime(date_string, format)
     except (ValueError, TypeError):
         return None
\ No newline at end of file
@@ -3,6 +3,7 @@
 """
 import logging
 import logging.handlers
+from functools import lru_cache
 from pathlib import Path
 from config.settings import (
     LOG_LEVEL,
@@ -12,11 +13,18 @@ from config.settings import (
     LOGS_DIR
 )
 
+# 로그 레벨 / 포맷터 (모듈 로드 시 한 번만 생성)
+_LEVEL = getattr(logging, LOG_LEVEL)
+_FORMATTER = logging.Formatter(LOG_FORMAT)
 
+
+@lru_cache(maxsize=None)
 def setup_logger(name: str, log_file: str = None) -> logging.Logger:
     """
     로거 설정 함수
 
+    같은 인자로 다시 호출하면 이미 설정된 로거를 그대로 반환한다.
+
     Args:
         name: 로거 이름
         log_file: 로그 파일명 (선택사항)
@@ -25,7 +33,7 @@ def setup_logger(name: str, log_file: str = None) -> logging.Logger:
         설정된 로거 객체
     """
     logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, LOG_LEVEL))
+    logger.setLevel(_LEVEL)
 
     # 이미 핸들러가 있으면 중복 추가 방지
     if logger.handlers:
@@ -33,21 +41,21 @@ def setup_logger(name: str, log_file: str = None) -> logging.Logger:
 
     # 콘솔 핸들러
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(getattr(logging, LOG_LEVEL))
-    console_formatter = logging.Formatter(LOG_FORMAT)
-    console_handler.setFormatter(console_formatter)
+    console_handler.setLevel(_LEVEL)
+    console_handler.setFormatter(_FORMATTER)
     logger.addHandler(console_handler)
 
     # 파일 핸들러 (선택사항)
     if log_file:
+        LOGS_DIR.mkdir(parents=True, exist_ok=True)
         log_path = LOGS_DIR / log_file
         file_handler = logging.handlers.RotatingFileHandler(
             log_path,
             maxBytes=LOG_FILE_MAX_SIZE,
             backupCount=LOG_FILE_BACKUP_COUNT
         )
-        file_handler.setLevel(getattr(logging, LOG_LEVEL))
-        file_handler.setFormatter(console_formatter)
+        file_handler.setLevel(_LEVEL)
+        file_handler.setFormatter(_FORMATTER)
         logger.addHandler(file_handler)
 
     return logger
@@ -0,0 +1,91 @@
+"""
+JSON 직렬화 유틸리티
+
+orjson 이 설치되어 있으면 사용하고, 없으면 표준 json 모듈로 대체
+"""
+import json
+import mmap
+from datetime import date
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # orjson 은 선택 의존성
+    orjson = None
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """
+    JSON 파싱
+
+    Args:
+        data: JSON 바이트 또는 문자열 (바이트를 넘기면 디코딩 단계 생략)
+
+    Returns:
+        파싱된 데이터
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def load_file(filepath: Path) -> Any:
+    """
+    JSON 파일을 메모리 맵으로 열어 파싱 (파일 내용을 bytes 로 복사하지 않음)
+
+    Args:
+        filepath: 파일 경로 (빈 파일이면 ValueError)
+
+    Returns:
+        파싱된 데이터
+    """
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            return loads(view)
+
+
+def _json_default(obj: Any) -> Any:
+    """
+    표준 json 이 처리하지 못하는 값 변환 (orjson 과 같은 표현)
+
+    Args:
+        obj: 직렬화할 값
+
+    Returns:
+        JSON 으로 표현 가능한 값
+    """
+    if isinstance(obj, date):  # datetime 포함, ISO 8601 문자열
+        return obj.isoformat()
+    if isinstance(obj, (np.generic, np.ndarray)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(data: Any, indent: Optional[int] = None) -> bytes:
+    """
+    JSON 직렬화 (UTF-8 바이트)
+
+    orjson 은 들여쓰기 2칸만 지원하므로 그 외 들여쓰기는 표준 json 사용
+    (표준 json 도 datetime / NumPy 값을 orjson 과 같은 형태로 직렬화)
+
+    Args:
+        data: 직렬화할 데이터
+        indent: 들여쓰기 크기 (None 이면 압축 출력)
+
+    Returns:
+        UTF-8 로 인코딩된 JSON 바이트
+    """
+    if orjson is not None and indent in (None, 2):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent == 2:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+
+    return json.dumps(
+        data, ensure_ascii=False, indent=indent, default=_json_default
+    ).encode("utf-8")
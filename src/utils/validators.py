@@ -2,7 +2,9 @@
 데이터 검증 유틸리티
 """
 from typing import Dict, List, Any, Optional
-from datetime import datetime
+import numpy as np
+
+from src.utils.helpers import parse_datetime
 
 
 class DataValidator:
@@ -41,9 +43,9 @@ class DataValidator:
     }
 
     # 유효한 값 정의
-    VALID_ORDER_TYPES = ["구매", "판매"]
-    VALID_ORDER_STATUS = ["대기", "완료", "취소", "체결"]  # "체결" 추가
-    VALID_CATEGORIES = ["저작재산권", "저작인접권"]
+    VALID_ORDER_TYPES = frozenset({"구매", "판매"})
+    VALID_ORDER_STATUS = frozenset({"대기", "완료", "취소", "체결"})  # "체결" 추가
+    VALID_CATEGORIES = frozenset({"저작재산권", "저작인접권"})
 
     @classmethod
     def validate_order(cls, order: Dict[str, Any]) -> tuple[bool, List[str]]:
@@ -57,16 +59,19 @@ class DataValidator:
             (검증 성공 여부, 에러 메시지 리스트)
         """
         errors = []
+        field_types = cls.FIELD_TYPES
+        order_types = cls.VALID_ORDER_TYPES
+        order_statuses = cls.VALID_ORDER_STATUS
 
         # 필수 필드 확인
         for field in cls.REQUIRED_FIELDS:
             if field not in order or order[field] is None:
                 errors.append(f"필수 필드 누락: {field}")
 
-        # 타입 검증
-        for field, value in order.items():
-            if field in cls.FIELD_TYPES and value is not None:
-                expected_type = cls.FIELD_TYPES[field]
+        # 타입 검증 (스키마에 정의된 필드만 조회)
+        for field, expected_type in field_types.items():
+            value = order.get(field)
+            if value is not None:
                 if not isinstance(value, expected_type):
                     errors.append(f"타입 오류 - {field}: {type(value).__name__} (예상: {expected_type})")
 
@@ -79,27 +84,131 @@ class DataValidator:
             if order["order_royalty_rate"] < 0:
                 errors.append(f"수익률이 음수: {order['order_royalty_rate']}")
 
-        # 유효한 값 검증
-        if "order_type" in order and order["order_type"] not in cls.VALID_ORDER_TYPES:
+        # 유효한 값 검증 (문자열이 아닌 값은 해시 불가능할 수 있으므로 먼저 제외)
+        if "order_type" in order and not (
+            isinstance(order["order_type"], str) and order["order_type"] in order_types
+        ):
             errors.append(f"잘못된 주문 타입: {order['order_type']}")
 
-        if "order_status" in order and order["order_status"] not in cls.VALID_ORDER_STATUS:
+        if "order_status" in order and not (
+            isinstance(order["order_status"], str) and order["order_status"] in order_statuses
+        ):
             errors.append(f"잘못된 주문 상태: {order['order_status']}")
 
         # 날짜 형식 검증
         if "order_date" in order and order["order_date"]:
-            try:
-                datetime.strptime(order["order_date"], "%Y-%m-%d %H:%M:%S")
-            except ValueError:
+            if parse_datetime(order["order_date"]) is None:
                 errors.append(f"잘못된 날짜 형식: {order['order_date']}")
 
         return (len(errors) == 0, errors)
 
+    @classmethod
+    def is_valid_order(cls, order: Dict[str, Any]) -> bool:
+        """
+        주문 데이터 유효성만 빠르게 판정 (에러 메시지 생성 없이 첫 오류에서 중단)
+
+        validate_order 와 같은 규칙을 적용
+
+        Args:
+            order: 검증할 주문 데이터
+
+        Returns:
+            검증 성공 여부
+        """
+        if not cls._has_valid_structure(order):
+            return False
+
+        if order["order_price"] <= 0 or order["order_royalty_rate"] < 0:
+            return False
+
+        if order["order_type"] not in cls.VALID_ORDER_TYPES:
+            return False
+
+        if order["order_status"] not in cls.VALID_ORDER_STATUS:
+            return False
+
+        if order["order_date"] and parse_datetime(order["order_date"]) is None:
+            return False
+
+        return True
+
+    @classmethod
+    def _has_valid_structure(cls, order: Dict[str, Any]) -> bool:
+        """
+        필수 필드 존재 및 필드 타입 확인
+
+        Args:
+            order: 검증할 주문 데이터
+
+        Returns:
+            구조 검증 성공 여부
+        """
+        for field in cls.REQUIRED_FIELDS:
+            if order.get(field) is None:
+                return False
+
+        for field, expected_type in cls.FIELD_TYPES.items():
+            value = order.get(field)
+            if value is not None and not isinstance(value, expected_type):
+                return False
+
+        return True
+
+    @classmethod
+    def validity_mask(cls, orders: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        배치 주문 데이터 유효성 마스크 (validate_order 와 같은 규칙)
+
+        구조/타입 검증은 주문별로, 값 범위와 허용값 검증은 NumPy 배열 연산으로 일괄 처리
+
+        Args:
+            orders: 주문 데이터 리스트
+
+        Returns:
+            주문별 유효 여부 bool 배열
+        """
+        mask = np.zeros(len(orders), dtype=bool)
+
+        # 1. 구조/타입 검증 통과 주문
+        structured = np.flatnonzero(
+            np.fromiter((cls._has_valid_structure(o) for o in orders), dtype=bool, count=len(orders))
+        )
+        if structured.size == 0:
+            return mask
+        subset = [orders[i] for i in structured]
+
+        # 2. 값 범위 / 허용값 검증 (배열 연산)
+        prices = np.fromiter((o["order_price"] for o in subset), dtype=np.float64, count=len(subset))
+        royalty_rates = np.fromiter(
+            (o["order_royalty_rate"] for o in subset), dtype=np.float64, count=len(subset)
+        )
+        order_types = np.array([o["order_type"] for o in subset], dtype=object)
+        statuses = np.array([o["order_status"] for o in subset], dtype=object)
+
+        # validate_order 와 같이 0 이하 가격 / 음수 수익률만 거부 (NaN 은 통과)
+        valid = (
+            ~(prices <= 0)
+            & ~(royalty_rates < 0)
+            & np.isin(order_types, list(cls.VALID_ORDER_TYPES))
+            & np.isin(statuses, list(cls.VALID_ORDER_STATUS))
+        )
+
+        # 3. 날짜 형식 검증 (남은 후보만)
+        for i in np.flatnonzero(valid):
+            order_date = subset[i]["order_date"]
+            if order_date and parse_datetime(order_date) is None:
+                valid[i] = False
+
+        mask[structured[valid]] = True
+        return mask
+
     @classmethod
     def validate_batch(cls, orders: List[Dict[str, Any]]) -> tuple[int, int, List[str]]:
         """
         배치 데이터 검증
 
+        유효성은 validity_mask 로 일괄 판정하고, 에러 메시지는 유효하지 않은 주문에 대해서만 생성
+
         Args:
             orders: 주문 데이터 리스트
 
@@ -107,14 +216,13 @@ class DataValidator:
             (전체 개수, 유효한 개수, 전체 에러 메시지)
         """
         total_count = len(orders)
-        valid_count = 0
+        mask = cls.validity_mask(orders)
+        valid_count = int(mask.sum())
         all_errors = []
+        _validate = cls.validate_order
 
-        for i, order in enumerate(orders):
-            is_valid, errors = cls.validate_order(order)
-            if is_valid:
-                valid_count += 1
-            else:
-                all_errors.extend([f"Order #{i+1}: {e}" for e in errors])
+        for i in np.flatnonzero(~mask):
+            _, errors = _validate(orders[i])
+            all_errors.extend([f"Order #{i+1}: {e}" for e in errors])
 
-        return total_count, valid_count, all_errors
\ No newline at end of file
+        return total_count, valid_count, all_errors
@@ -3,11 +3,16 @@ Streamlit 대시보드 - 뮤직카우 시장 분석
 """
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
+from io import BytesIO
 import json
+import os
+
+from src.utils.helpers import largest_n_positions
 
 # 페이지 설정
 st.set_page_config(
@@ -23,44 +28,147 @@ PROJECT_ROOT = Path(__file__).parent
 # KST 타임존 설정
 KST = timezone(timedelta(hours=9))
 
+# 범주형으로 변환할 컬럼
+CATEGORICAL_COLUMNS = ('order_type', 'signal', 'order_status', 'song_category', 'song_name', 'song_artist')
+
+# 대시보드에서 사용하는 컬럼 (주문번호/링크/잔여수량/적정가 등은 로드 직후 제외)
+DASHBOARD_COLUMNS = (
+    'order_date', 'song_name', 'song_artist', 'song_category', 'order_type', 'order_status',
+    'order_price', 'recent_price', 'order_royalty_rate',
+    'spread_rate', 'expected_yield', 'liquidity_score', 'signal',
+)
+
+# 다운캐스트할 정수 컬럼 (지표 float 컬럼은 표시/CSV 값 유지를 위해 float64 유지)
+UNSIGNED_COLUMNS = ('order_price', 'recent_price')
+
+# 디스크 캐시 (프로세스 재시작 후에도 API 호출/지표 계산 생략, st.cache_data 와 같은 TTL)
+DATA_CACHE_PATH = PROJECT_ROOT / "cache" / "latest.parquet"
+DATA_CACHE_TTL = 300
+
+# 디스크 캐시 읽기/쓰기에서 예상되는 오류 (파일 접근, 손상된 parquet, pyarrow 미설치/변환 실패)
+DATA_CACHE_ERRORS = (OSError, ValueError, TypeError, ImportError)
+
+
 def get_kst_now():
     """현재 KST 시간 반환"""
     return datetime.now(KST)
 
 
-@st.cache_data(ttl=300)  # 5분 캐시
+@st.cache_resource
+def get_http_session():
+    """API 호출용 HTTP 세션 (재실행 간 공유, keep-alive 연결 재사용)"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+    return session
+
+
+@st.cache_resource
+def get_metrics_engine():
+    """지표 계산 엔진 (상태가 없으므로 재실행 간 한 인스턴스 공유)"""
+    from src.calculator.metrics_engine import MetricsEngine
+
+    return MetricsEngine()
+
+
+def read_data_cache(max_age=DATA_CACHE_TTL):
+    """
+    디스크 캐시 로드 (없거나 max_age 초보다 오래됐거나 컬럼 구성이 다르거나 손상 시 None)
+
+    max_age 가 None 이면 저장 시각과 관계없이 로드
+    """
+    try:
+        age = datetime.now().timestamp() - DATA_CACHE_PATH.stat().st_mtime
+        if max_age is not None and age > max_age:
+            return None
+        cached = pd.read_parquet(DATA_CACHE_PATH)
+    except FileNotFoundError:
+        return None
+    except DATA_CACHE_ERRORS as e:
+        st.warning(f"데이터 캐시를 읽지 못했습니다: {e}")
+        return None
+
+    # 이전 버전에서 저장된 캐시처럼 컬럼 구성이 현재 대시보드와 다르면 사용하지 않음
+    if set(cached.columns) != set(DASHBOARD_COLUMNS):
+        return None
+
+    return cached
+
+
+def write_data_cache(df):
+    """계산된 DataFrame 을 디스크 캐시로 저장 (실패해도 경고만 표시하고 대시보드는 계속 동작)"""
+    # 여러 프로세스가 동시에 저장해도 서로의 임시 파일을 덮어쓰지 않도록 프로세스별 임시 파일 사용
+    tmp_path = DATA_CACHE_PATH.with_name(f"{DATA_CACHE_PATH.stem}.{os.getpid()}.tmp")
+    try:
+        DATA_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(tmp_path, compression="zstd", index=False)
+        tmp_path.replace(DATA_CACHE_PATH)
+    except DATA_CACHE_ERRORS as e:
+        tmp_path.unlink(missing_ok=True)
+        st.warning(f"데이터 캐시를 저장하지 못했습니다: {e}")
+
+
+@st.cache_resource(ttl=300)  # 5분 캐시 (재실행마다 복사/역직렬화하지 않고 같은 DataFrame 공유)
 def load_latest_data():
-    """뮤직카우 API에서 최신 데이터 수집 및 지표 계산"""
+    """
+    뮤직카우 API에서 최신 데이터 수집 및 지표 계산
+
+    반환된 DataFrame 은 모든 세션이 공유하므로 호출 측에서 직접 수정하지 않는다
+    (필터/assign 으로 새 프레임을 만들어 사용)
+    """
+    # 재시작 직후에는 디스크 캐시 사용 (범주형/정수 dtype 그대로 복원)
+    cached = read_data_cache()
+    if cached is not None and not cached.empty:
+        return cached
+
     try:
         import requests
-        from src.calculator.metrics_engine import MetricsEngine
+        from src.utils.serialization import loads
 
         # 뮤직카우 API에서 데이터 가져오기
         api_url = "https://data.musicow.com/files/v1/market/orders.json"
-        response = requests.get(api_url, timeout=30)
+        response = get_http_session().get(api_url, timeout=30)
         response.raise_for_status()
 
-        raw_data = response.json()
+        # 응답 바이트를 바로 파싱 (orjson 사용 가능 시)
+        raw_data = loads(response.content)
 
         if not raw_data:
             return None
 
-        # 지표 계산 (배치 처리)
-        engine = MetricsEngine()
-        metrics_data = engine.calculate_batch_metrics(raw_data)
+        # 지표 계산 (배치 처리, 주문별 dict 변환 없이 컬럼 단위로 DataFrame 구성)
+        df = get_metrics_engine().calculate_batch_metrics_frame(raw_data)
 
-        if not metrics_data:
+        if df.empty:
             return None
 
-        # DataFrame 변환
-        df = pd.DataFrame(metrics_data)
+        # 사용하는 컬럼만 남겨 이후 필터/집계/캐시 크기 축소
+        df = df.drop(columns=df.columns.difference(DASHBOARD_COLUMNS))
 
         if 'order_date' in df.columns:
             df['order_date'] = pd.to_datetime(df['order_date'])
 
+        # 반복 비교/집계되는 문자열 컬럼은 범주형으로 변환 (정수 코드 비교, 곡명/아티스트도 주문 수 대비 고유값이 적음)
+        for col in CATEGORICAL_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+
+        # 정수 컬럼은 값 손실 없이 가장 작은 부호 없는 정수형으로 다운캐스트
+        for col in UNSIGNED_COLUMNS:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], downcast='unsigned')
+
+        write_data_cache(df)
         return df
 
     except requests.exceptions.RequestException as e:
+        # API 장애 시 만료된 디스크 캐시라도 있으면 그대로 표시
+        stale = read_data_cache(max_age=None)
+        if stale is not None and not stale.empty:
+            st.warning(f"API 연결 오류로 이전에 저장된 데이터를 표시합니다: {str(e)}")
+            return stale
         st.error(f"API 연결 오류: {str(e)}")
         return None
     except Exception as e:
@@ -68,22 +176,74 @@ def load_latest_data():
         return None
 
 
-def calculate_summary_stats(df):
-    """요약 통계 계산"""
+def category_mask(series, values):
+    """
+    선택 값 포함 여부 마스크 (Series.isin 과 같은 결과)
+
+    범주형 컬럼은 문자열 비교 대신 선택 범주의 정수 코드로 비교
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.isin(values).to_numpy()
+    selected = series.cat.categories.get_indexer(list(values))
+    return np.isin(series.cat.codes.to_numpy(), selected[selected >= 0])
+
+
+def count_values(series):
+    """
+    값별 개수 (개수 내림차순)
+
+    범주형 컬럼은 필터링 후 남지 않은 범주(개수 0)를 제외
+    """
+    counts = series.value_counts()
+    return counts[counts > 0]
+
+
+def top_value_counts(series, n):
+    """
+    개수 상위 n개 값 (value_counts().head(n) 과 같은 순서, 동률은 먼저 등장한 값 우선)
+
+    범주형 컬럼도 범주 순서가 아닌 등장 순서로 동률을 정리
+    """
+    codes, uniques = pd.factorize(series)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    order = np.argsort(-counts, kind='stable')[:n]
+    return pd.Series(counts[order], index=np.asarray(uniques)[order])
+
+
+def top_n_rows(df, column, n, largest=True):
+    """
+    column 기준 상위(largest=False 이면 하위) n개 행 (DataFrame.nlargest/nsmallest 와 같은 결과)
+
+    largest_n_positions 로 부분 선택하고, 값이 있는 행이 n개보다 적으면 NaN 행을 원래 순서대로 뒤에 채움
+    """
+    values = df[column].to_numpy(dtype=np.float64)
+    is_nan = np.isnan(values)
+    valid = np.flatnonzero(~is_nan)
+    keys = values[valid] if largest else -values[valid]
+    positions = valid[largest_n_positions(keys, n)]
+    if positions.size < n:
+        positions = np.concatenate([positions, np.flatnonzero(is_nan)[:n - positions.size]])
+    return df.iloc[positions]
+
+
+def calculate_summary_stats(df, views=None):
+    """요약 통계 계산 (views: precompute_views 결과, 있으면 재사용)"""
     if df is None or df.empty:
         return {}
 
+    # 개수는 bool 배열 합계로 집계 (마스크마다 부분 DataFrame 을 만들지 않음)
     total_orders = len(df)
-    buy_orders = len(df[df['order_type'] == '구매'])
-    sell_orders = len(df[df['order_type'] == '판매'])
-    waiting_orders = len(df[df['order_status'] == '대기'])
+    order_type = df['order_type'].to_numpy()
+    buy_orders = int((order_type == '구매').sum())
+    sell_orders = int((order_type == '판매').sum())
+    waiting_orders = int((df['order_status'].to_numpy() == '대기').sum())
 
-    avg_spread = df['spread_rate'].mean()
-    avg_yield = df['expected_yield'].mean()
-    avg_liquidity = df['liquidity_score'].mean()
+    # 평균 지표 (한 번의 호출로 세 컬럼 계산)
+    avg_spread, avg_yield, avg_liquidity = df[['spread_rate', 'expected_yield', 'liquidity_score']].mean()
 
     # 시그널 분포
-    signals = df['signal'].value_counts().to_dict()
+    signal_counts = views['signal_counts'] if views else count_values(df['signal'])
+    signals = signal_counts.to_dict()
 
     return {
         "total_orders": total_orders,
@@ -99,73 +259,504 @@ def calculate_summary_stats(df):
     }
 
 
+# 차트 캐시 설정 (필터 상태가 같으면 재실행 시 Figure 를 다시 만들지 않음)
+CHART_CACHE_TTL = 300
+CHART_CACHE_MAX_ENTRIES = 32
+
+# 즉시 체결 기준 (스프레드율 절대값 %) 및 분포 차트 구간 경계 (0.5%p 간격 20개 구간)
+INSTANT_MATCH_SPREAD_LIMIT = 5.0
+INSTANT_MATCH_BIN_EDGES = np.linspace(-INSTANT_MATCH_SPREAD_LIMIT, INSTANT_MATCH_SPREAD_LIMIT, 21)
+
+# 시그널별 색상
+SIGNAL_COLOR_MAP = {
+    '주의': '#dc2626',
+    '유동성↓': '#f59e0b',
+    '보통': '#6b7280',
+    '저평가, 유동성↓': '#059669',
+    '고평가': '#ef4444',
+    '저평가': '#10b981',
+    '유동성↑': '#3b82f6'
+}
+
+# 카테고리별 색상
+CATEGORY_COLOR_MAP = {
+    '저작재산권': '#3b82f6',
+    '저작인접권': '#f59e0b'
+}
+
+
+@st.cache_data(ttl=CHART_CACHE_TTL, max_entries=CHART_CACHE_MAX_ENTRIES)
+def precompute_views(df):
+    """
+    반복 사용되는 컬럼 요약 (고유값 / 값별 개수) 계산
+
+    같은 데이터로 재실행되면 캐시된 결과를 재사용
+
+    Returns:
+        요약 이름 → 값 딕셔너리
+    """
+    return {
+        'order_types': sorted(df['order_type'].unique().tolist()) if 'order_type' in df.columns else [],
+        'signals': sorted(df['signal'].unique().tolist()) if 'signal' in df.columns else [],
+        'signal_counts': count_values(df['signal']),
+        'status_counts': count_values(df['order_status']),
+        'song_top5': top_value_counts(df['song_name'], 5),
+        'artist_top5': top_value_counts(df['song_artist'], 5),
+    }
+
+
+@st.cache_data(ttl=CHART_CACHE_TTL, max_entries=CHART_CACHE_MAX_ENTRIES)
+def build_signal_pie(signal_df):
+    """시그널 분포 도넛 차트 생성 (시그널/개수/텍스트 컬럼)"""
+    colors = [SIGNAL_COLOR_MAP.get(sig, '#6b7280') for sig in signal_df['시그널']]
+
+    fig = go.Figure(data=[go.Pie(
+        labels=signal_df['시그널'].tolist(),
+        values=signal_df['개수'].tolist(),
+        hole=0.4,
+        text=signal_df['텍스트'].tolist(),
+        textinfo='text',
+        textposition='inside',
+        marker=dict(colors=colors),
+        hoverinfo='label+value+percent'
+    )])
+    fig.update_layout(
+        height=350,
+        showlegend=True,
+        legend=dict(
+            orientation="v",
+            yanchor="middle",
+            y=0.5,
+            xanchor="left",
+            x=1.02
+        )
+    )
+    return fig
+
+
+@st.cache_data(ttl=CHART_CACHE_TTL, max_entries=CHART_CACHE_MAX_ENTRIES)
+def build_spread_bar(spread_rate):
+    """스프레드율 구간별 주문 수 바 차트 생성"""
+    # 스프레드율 구간 경계 (오른쪽 닫힌 구간: (-inf, -20], (-20, -10], ... (20, inf))
+    edges = np.array([-20, -10, 10, 20], dtype=np.float64)
+    labels = ['매우 저평가\n(< -20%)', '저평가\n(-20~-10%)',
+              '적정\n(-10~10%)', '고평가\n(10~20%)', '매우 고평가\n(> 20%)']
+
+    # 스프레드율 구간 분류 (결측값 제외, 경계값은 아래 구간에 포함)
+    values = spread_rate.to_numpy(dtype=np.float64)
+    values = values[~np.isnan(values)]
+    bin_index = np.searchsorted(edges, values, side='left')
+
+    # 명시적으로 데이터 변환
+    x_values = labels
+    y_values = np.bincount(bin_index, minlength=len(labels)).tolist()
+    colors = ['#10b981', '#34d399', '#6b7280', '#fb923c', '#ef4444']
+
+    # 바 차트
+    fig = go.Figure(data=[
+        go.Bar(
+            x=x_values,
+            y=y_values,
+            marker_color=colors,
+            text=y_values,
+            textposition='outside',
+            hovertemplate='%{x}<br>주문 수: %{y}<extra></extra>'
+        )
+    ])
+    fig.update_layout(
+        height=350,
+        xaxis_title="스프레드율 구간",
+        yaxis_title="주문 수",
+        showlegend=False,
+        yaxis=dict(rangemode='tozero')
+    )
+    return fig
+
+
+@st.cache_data(ttl=CHART_CACHE_TTL, max_entries=CHART_CACHE_MAX_ENTRIES)
+def build_instant_match_figs(instant_df):
+    """
+    즉시 체결 주문 차트 생성 (spread_rate/order_type 컬럼)
+
+    Returns:
+        (스프레드 분포 히스토그램, 주문 타입별 파이 차트)
+    """
+    # 서버에서 미리 구간 집계 (원본 값 대신 20개 막대만 브라우저로 전송)
+    values = instant_df['spread_rate'].to_numpy(dtype=np.float64)
+    counts, edges = np.histogram(values[~np.isnan(values)], bins=INSTANT_MATCH_BIN_EDGES)
+    hist_fig = go.Figure(data=[go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts.tolist(),
+        width=np.diff(edges),
+        marker_color='#3b82f6',
+        hovertemplate='%{x:.2f}%<br>주문 수: %{y}<extra></extra>'
+    )])
+    hist_fig.add_vline(x=0, line_dash="dash", line_color="red", annotation_text="최근가")
+    hist_fig.update_layout(
+        height=300,
+        showlegend=False,
+        bargap=0,
+        xaxis_title='스프레드율 (%)',
+        yaxis_title='count'
+    )
+
+    type_counts = count_values(instant_df['order_type'])
+    pie_fig = px.pie(
+        values=type_counts.values,
+        names=type_counts.index,
+        color_discrete_map={'구매': '#10b981', '판매': '#ef4444'}
+    )
+    pie_fig.update_layout(height=300)
+    return hist_fig, pie_fig
+
+
+@st.cache_data(ttl=CHART_CACHE_TTL, max_entries=CHART_CACHE_MAX_ENTRIES)
+def build_momentum_frame(df):
+    """곡별 가격 모멘텀 테이블 생성 (같은 필터 결과면 캐시 재사용)"""
+    engine = get_metrics_engine()
+
+    # 대기 중인 주문만 사용
+    waiting_orders = df[df['order_status'] == '대기'].to_dict('records')
+
+    # 고유 곡 목록
+    unique_songs = df['song_name'].unique()
+
+    # 곡별 모멘텀은 곡당 한 번만 계산
+    momentum_by_song = engine.calculate_batch_momentum(waiting_orders, unique_songs)
+
+    # 곡별 첫 주문 (곡마다 전체 프레임을 다시 필터링하지 않음)
+    song_infos = df.drop_duplicates('song_name').set_index('song_name')
+
+    momentum_data = []
+    for song in unique_songs:
+        momentum = momentum_by_song[song]
+
+        # 해당 곡 정보 가져오기
+        song_info = song_infos.loc[song]
+
+        momentum_data.append({
+            'song_name': song,
+            'song_artist': song_info['song_artist'],
+            'recent_price': song_info['recent_price'],
+            'momentum_score': momentum['momentum_score'],
+            'buy_pressure': momentum['buy_pressure'],
+            'sell_pressure': momentum['sell_pressure'],
+            'waiting_count': momentum['waiting_count'],
+            'price_min': momentum['price_range'][0],
+            'price_max': momentum['price_range'][1]
+        })
+
+    return pd.DataFrame(momentum_data)
+
+
+@st.cache_data(ttl=CHART_CACHE_TTL, max_entries=CHART_CACHE_MAX_ENTRIES)
+def build_momentum_figs(momentum_df):
+    """
+    모멘텀 차트 생성 (momentum_score 컬럼)
+
+    Returns:
+        (모멘텀 점수 히스토그램, 추세별 파이 차트)
+    """
+    hist_fig = px.histogram(
+        momentum_df,
+        x='momentum_score',
+        nbins=30,
+        labels={'momentum_score': '모멘텀 점수 (%)'},
+        color_discrete_sequence=['#3b82f6']
+    )
+    hist_fig.add_vline(x=0, line_dash="dash", line_color="red", annotation_text="중립")
+    hist_fig.update_layout(height=300, showlegend=False)
+
+    trend = momentum_df['momentum_score'].apply(
+        lambda x: '강한 상승' if x > 10 else ('상승' if x > 0 else ('하락' if x > -10 else '강한 하락'))
+    )
+    trend_counts = trend.value_counts()
+    pie_fig = px.pie(
+        values=trend_counts.values,
+        names=trend_counts.index,
+        color_discrete_map={
+            '강한 상승': '#10b981',
+            '상승': '#84cc16',
+            '하락': '#f59e0b',
+            '강한 하락': '#ef4444'
+        }
+    )
+    pie_fig.update_layout(height=300)
+    return hist_fig, pie_fig
+
+
+@st.cache_data(ttl=CHART_CACHE_TTL, max_entries=CHART_CACHE_MAX_ENTRIES)
+def build_value_scatter(value_df):
+    """가치 투자 기회 스캐터 플롯 생성"""
+    fig = px.scatter(
+        value_df,
+        x='spread_rate',
+        y='expected_yield',
+        size='liquidity_score',
+        color='signal',
+        hover_data=['song_name', 'song_artist', 'order_price'],
+        labels={
+            'spread_rate': '스프레드율 (%)',
+            'expected_yield': '예상 수익률 (%)',
+            'liquidity_score': '유동성 점수'
+        },
+        title=f'가치 투자 기회 ({len(value_df)}개 발견)',
+        color_discrete_map={
+            '저평가': '#10b981',
+            '저평가, 유동성↓': '#059669'
+        },
+        render_mode='webgl'  # SVG 대신 WebGL 로 마커 렌더링 (점이 많아도 브라우저 부담 적음)
+    )
+    fig.update_layout(height=400)
+    return fig
+
+
+@st.cache_data(ttl=CHART_CACHE_TTL, max_entries=CHART_CACHE_MAX_ENTRIES)
+def build_category_boxes(category_df):
+    """
+    카테고리별 가격/수익률/유동성 박스 플롯 생성
+
+    Returns:
+        (가격 분포, 수익률 분포, 유동성 분포) Figure
+    """
+    price_fig = px.box(
+        category_df,
+        x='song_category',
+        y='order_price',
+        color='song_category',
+        labels={'order_price': '주문가 (원)', 'song_category': '카테고리'},
+        color_discrete_map=CATEGORY_COLOR_MAP
+    )
+    price_fig.update_layout(height=350, showlegend=False)
+
+    yield_fig = px.box(
+        category_df,
+        x='song_category',
+        y='expected_yield',
+        color='song_category',
+        labels={'expected_yield': '수익률 (%)', 'song_category': '카테고리'},
+        color_discrete_map=CATEGORY_COLOR_MAP
+    )
+    yield_fig.update_layout(height=300, showlegend=False)
+
+    liquidity_fig = px.box(
+        category_df,
+        x='song_category',
+        y='liquidity_score',
+        color='song_category',
+        labels={'liquidity_score': '유동성 점수', 'song_category': '카테고리'},
+        color_discrete_map=CATEGORY_COLOR_MAP
+    )
+    liquidity_fig.update_layout(height=300, showlegend=False)
+
+    return price_fig, yield_fig, liquidity_fig
+
+
+@st.cache_data(ttl=CHART_CACHE_TTL, max_entries=CHART_CACHE_MAX_ENTRIES)
+def build_hourly_figs(time_df):
+    """
+    시간대별 주문 패턴 차트 생성 (시간대/order_type/spread_rate/expected_yield 컬럼)
+
+    Returns:
+        (차트 딕셔너리, 시간대별 주문 수, 시간대별 평균 스프레드율, 시간대별 평균 수익률)
+    """
+    # 시간대별 주문 수 / 평균 스프레드율 / 평균 수익률 (시간대 0-23 정수 코드별 bincount, 주문이 있는 시간대만)
+    hour = time_df['시간대'].to_numpy()
+    order_counts = np.bincount(hour, minlength=24)
+    hours = np.flatnonzero(order_counts).astype(hour.dtype)
+
+    def hourly_mean(column):
+        # 결측값을 제외한 시간대별 평균 (groupby mean 과 같이 값이 없으면 NaN)
+        values = time_df[column].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(values)
+        sums = np.bincount(hour[valid], weights=values[valid], minlength=24)
+        counts = np.bincount(hour[valid], minlength=24)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (sums / counts)[hours]
+
+    hourly = pd.DataFrame(
+        {
+            '주문수': order_counts[hours],
+            'spread_rate': hourly_mean('spread_rate'),
+            'expected_yield': hourly_mean('expected_yield'),
+        },
+        index=pd.Index(hours, name='시간대')
+    )
+    hourly_counts = hourly['주문수'].reset_index()
+
+    orders_fig = px.line(
+        hourly_counts,
+        x='시간대',
+        y='주문수',
+        markers=True,
+        labels={'시간대': '시간 (0-23시)', '주문수': '주문 개수'}
+    )
+    orders_fig.update_layout(height=300)
+
+    # 시간대별 평균 스프레드율
+    hourly_spread = hourly['spread_rate'].reset_index()
+    spread_fig = px.line(
+        hourly_spread,
+        x='시간대',
+        y='spread_rate',
+        markers=True,
+        labels={'시간대': '시간 (0-23시)', 'spread_rate': '평균 스프레드율 (%)'}
+    )
+    spread_fig.add_hline(y=0, line_dash="dash", line_color="red", annotation_text="적정가")
+    spread_fig.update_layout(height=300)
+
+    # 시간대별 구매/판매 비율
+    # (그룹핑/피벗 없이 주문 타입별 bincount)
+    order_type = time_df['order_type'].to_numpy()
+    buy_counts = np.bincount(hour[order_type == '구매'], minlength=24)
+    sell_counts = np.bincount(hour[order_type == '판매'], minlength=24)
+
+    type_fig = go.Figure()
+    type_fig.add_trace(go.Bar(x=hours, y=buy_counts[hours], name='구매', marker_color='#10b981'))
+    type_fig.add_trace(go.Bar(x=hours, y=sell_counts[hours], name='판매', marker_color='#ef4444'))
+
+    type_fig.update_layout(
+        barmode='group',
+        xaxis_title='시간대 (0-23시)',
+        yaxis_title='주문 수',
+        height=350
+    )
+
+    # 시간대별 평균 수익률
+    hourly_yield = hourly['expected_yield'].reset_index()
+
+    yield_fig = px.bar(
+        hourly_yield,
+        x='시간대',
+        y='expected_yield',
+        labels={'시간대': '시간 (0-23시)', 'expected_yield': '평균 수익률 (%)'},
+        color='expected_yield',
+        color_continuous_scale='Viridis'
+    )
+    yield_fig.update_layout(height=350)
+
+    figs = {
+        'orders': orders_fig,
+        'spread': spread_fig,
+        'type': type_fig,
+        'yield': yield_fig,
+    }
+    return figs, hourly_counts, hourly_spread, hourly_yield
+
+
+def lowercase_strings(series):
+    """
+    소문자 문자열 배열 (결측값은 빈 문자열)
+
+    범주형 컬럼은 범주별로 한 번만 소문자로 바꾼 뒤 코드로 펼침 (코드 -1 은 마지막 빈 문자열)
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        lowered = np.append(series.cat.categories.str.lower().to_numpy(dtype=str), '')
+        return lowered[series.cat.codes.to_numpy()]
+    return series.fillna('').str.lower().to_numpy(dtype=str)
+
+
+@st.cache_data(ttl=CHART_CACHE_TTL, max_entries=CHART_CACHE_MAX_ENTRIES)
+def build_search_index(names, artists):
+    """
+    곡명/아티스트 검색용 소문자 문자열 배열 생성 (결측값은 빈 문자열)
+
+    Returns:
+        (곡명 배열, 아티스트 배열)
+    """
+    return lowercase_strings(names), lowercase_strings(artists)
+
+
+@st.cache_data(ttl=CHART_CACHE_TTL, max_entries=CHART_CACHE_MAX_ENTRIES)
+def to_csv_bytes(df):
+    """CSV 다운로드용 바이트 생성 (UTF-8 BOM 포함, 같은 데이터면 캐시 재사용)"""
+    buf = BytesIO()
+    df.to_csv(buf, index=False, encoding='utf-8-sig')
+    return buf.getvalue()
+
+
+# 지표 이해 가이드 (정적 Markdown)
+METRICS_GUIDE_MD = """
+### 🎯 핵심 지표 3가지
+
+#### 1. 스프레드율 (Spread Rate)
+- **정의**: 주문가가 최근가 대비 얼마나 차이 나는지
+- **계산**: `(주문가 - 최근가) / 최근가 × 100`
+- **음수(-)**: 저평가 (주문가 < 최근가)
+- **양수(+)**: 고평가 (주문가 > 최근가)
+- **추천**: -20% ~ -10% (적당한 저평가)
+
+#### 2. 예상 수익률 (Expected Yield)
+- **정의**: 투자금 대비 예상 연간 수익률
+- **계산**: `(저작권료율 × 기준단가) / 주문가 × 100`
+- **10% 이상**: 고수익률 (우수)
+- **5~10%**: 보통 수익률 (양호)
+- **추천**: 7~12% (안정적 수익)
+
+**💡 기준단가란?**
+- 저작권료 지급의 기준이 되는 단가
+- 1개 조각당 1년간 받을 예상 저작권료 계산 기준
+- 예시: 기준단가 10,000원 × 저작권료율 8% = 연간 800원 수익
+
+#### 3. 유동성 점수 (Liquidity Score)
+- **정의**: 얼마나 쉽게 사고팔 수 있는지 (0~100점)
+- **구성**: 스프레드(40%) + 깊이(30%) + 빈도(30%)
+- **80~100점**: 초고유동성 (즉시 거래)
+- **60~80점**: 고유동성 (빠른 거래)
+- **40~60점**: 중유동성 (거래 가능)
+- **추천**: 40점 이상
+
+---
+
+### 🎯 시그널 해석
+
+- **저평가**: 싸고 거래 활발 → 적극 매수 검토
+- **저평가, 유동성↓**: 싸지만 팔기 어려움 → 장기 투자
+- **고평가**: 비싸고 거래 활발 → 매도 검토
+- **유동성↑**: 거래 매우 활발 → 단기 투자 적합
+- **유동성↓**: 거래 어려움 → 비추천
+- **주의**: 비싸고 팔기 어려움 → 투자 금지
+- **보통**: 특별한 특징 없음 → 중립
+
+---
+
+### 💡 투자 체크리스트
+
+✅ **매수 전 확인**
+- [ ] 스프레드율 -10% 이하
+- [ ] 수익률 5% 이상
+- [ ] 유동성 30점 이상
+- [ ] 시그널이 "주의" 아님
+
+⚠️ **주의사항**
+- 베타 서비스 데이터 (불일치 가능)
+- 최근가는 과거 데이터일 수 있음
+- 저작권료는 과거 실적 기반
+- 모든 투자 판단은 본인 책임
+
+📄 **상세 가이드**: [METRICS_GUIDE.md](https://github.com/your-repo/METRICS_GUIDE.md) 참고
+"""
+
+# 데이터 수집 실패 시 안내
+LOAD_ERROR_HELP_MD = """
+**문제 해결**:
+- 뮤직카우 API가 일시적으로 응답하지 않을 수 있습니다.
+- 잠시 후 페이지를 새로고침해주세요.
+- 문제가 지속되면 [뮤직카우 사이트](https://www.musicow.com)를 확인해주세요.
+"""
+
+
 def main():
+    # 이번 실행 기준 시각 (사이드바 표시와 CSV 파일명에 같은 값 사용)
+    now = get_kst_now()
+
     # 헤더
     st.title("🎵 뮤직카우 시장 분석 대시보드")
     st.markdown("실시간 음악 저작권 거래 데이터 분석")
 
     # 지표 가이드 링크
     with st.expander("📚 지표 이해 가이드 (클릭하여 펼치기)"):
-        st.markdown("""
-        ### 🎯 핵심 지표 3가지
-
-        #### 1. 스프레드율 (Spread Rate)
-        - **정의**: 주문가가 최근가 대비 얼마나 차이 나는지
-        - **계산**: `(주문가 - 최근가) / 최근가 × 100`
-        - **음수(-)**: 저평가 (주문가 < 최근가)
-        - **양수(+)**: 고평가 (주문가 > 최근가)
-        - **추천**: -20% ~ -10% (적당한 저평가)
-
-        #### 2. 예상 수익률 (Expected Yield)
-        - **정의**: 투자금 대비 예상 연간 수익률
-        - **계산**: `(저작권료율 × 기준단가) / 주문가 × 100`
-        - **10% 이상**: 고수익률 (우수)
-        - **5~10%**: 보통 수익률 (양호)
-        - **추천**: 7~12% (안정적 수익)
-
-        **💡 기준단가란?**
-        - 저작권료 지급의 기준이 되는 단가
-        - 1개 조각당 1년간 받을 예상 저작권료 계산 기준
-        - 예시: 기준단가 10,000원 × 저작권료율 8% = 연간 800원 수익
-
-        #### 3. 유동성 점수 (Liquidity Score)
-        - **정의**: 얼마나 쉽게 사고팔 수 있는지 (0~100점)
-        - **구성**: 스프레드(40%) + 깊이(30%) + 빈도(30%)
-        - **80~100점**: 초고유동성 (즉시 거래)
-        - **60~80점**: 고유동성 (빠른 거래)
-        - **40~60점**: 중유동성 (거래 가능)
-        - **추천**: 40점 이상
-
-        ---
-
-        ### 🎯 시그널 해석
-
-        - **저평가**: 싸고 거래 활발 → 적극 매수 검토
-        - **저평가, 유동성↓**: 싸지만 팔기 어려움 → 장기 투자
-        - **고평가**: 비싸고 거래 활발 → 매도 검토
-        - **유동성↑**: 거래 매우 활발 → 단기 투자 적합
-        - **유동성↓**: 거래 어려움 → 비추천
-        - **주의**: 비싸고 팔기 어려움 → 투자 금지
-        - **보통**: 특별한 특징 없음 → 중립
-
-        ---
-
-        ### 💡 투자 체크리스트
-
-        ✅ **매수 전 확인**
-        - [ ] 스프레드율 -10% 이하
-        - [ ] 수익률 5% 이상
-        - [ ] 유동성 30점 이상
-        - [ ] 시그널이 "주의" 아님
-
-        ⚠️ **주의사항**
-        - 베타 서비스 데이터 (불일치 가능)
-        - 최근가는 과거 데이터일 수 있음
-        - 저작권료는 과거 실적 기반
-        - 모든 투자 판단은 본인 책임
-
-        📄 **상세 가이드**: [METRICS_GUIDE.md](https://github.com/your-repo/METRICS_GUIDE.md) 참고
-        """)
+        st.markdown(METRICS_GUIDE_MD)
 
     st.markdown("---")
 
@@ -175,12 +766,7 @@ def main():
 
     if df is None or df.empty:
         st.error("⚠️ 데이터를 수집할 수 없습니다. API 연결을 확인해주세요.")
-        st.info("""
-        **문제 해결**:
-        - 뮤직카우 API가 일시적으로 응답하지 않을 수 있습니다.
-        - 잠시 후 페이지를 새로고침해주세요.
-        - 문제가 지속되면 [뮤직카우 사이트](https://www.musicow.com)를 확인해주세요.
-        """)
+        st.info(LOAD_ERROR_HELP_MD)
         return
 
     # 데이터 수집 완료 메시지
@@ -190,8 +776,9 @@ def main():
     use_filter = st.sidebar.checkbox("🔍 필터 사용", value=False)
 
     # 기본값 설정
-    all_order_types = sorted(df['order_type'].unique().tolist()) if 'order_type' in df.columns else []
-    all_signals = sorted(df['signal'].unique().tolist()) if 'signal' in df.columns else []
+    views = precompute_views(df)
+    all_order_types = views['order_types']
+    all_signals = views['signals']
 
     # 스프레드율 범위 기본값 (계산된 데이터가 있는 경우만)
     if 'spread_rate' in df.columns:
@@ -256,30 +843,30 @@ def main():
 
     with st.sidebar:
         st.markdown("---")
-        st.info(f"📅 마지막 업데이트 (KST)\n\n{get_kst_now().strftime('%Y-%m-%d %H:%M:%S')}")
+        st.info(f"📅 마지막 업데이트 (KST)\n\n{now:%Y-%m-%d %H:%M:%S}")
 
-    # 필터 적용
-    filtered_df = df[
-        (df['order_type'].isin(order_types)) &
-        (df['signal'].isin(signals)) &
-        (df['spread_rate'] >= spread_range[0]) &
-        (df['spread_rate'] <= spread_range[1])
-    ].copy()  # 복사본 생성으로 경고 방지
+    # 필터 적용 (배열 단위로 마스크를 만든 뒤 한 번만 슬라이스)
+    spread = df['spread_rate'].to_numpy()
+    mask = category_mask(df['order_type'], order_types)
+    mask &= category_mask(df['signal'], signals)
+    mask &= (spread >= spread_range[0]) & (spread <= spread_range[1])
+    filtered_df = df[mask]
 
     # 대량 주문 필터 적용
     if enable_bulk_filter:
-        # 곡별 주문 수 계산 (대기 중인 주문만)
-        waiting_df = filtered_df[filtered_df['order_status'] == '대기']
-        song_counts = waiting_df['song_name'].value_counts()
+        # 곡별 주문 수 계산 (대기 중인 주문만, 곡명을 정수 코드로 바꿔 한 번에 집계)
+        song_codes, song_names = pd.factorize(filtered_df['song_name'])
+        is_waiting = (filtered_df['order_status'].to_numpy() == '대기') & (song_codes >= 0)
+        waiting_per_song = np.bincount(song_codes[is_waiting], minlength=len(song_names))
+        song_counts = pd.Series(waiting_per_song[waiting_per_song > 0])
 
         # 임계값 이상인 곡만 선택
-        bulk_songs = song_counts[song_counts >= bulk_threshold].index.tolist()
-
-        # 대량 주문 곡만 필터링
-        filtered_df = filtered_df[filtered_df['song_name'].isin(bulk_songs)].copy()
+        bulk_songs = song_names[waiting_per_song >= bulk_threshold].tolist()
 
-        # 대량 주문 정보 추가
-        filtered_df['order_count'] = filtered_df['song_name'].map(song_counts).fillna(0).astype(int)
+        # 대량 주문 곡만 필터링 + 대량 주문 정보 추가 (행별 곡 대기 주문 수를 코드로 바로 조회)
+        per_row = np.where(song_codes >= 0, waiting_per_song[song_codes], 0)
+        is_bulk = per_row >= bulk_threshold
+        filtered_df = filtered_df[is_bulk].assign(order_count=per_row[is_bulk])
     else:
         # 필터 미사용 시 변수 초기화
         bulk_songs = []
@@ -307,7 +894,8 @@ def main():
         return
 
     # 요약 통계
-    stats = calculate_summary_stats(filtered_df)
+    filtered_views = precompute_views(filtered_df)
+    stats = calculate_summary_stats(filtered_df, filtered_views)
 
     # 메인 대시보드
     st.markdown("---")
@@ -351,7 +939,7 @@ def main():
         st.subheader("🎯 시그널 분포")
 
         # 시그널 데이터 준비 (pandas 버전 호환)
-        signal_counts = filtered_df['signal'].value_counts()
+        signal_counts = filtered_views['signal_counts']
         signal_df = pd.DataFrame({
             '시그널': signal_counts.index,
             '개수': signal_counts.values
@@ -370,43 +958,12 @@ def main():
 
         if len(signal_df) > 0:
             # 도넛 차트 - 명시적으로 비율 텍스트 생성
-            signal_df['텍스트'] = signal_df.apply(
-                lambda x: f"{x['시그널']}<br>{x['비율']:.1f}%", axis=1
-            )
+            signal_df['텍스트'] = [
+                f"{signal}<br>{ratio:.1f}%"
+                for signal, ratio in zip(signal_df['시그널'].to_numpy(), signal_df['비율'].to_numpy())
+            ]
 
-            # 색상 매핑
-            color_map = {
-                '주의': '#dc2626',
-                '유동성↓': '#f59e0b',
-                '보통': '#6b7280',
-                '저평가, 유동성↓': '#059669',
-                '고평가': '#ef4444',
-                '저평가': '#10b981',
-                '유동성↑': '#3b82f6'
-            }
-            colors = [color_map.get(sig, '#6b7280') for sig in signal_df['시그널']]
-
-            fig = go.Figure(data=[go.Pie(
-                labels=signal_df['시그널'].tolist(),
-                values=signal_df['개수'].tolist(),
-                hole=0.4,
-                text=signal_df['텍스트'].tolist(),
-                textinfo='text',
-                textposition='inside',
-                marker=dict(colors=colors),
-                hoverinfo='label+value+percent'
-            )])
-            fig.update_layout(
-                height=350,
-                showlegend=True,
-                legend=dict(
-                    orientation="v",
-                    yanchor="middle",
-                    y=0.5,
-                    xanchor="left",
-                    x=1.02
-                )
-            )
+            fig = build_signal_pie(signal_df)
             st.plotly_chart(fig, use_container_width=True, key='signal_chart')
         else:
             st.warning("필터링된 데이터가 없습니다.")
@@ -415,49 +972,19 @@ def main():
         st.subheader("📊 스프레드율 분포")
 
         if len(filtered_df) > 0:
-            # 스프레드율 구간 생성
-            bins = [-float('inf'), -20, -10, 10, 20, float('inf')]
-            labels = ['매우 저평가\n(< -20%)', '저평가\n(-20~-10%)',
-                      '적정\n(-10~10%)', '고평가\n(10~20%)', '매우 고평가\n(> 20%)']
-
-            # 스프레드율 구간 분류
-            spread_ranges = pd.cut(
-                filtered_df['spread_rate'],
-                bins=bins,
-                labels=labels
-            )
-
-            spread_dist = spread_ranges.value_counts().reindex(labels, fill_value=0)
-
-            # 명시적으로 데이터 변환
-            x_values = spread_dist.index.tolist()
-            y_values = spread_dist.values.tolist()
-            colors = ['#10b981', '#34d399', '#6b7280', '#fb923c', '#ef4444']
-
-            # 바 차트
-            fig = go.Figure(data=[
-                go.Bar(
-                    x=x_values,
-                    y=y_values,
-                    marker_color=colors,
-                    text=y_values,
-                    textposition='outside',
-                    hovertemplate='%{x}<br>주문 수: %{y}<extra></extra>'
-                )
-            ])
-            fig.update_layout(
-                height=350,
-                xaxis_title="스프레드율 구간",
-                yaxis_title="주문 수",
-                showlegend=False,
-                yaxis=dict(rangemode='tozero')
-            )
+            fig = build_spread_bar(filtered_df['spread_rate'])
             st.plotly_chart(fig, use_container_width=True, key='spread_chart')
         else:
             st.warning("필터링된 데이터가 없습니다.")
 
     st.markdown("---")
 
+    # 여러 탭에서 공유하는 마스크 (필터 결과에 대해 한 번만 계산)
+    order_type_values = filtered_df['order_type'].to_numpy()
+    is_buy = order_type_values == '구매'
+    is_waiting = filtered_df['order_status'].to_numpy() == '대기'
+    buy_df = filtered_df[is_buy]
+
     # 탭으로 테이블 분리
     tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9 = st.tabs([
         "⚡ 즉시 체결",
@@ -476,15 +1003,15 @@ def main():
         st.markdown("**지금 바로 거래 가능한 주문 (시장가와 ±5% 이내)**")
 
         # 즉시 체결 가능 주문 필터링 (스프레드 절대값 5% 이내)
-        instant_match = filtered_df[
-            (abs(filtered_df['spread_rate']) <= 5.0) &
-            (filtered_df['order_status'] == '대기')
-        ].copy()
+        is_instant = (np.abs(filtered_df['spread_rate'].to_numpy()) <= INSTANT_MATCH_SPREAD_LIMIT) & is_waiting
+        instant_match = filtered_df[is_instant]
 
         if len(instant_match) > 0:
             # 스프레드 절대값 기준 정렬
-            instant_match['abs_spread'] = abs(instant_match['spread_rate'])
-            instant_match_sorted = instant_match.nsmallest(20, 'abs_spread')
+            instant_match_sorted = top_n_rows(
+                instant_match.assign(abs_spread=instant_match['spread_rate'].abs()),
+                'abs_spread', 20, largest=False
+            )
 
             # 요약 정보
             col1, col2, col3, col4 = st.columns(4)
@@ -494,40 +1021,25 @@ def main():
                 avg_spread = instant_match['spread_rate'].mean()
                 st.metric("평균 스프레드", f"{avg_spread:.2f}%")
             with col3:
-                buy_count = len(instant_match[instant_match['order_type'] == '구매'])
+                buy_count = int((is_buy & is_instant).sum())
                 st.metric("매수 주문", f"{buy_count}개")
             with col4:
-                sell_count = len(instant_match[instant_match['order_type'] == '판매'])
+                sell_count = int(((order_type_values == '판매') & is_instant).sum())
                 st.metric("매도 주문", f"{sell_count}개")
 
             st.markdown("---")
 
             # 스프레드 분포 차트
             col1, col2 = st.columns(2)
+            hist_fig, pie_fig = build_instant_match_figs(instant_match[['spread_rate', 'order_type']])
 
             with col1:
                 st.markdown("### 📊 스프레드 분포")
-                fig = px.histogram(
-                    instant_match,
-                    x='spread_rate',
-                    nbins=20,
-                    labels={'spread_rate': '스프레드율 (%)'},
-                    color_discrete_sequence=['#3b82f6']
-                )
-                fig.add_vline(x=0, line_dash="dash", line_color="red", annotation_text="최근가")
-                fig.update_layout(height=300, showlegend=False)
-                st.plotly_chart(fig, use_container_width=True, key='instant_match_hist')
+                st.plotly_chart(hist_fig, use_container_width=True, key='instant_match_hist')
 
             with col2:
                 st.markdown("### 🔄 주문 타입별 분포")
-                type_counts = instant_match['order_type'].value_counts()
-                fig = px.pie(
-                    values=type_counts.values,
-                    names=type_counts.index,
-                    color_discrete_map={'구매': '#10b981', '판매': '#ef4444'}
-                )
-                fig.update_layout(height=300)
-                st.plotly_chart(fig, use_container_width=True, key='instant_match_pie')
+                st.plotly_chart(pie_fig, use_container_width=True, key='instant_match_pie')
 
             # TOP 20 테이블
             st.markdown("### 🏆 TOP 20 즉시 체결 주문")
@@ -561,35 +1073,7 @@ def main():
 
         try:
             # 곡별 모멘텀 계산
-            from src.calculator.metrics_engine import MetricsEngine
-            engine = MetricsEngine()
-
-            # 대기 중인 주문만 사용
-            waiting_orders = filtered_df[filtered_df['order_status'] == '대기'].to_dict('records')
-
-            # 고유 곡 목록
-            unique_songs = filtered_df['song_name'].unique()
-
-            momentum_data = []
-            for song in unique_songs:
-                momentum = engine.calculate_price_momentum(waiting_orders, song)
-
-                # 해당 곡 정보 가져오기
-                song_info = filtered_df[filtered_df['song_name'] == song].iloc[0]
-
-                momentum_data.append({
-                    'song_name': song,
-                    'song_artist': song_info['song_artist'],
-                    'recent_price': song_info['recent_price'],
-                    'momentum_score': momentum['momentum_score'],
-                    'buy_pressure': momentum['buy_pressure'],
-                    'sell_pressure': momentum['sell_pressure'],
-                    'waiting_count': momentum['waiting_count'],
-                    'price_min': momentum['price_range'][0],
-                    'price_max': momentum['price_range'][1]
-                })
-
-            momentum_df = pd.DataFrame(momentum_data)
+            momentum_df = build_momentum_frame(filtered_df)
         except AttributeError as e:
             st.error(f"""
             ⚠️ **가격 모멘텀 기능 업데이트 중**
@@ -610,7 +1094,7 @@ def main():
 
         if len(momentum_df) > 0:
             # 모멘텀 점수 기준 상위 20개 (상승 추세 가능성 높은 순)
-            top_momentum = momentum_df.nlargest(20, 'momentum_score')
+            top_momentum = top_n_rows(momentum_df, 'momentum_score', 20)
 
             # 요약 정보
             col1, col2, col3, col4 = st.columns(4)
@@ -630,38 +1114,15 @@ def main():
 
             # 차트 섹션
             col1, col2 = st.columns(2)
+            hist_fig, pie_fig = build_momentum_figs(momentum_df[['momentum_score']])
 
             with col1:
                 st.markdown("### 📊 모멘텀 점수 분포")
-                fig = px.histogram(
-                    momentum_df,
-                    x='momentum_score',
-                    nbins=30,
-                    labels={'momentum_score': '모멘텀 점수 (%)'},
-                    color_discrete_sequence=['#3b82f6']
-                )
-                fig.add_vline(x=0, line_dash="dash", line_color="red", annotation_text="중립")
-                fig.update_layout(height=300, showlegend=False)
-                st.plotly_chart(fig, use_container_width=True, key='momentum_hist')
+                st.plotly_chart(hist_fig, use_container_width=True, key='momentum_hist')
 
             with col2:
                 st.markdown("### 🔄 모멘텀 추세 분포")
-                momentum_df['trend'] = momentum_df['momentum_score'].apply(
-                    lambda x: '강한 상승' if x > 10 else ('상승' if x > 0 else ('하락' if x > -10 else '강한 하락'))
-                )
-                trend_counts = momentum_df['trend'].value_counts()
-                fig = px.pie(
-                    values=trend_counts.values,
-                    names=trend_counts.index,
-                    color_discrete_map={
-                        '강한 상승': '#10b981',
-                        '상승': '#84cc16',
-                        '하락': '#f59e0b',
-                        '강한 하락': '#ef4444'
-                    }
-                )
-                fig.update_layout(height=300)
-                st.plotly_chart(fig, use_container_width=True, key='momentum_pie')
+                st.plotly_chart(pie_fig, use_container_width=True, key='momentum_pie')
 
             # TOP 20 테이블
             st.markdown("### 🏆 TOP 20 상승 모멘텀 주문")
@@ -702,9 +1163,7 @@ def main():
         st.subheader("🔥 고수익률 주문 (구매)")
         st.markdown("**투자금 대비 높은 예상 수익률을 제공하는 구매 주문**")
 
-        # 구매 주문만 필터링
-        buy_df = filtered_df[filtered_df['order_type'] == '구매']
-        top_yield = buy_df.nlargest(10, 'expected_yield')[
+        top_yield = top_n_rows(buy_df, 'expected_yield', 10)[
             ['song_name', 'song_artist', 'order_price', 'recent_price',
              'expected_yield', 'spread_rate', 'liquidity_score', 'signal']
         ]
@@ -730,9 +1189,7 @@ def main():
         st.subheader("📉 저평가 주문 (구매)")
         st.markdown("**시장가보다 낮은 가격에 매수할 수 있는 기회**")
 
-        # 구매 주문만 필터링
-        buy_df = filtered_df[filtered_df['order_type'] == '구매']
-        undervalued = buy_df.nsmallest(10, 'spread_rate')[
+        undervalued = top_n_rows(buy_df, 'spread_rate', 10, largest=False)[
             ['song_name', 'song_artist', 'order_price', 'recent_price',
              'spread_rate', 'expected_yield', 'liquidity_score', 'signal']
         ]
@@ -758,7 +1215,7 @@ def main():
         st.subheader("💧 고유동성 주문")
         st.markdown("**거래가 활발하여 쉽게 사고팔 수 있는 주문**")
 
-        high_liquidity = filtered_df.nlargest(10, 'liquidity_score')[
+        high_liquidity = top_n_rows(filtered_df, 'liquidity_score', 10)[
             ['song_name', 'song_artist', 'order_price', 'recent_price',
              'liquidity_score', 'spread_rate', 'expected_yield', 'signal']
         ]
@@ -789,42 +1246,28 @@ def main():
             (filtered_df['spread_rate'] < -10) &
             (filtered_df['expected_yield'] > 7) &
             (filtered_df['liquidity_score'] > 30) &
-            (filtered_df['order_type'] == '구매')
-        ].copy()
+            is_buy
+        ]
 
         if len(value_opportunities) > 0:
             # 3D 스캐터 플롯
-            fig = px.scatter(
-                value_opportunities,
-                x='spread_rate',
-                y='expected_yield',
-                size='liquidity_score',
-                color='signal',
-                hover_data=['song_name', 'song_artist', 'order_price'],
-                labels={
-                    'spread_rate': '스프레드율 (%)',
-                    'expected_yield': '예상 수익률 (%)',
-                    'liquidity_score': '유동성 점수'
-                },
-                title=f'가치 투자 기회 ({len(value_opportunities)}개 발견)',
-                color_discrete_map={
-                    '저평가': '#10b981',
-                    '저평가, 유동성↓': '#059669'
-                }
-            )
-            fig.update_layout(height=400)
+            fig = build_value_scatter(value_opportunities[
+                ['spread_rate', 'expected_yield', 'liquidity_score', 'signal',
+                 'song_name', 'song_artist', 'order_price']
+            ])
             st.plotly_chart(fig, use_container_width=True, key='value_scatter')
 
             # 종합 점수 계산 (스프레드율 절대값 + 수익률 + 유동성/10)
-            value_opportunities['투자점수'] = (
-                abs(value_opportunities['spread_rate']) * 0.3 +
-                value_opportunities['expected_yield'] * 0.5 +
-                value_opportunities['liquidity_score'] * 0.2
+            score = (
+                np.abs(value_opportunities['spread_rate'].to_numpy()) * 0.3 +
+                value_opportunities['expected_yield'].to_numpy() * 0.5 +
+                value_opportunities['liquidity_score'].to_numpy() * 0.2
             )
 
             # TOP 20 테이블
             st.markdown("### 🏆 TOP 20 투자 기회")
-            top20 = value_opportunities.nlargest(20, '투자점수')[
+            top_idx = largest_n_positions(score, 20)
+            top20 = value_opportunities.iloc[top_idx].assign(투자점수=score[top_idx])[
                 ['song_name', 'song_artist', 'order_price', 'spread_rate',
                  'expected_yield', 'liquidity_score', '투자점수', 'signal']
             ]
@@ -856,71 +1299,43 @@ def main():
             # 카테고리별 요약 통계
             col1, col2 = st.columns(2)
 
-            categories = filtered_df['song_category'].unique()
-
-            for idx, category in enumerate(categories):
-                cat_df = filtered_df[filtered_df['song_category'] == category]
+            # 카테고리별 주문 수 / 평균 지표 (한 번의 groupby, 등장 순서 유지)
+            category_stats = filtered_df.groupby('song_category', observed=True, sort=False).agg(
+                order_count=('order_price', 'size'),
+                avg_price=('order_price', 'mean'),
+                avg_yield=('expected_yield', 'mean'),
+                avg_liquidity=('liquidity_score', 'mean'),
+                avg_royalty=('order_royalty_rate', 'mean')
+            )
 
+            for idx, (category, row) in enumerate(category_stats.iterrows()):
                 with col1 if idx == 0 else col2:
                     st.markdown(f"### {category}")
-                    st.metric("총 주문 수", f"{len(cat_df):,}개")
-                    st.metric("평균 주문가", f"{cat_df['order_price'].mean():,.0f}원")
-                    st.metric("평균 수익률", f"{cat_df['expected_yield'].mean():.2f}%")
-                    st.metric("평균 유동성", f"{cat_df['liquidity_score'].mean():.1f}점")
-                    st.metric("평균 로열티율", f"{cat_df['order_royalty_rate'].mean()*100:.2f}%")
+                    st.metric("총 주문 수", f"{int(row['order_count']):,}개")
+                    st.metric("평균 주문가", f"{row['avg_price']:,.0f}원")
+                    st.metric("평균 수익률", f"{row['avg_yield']:.2f}%")
+                    st.metric("평균 유동성", f"{row['avg_liquidity']:.1f}점")
+                    st.metric("평균 로열티율", f"{row['avg_royalty']*100:.2f}%")
+
+            price_fig, yield_fig, liquidity_fig = build_category_boxes(filtered_df[
+                ['song_category', 'order_price', 'expected_yield', 'liquidity_score']
+            ])
 
             # 박스 플롯 - 가격 분포
             st.markdown("---")
             st.markdown("### 📊 카테고리별 가격 분포")
-
-            fig = px.box(
-                filtered_df,
-                x='song_category',
-                y='order_price',
-                color='song_category',
-                labels={'order_price': '주문가 (원)', 'song_category': '카테고리'},
-                color_discrete_map={
-                    '저작재산권': '#3b82f6',
-                    '저작인접권': '#f59e0b'
-                }
-            )
-            fig.update_layout(height=350, showlegend=False)
-            st.plotly_chart(fig, use_container_width=True, key='category_price_box')
+            st.plotly_chart(price_fig, use_container_width=True, key='category_price_box')
 
             # 박스 플롯 - 수익률 분포
             col1, col2 = st.columns(2)
 
             with col1:
                 st.markdown("### 💰 수익률 분포")
-                fig = px.box(
-                    filtered_df,
-                    x='song_category',
-                    y='expected_yield',
-                    color='song_category',
-                    labels={'expected_yield': '수익률 (%)', 'song_category': '카테고리'},
-                    color_discrete_map={
-                        '저작재산권': '#3b82f6',
-                        '저작인접권': '#f59e0b'
-                    }
-                )
-                fig.update_layout(height=300, showlegend=False)
-                st.plotly_chart(fig, use_container_width=True, key='category_yield_box')
+                st.plotly_chart(yield_fig, use_container_width=True, key='category_yield_box')
 
             with col2:
                 st.markdown("### 💧 유동성 분포")
-                fig = px.box(
-                    filtered_df,
-                    x='song_category',
-                    y='liquidity_score',
-                    color='song_category',
-                    labels={'liquidity_score': '유동성 점수', 'song_category': '카테고리'},
-                    color_discrete_map={
-                        '저작재산권': '#3b82f6',
-                        '저작인접권': '#f59e0b'
-                    }
-                )
-                fig.update_layout(height=300, showlegend=False)
-                st.plotly_chart(fig, use_container_width=True, key='category_liquidity_box')
+                st.plotly_chart(liquidity_fig, use_container_width=True, key='category_liquidity_box')
 
         else:
             st.warning("카테고리 데이터가 없습니다.")
@@ -929,76 +1344,36 @@ def main():
         st.subheader("⏰ 시간대별 주문 패턴 분석")
         st.markdown("**시간대별 주문량, 스프레드율, 수익률 패턴으로 최적 거래시간 파악**")
 
-        # 시간대 데이터 추출 (복사본 생성으로 SettingWithCopyWarning 방지)
-        time_df = filtered_df.copy()
-        time_df['시간대'] = pd.to_datetime(time_df['order_date']).dt.hour
+        # 시간대 데이터 추출 (필요한 컬럼만, assign 으로 새 프레임 생성)
+        # 주문 일시가 비었거나 해석할 수 없는 주문(NaT)은 시간대 집계에서 제외
+        order_hour = pd.to_datetime(filtered_df['order_date'], errors='coerce').dt.hour
+        has_hour = order_hour.notna()
+        time_df = filtered_df.loc[has_hour, ['order_type', 'spread_rate', 'expected_yield']].assign(
+            시간대=order_hour[has_hour].astype('int8')
+        )
 
-        # 시간대별 주문 수
-        hourly_counts = time_df.groupby('시간대').size().reset_index(name='주문수')
+        hourly_figs, hourly_counts, hourly_spread, hourly_yield = build_hourly_figs(
+            time_df[['시간대', 'order_type', 'spread_rate', 'expected_yield']]
+        )
 
         col1, col2 = st.columns(2)
 
         with col1:
             st.markdown("### 📊 시간대별 주문 수")
-            fig = px.line(
-                hourly_counts,
-                x='시간대',
-                y='주문수',
-                markers=True,
-                labels={'시간대': '시간 (0-23시)', '주문수': '주문 개수'}
-            )
-            fig.update_layout(height=300)
-            st.plotly_chart(fig, use_container_width=True, key='hourly_orders')
+            st.plotly_chart(hourly_figs['orders'], use_container_width=True, key='hourly_orders')
 
         with col2:
             st.markdown("### 📈 시간대별 평균 스프레드율")
-            hourly_spread = time_df.groupby('시간대')['spread_rate'].mean().reset_index()
-            fig = px.line(
-                hourly_spread,
-                x='시간대',
-                y='spread_rate',
-                markers=True,
-                labels={'시간대': '시간 (0-23시)', 'spread_rate': '평균 스프레드율 (%)'}
-            )
-            fig.add_hline(y=0, line_dash="dash", line_color="red", annotation_text="적정가")
-            fig.update_layout(height=300)
-            st.plotly_chart(fig, use_container_width=True, key='hourly_spread')
+            st.plotly_chart(hourly_figs['spread'], use_container_width=True, key='hourly_spread')
 
         # 시간대별 구매/판매 비율
         st.markdown("---")
         st.markdown("### 🔄 시간대별 구매/판매 비율")
-
-        hourly_type = time_df.groupby(['시간대', 'order_type']).size().reset_index(name='개수')
-        hourly_type_pivot = hourly_type.pivot(index='시간대', columns='order_type', values='개수').fillna(0)
-
-        fig = go.Figure()
-        fig.add_trace(go.Bar(x=hourly_type_pivot.index, y=hourly_type_pivot.get('구매', []),
-                             name='구매', marker_color='#10b981'))
-        fig.add_trace(go.Bar(x=hourly_type_pivot.index, y=hourly_type_pivot.get('판매', []),
-                             name='판매', marker_color='#ef4444'))
-
-        fig.update_layout(
-            barmode='group',
-            xaxis_title='시간대 (0-23시)',
-            yaxis_title='주문 수',
-            height=350
-        )
-        st.plotly_chart(fig, use_container_width=True, key='hourly_type')
+        st.plotly_chart(hourly_figs['type'], use_container_width=True, key='hourly_type')
 
         # 시간대별 평균 수익률
         st.markdown("### 💰 시간대별 평균 수익률")
-        hourly_yield = time_df.groupby('시간대')['expected_yield'].mean().reset_index()
-
-        fig = px.bar(
-            hourly_yield,
-            x='시간대',
-            y='expected_yield',
-            labels={'시간대': '시간 (0-23시)', 'expected_yield': '평균 수익률 (%)'},
-            color='expected_yield',
-            color_continuous_scale='Viridis'
-        )
-        fig.update_layout(height=350)
-        st.plotly_chart(fig, use_container_width=True, key='hourly_yield')
+        st.plotly_chart(hourly_figs['yield'], use_container_width=True, key='hourly_yield')
 
         # 인사이트
         peak_hour = hourly_counts.loc[hourly_counts['주문수'].idxmax(), '시간대']
@@ -1020,7 +1395,7 @@ def main():
         display_df = filtered_df[
             ['order_date', 'song_name', 'song_artist', 'order_type', 'order_price',
              'recent_price', 'expected_yield', 'spread_rate', 'liquidity_score', 'signal']
-        ].copy()
+        ]
 
         # 컬럼명 변경
         display_df.columns = ['주문시간', '곡명', '아티스트', '타입', '주문가',
@@ -1029,30 +1404,32 @@ def main():
         # 검색 기능
         search = st.text_input("🔍 곡명/아티스트 검색", "")
         if search:
-            display_df = display_df[
-                display_df['곡명'].str.contains(search, na=False) |
-                display_df['아티스트'].str.contains(search, na=False)
-            ]
+            # 대소문자 구분 없는 부분 문자열 검색 (정규식 미사용)
+            query = search.lower()
+            lower_names, lower_artists = build_search_index(display_df['곡명'], display_df['아티스트'])
+            matched = (np.char.find(lower_names, query) >= 0) | (np.char.find(lower_artists, query) >= 0)
+            display_df = display_df[matched]
 
+        # 전체 테이블은 Styler 대신 column_config 로 브라우저에서 포맷 (셀별 HTML 생성 없음)
         st.dataframe(
-            display_df.style.format({
-                '주문가': '{:,.0f}원',
-                '최근가': '{:,.0f}원',
-                '수익률(%)': '{:.2f}%',
-                '스프레드율(%)': '{:.2f}%',
-                '유동성': '{:.1f}'
-            }),
+            display_df,
+            column_config={
+                '주문가': st.column_config.NumberColumn(format='%,.0f원'),
+                '최근가': st.column_config.NumberColumn(format='%,.0f원'),
+                '수익률(%)': st.column_config.NumberColumn(format='%.2f%%'),
+                '스프레드율(%)': st.column_config.NumberColumn(format='%.2f%%'),
+                '유동성': st.column_config.NumberColumn(format='%.1f')
+            },
             hide_index=True,
             use_container_width=True,
             height=400
         )
 
         # CSV 다운로드
-        csv = display_df.to_csv(index=False, encoding='utf-8-sig')
         st.download_button(
             label="📥 CSV 다운로드",
-            data=csv,
-            file_name=f"musicow_data_{get_kst_now().strftime('%Y%m%d_%H%M%S')}.csv",
+            data=to_csv_bytes(display_df),
+            file_name=f"musicow_data_{now:%Y%m%d_%H%M%S}.csv",
             mime="text/csv"
         )
 
@@ -1064,21 +1441,22 @@ def main():
 
     with col1:
         st.markdown("**곡별 주문 수 Top 5**")
-        song_counts = filtered_df['song_name'].value_counts().head(5)
+        song_counts = filtered_views['song_top5']
         for song, count in song_counts.items():
             st.markdown(f"- {song[:30]}... : {count}건")
 
     with col2:
         st.markdown("**아티스트별 주문 수 Top 5**")
-        artist_counts = filtered_df['song_artist'].value_counts().head(5)
+        artist_counts = filtered_views['artist_top5']
         for artist, count in artist_counts.items():
             st.markdown(f"- {artist} : {count}건")
 
     with col3:
         st.markdown("**주문 상태 분포**")
-        status_counts = filtered_df['order_status'].value_counts()
+        status_counts = filtered_views['status_counts']
+        total_count = len(filtered_df)
         for status, count in status_counts.items():
-            percentage = count / len(filtered_df) * 100
+            percentage = count / total_count * 100
             st.markdown(f"- {status} : {count}건 ({percentage:.1f}%)")
 
 
@@ -1,7 +1,9 @@
 """
 API 클라이언트 테스트
 """
-from src.collector.api_client import MusicowAPIClient
+from collections import Counter
+
+from tests._fixtures import get_api_client
 import json
 
 
@@ -12,8 +14,8 @@ def test_api_client():
     print("🎵 뮤직카우 API 클라이언트 테스트")
     print("=" * 60)
 
-    # 클라이언트 생성
-    client = MusicowAPIClient()
+    # 공용 클라이언트 (세션은 프로세스 종료 시 닫힘)
+    client = get_api_client()
 
     # 1. 연결 테스트
     print("\n1. API 연결 테스트...")
@@ -22,7 +24,6 @@ def test_api_client():
         print("✅ API 연결 성공")
     else:
         print("❌ API 연결 실패")
-        client.close()
         return False
 
     # 2. 데이터 가져오기 테스트
@@ -45,30 +46,23 @@ def test_api_client():
         print("\n4. 데이터 통계:")
         print("-" * 40)
 
-        # 주문 타입별 카운트
-        buy_count = sum(1 for o in orders if o.get("order_type") == "구매")
-        sell_count = sum(1 for o in orders if o.get("order_type") == "판매")
+        # 주문 타입 / 상태 / 곡별 카운트 (Counter 로 집계)
+        type_counts = Counter(o.get("order_type") for o in orders)
+        status_counts = Counter(o.get("order_status", "Unknown") for o in orders)
+        song_counts = Counter(o.get("song_name", "Unknown") for o in orders)
+
+        buy_count = type_counts["구매"]
+        sell_count = type_counts["판매"]
         print(f"  구매 주문: {buy_count}개")
         print(f"  판매 주문: {sell_count}개")
 
-        # 주문 상태별 카운트
-        status_counts = {}
-        for order in orders:
-            status = order.get("order_status", "Unknown")
-            status_counts[status] = status_counts.get(status, 0) + 1
-
         print(f"\n  주문 상태:")
         for status, count in status_counts.items():
             print(f"    - {status}: {count}개")
 
-        # 상위 5개 곡
-        song_counts = {}
-        for order in orders:
-            song = order.get("song_name", "Unknown")
-            song_counts[song] = song_counts.get(song, 0) + 1
-
+        # 상위 5개 곡 (동률은 먼저 등장한 곡 우선)
         print(f"\n  상위 거래 곡 (Top 5):")
-        top_songs = sorted(song_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+        top_songs = song_counts.most_common(5)
         for i, (song, count) in enumerate(top_songs, 1):
             print(f"    {i}. {song}: {count}개 주문")
 
@@ -85,12 +79,8 @@ def test_api_client():
 
     else:
         print("❌ 데이터 가져오기 실패")
-        client.close()
         return False
 
-    # 클라이언트 종료
-    client.close()
-
     print("\n" + "=" * 60)
     print("✨ API 클라이언트 테스트 완료")
     print("=" * 60)
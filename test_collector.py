@@ -2,10 +2,11 @@
 데이터 수집기 테스트
 """
 import os
-import json
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
 from src.collector.data_collector import DataCollector
+from src.utils.serialization import loads
 
 
 def test_collector():
@@ -30,7 +31,9 @@ def test_collector():
         today_dir = Path("data/raw") / today
 
         if today_dir.exists():
-            files = list(today_dir.glob("*_orders.json"))
+            # 디렉토리 한 번 순회 (DirEntry 는 stat 결과를 캐시하므로 파일별 stat 은 한 번만)
+            with os.scandir(today_dir) as it:
+                files = [e for e in it if e.name.endswith("_orders.json") and e.is_file()]
             print(f"\n2. 저장된 파일 확인:")
             print("-" * 40)
             print(f"  디렉토리: {today_dir}")
@@ -38,12 +41,13 @@ def test_collector():
 
             if files:
                 # 최신 파일 확인
-                latest_file = max(files, key=lambda f: f.stat().st_mtime)
+                latest_entry = max(files, key=lambda e: e.stat().st_mtime)
+                latest_file = Path(latest_entry.path)
                 print(f"  최신 파일: {latest_file.name}")
 
                 # 파일 내용 확인
-                with open(latest_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                with open(latest_file, 'rb') as f:
+                    data = loads(f.read())
                     print(f"  데이터 개수: {len(data)}개")
 
                     # 간단한 통계
@@ -51,23 +55,19 @@ def test_collector():
                         print("\n3. 데이터 통계:")
                         print("-" * 40)
 
-                        buy_count = sum(1 for o in data if o.get("order_type") == "구매")
-                        sell_count = sum(1 for o in data if o.get("order_type") == "판매")
-                        print(f"  구매 주문: {buy_count}개")
-                        print(f"  판매 주문: {sell_count}개")
+                        type_counts = Counter(o.get("order_type") for o in data)
+                        print(f"  구매 주문: {type_counts['구매']}개")
+                        print(f"  판매 주문: {type_counts['판매']}개")
 
                         # 주문 상태
-                        status_counts = {}
-                        for order in data:
-                            status = order.get("order_status", "Unknown")
-                            status_counts[status] = status_counts.get(status, 0) + 1
+                        status_counts = Counter(o.get("order_status", "Unknown") for o in data)
 
                         print(f"\n  주문 상태:")
                         for status, count in status_counts.items():
                             print(f"    - {status}: {count}개")
 
                         # 파일 크기
-                        file_size = latest_file.stat().st_size
+                        file_size = latest_entry.stat().st_size
                         print(f"\n  파일 크기: {file_size:,} bytes ({file_size/1024:.1f} KB)")
         else:
             print(f"❌ 디렉토리 없음: {today_dir}")
@@ -1,6 +1,8 @@
 """
 패키지 import 테스트
 """
+import importlib
+
 
 def test_imports():
     """필수 패키지 import 테스트"""
@@ -23,11 +25,10 @@ def test_imports():
 
     for package, alias in packages:
         try:
+            importlib.import_module(package)
             if alias:
-                exec(f"import {package} as {alias}")
                 print(f"✅ {package} (as {alias}) - Success")
             else:
-                exec(f"import {package}")
                 print(f"✅ {package} - Success")
             success_count += 1
         except ImportError as e:
@@ -2,9 +2,13 @@
 지표 계산 엔진 테스트
 """
 import json
+from collections import Counter
 from pathlib import Path
-from src.calculator.metrics_engine import MetricsEngine
+
+import pandas as pd
+
 from src.utils.helpers import save_json
+from tests._fixtures import get_metrics_engine
 
 
 def test_metrics_engine():
@@ -17,7 +21,7 @@ def test_metrics_engine():
     # 1. 지표 계산기 생성
     print("\n1. 지표 계산기 생성...")
     print("-" * 40)
-    engine = MetricsEngine()
+    engine = get_metrics_engine()
     print("✅ MetricsEngine 생성 성공")
 
     # 2. 샘플 데이터 로드
@@ -82,29 +86,29 @@ def test_metrics_engine():
     print("-" * 40)
 
     # 시그널별 카운트
-    signal_counts = {}
-    for r in results:
-        signal = r.get("signal", "Unknown")
-        signal_counts[signal] = signal_counts.get(signal, 0) + 1
+    signal_counts = Counter(r.get("signal", "Unknown") for r in results)
 
+    total_count = len(results)
     print("시그널 분포:")
-    for signal, count in sorted(signal_counts.items(), key=lambda x: x[1], reverse=True):
-        print(f"  - {signal}: {count}개 ({count/len(results)*100:.1f}%)")
+    for signal, count in signal_counts.most_common():
+        print(f"  - {signal}: {count}개 ({count/total_count*100:.1f}%)")
+
+    # 수치 지표는 DataFrame 으로 한 번에 변환해 집계 (없는 값은 NaN)
+    metrics = pd.DataFrame(results, columns=["premium", "liquidity_score"])
 
     # 프리미엄율 통계
-    premiums = [r.get("premium") for r in results if r.get("premium") is not None]
-    if premiums:
-        avg_premium = sum(premiums) / len(premiums)
-        max_premium = max(premiums)
-        min_premium = min(premiums)
+    premiums = metrics["premium"].dropna().astype(float)
+    if len(premiums):
+        avg_premium = premiums.mean()
+        max_premium = premiums.max()
+        min_premium = premiums.min()
         print(f"\n프리미엄율 통계:")
         print(f"  - 평균: {avg_premium:.2f}%")
         print(f"  - 최대: {max_premium:.2f}%")
         print(f"  - 최소: {min_premium:.2f}%")
 
     # 유동성 점수 통계
-    liquidity_scores = [r.get("liquidity_score", 0) for r in results]
-    avg_liquidity = sum(liquidity_scores) / len(liquidity_scores)
+    avg_liquidity = metrics["liquidity_score"].fillna(0).mean()
     print(f"\n유동성 점수:")
     print(f"  - 평균: {avg_liquidity:.1f}/100")
 
@@ -126,22 +130,19 @@ def test_metrics_engine():
     print("\n7. 주요 주문 (상위 5개):")
     print("-" * 40)
 
-    # 프리미엄율 기준 정렬
-    sorted_by_premium = sorted(
-        [r for r in results if r.get("premium") is not None],
-        key=lambda x: x.get("premium", 0),
-        reverse=True
-    )
+    # 프리미엄율 기준 상위/하위 5개만 부분 선택 (내림차순 정렬의 앞/뒤 5개와 같은 순서)
+    top_by_premium = [results[i] for i in premiums.nlargest(5).index]
+    bottom_by_premium = [results[i] for i in premiums.iloc[::-1].nsmallest(5).index[::-1]]
 
     print("\n[프리미엄율 상위 5개 - 고평가]")
-    for i, order in enumerate(sorted_by_premium[:5], 1):
+    for i, order in enumerate(top_by_premium, 1):
         print(f"{i}. {order['song_name'][:20]:20} | "
               f"프리미엄율: {order['premium']:>6.2f}% | "
               f"유동성: {order['liquidity_score']:>4.1f} | "
               f"시그널: {order['signal']}")
 
     print("\n[프리미엄율 하위 5개 - 저평가]")
-    for i, order in enumerate(sorted_by_premium[-5:], 1):
+    for i, order in enumerate(bottom_by_premium, 1):
         print(f"{i}. {order['song_name'][:20]:20} | "
               f"프리미엄율: {order['premium']:>6.2f}% | "
               f"유동성: {order['liquidity_score']:>4.1f} | "
@@ -161,7 +162,7 @@ def test_individual_metrics():
     print("🧪 개별 지표 계산 테스트")
     print("=" * 60)
 
-    engine = MetricsEngine()
+    engine = get_metrics_engine()
 
     # 테스트 케이스들
     test_cases = [
@@ -242,10 +243,63 @@ def test_individual_metrics():
     print("=" * 60)
 
 
+def test_batch_matches_single_order():
+    """배치 계산과 단일 주문 계산 결과 비교"""
+
+    print("\n" + "=" * 60)
+    print("🔁 배치/단일 주문 지표 비교 테스트")
+    print("=" * 60)
+
+    engine = get_metrics_engine()
+
+    # 호가가 있는 곡 + 가격/수익률 키가 없는 주문 + 곡명이 없는 주문 (유동성 0점이어야 함)
+    orders = [
+        {"song_name": "곡A", "order_type": "구매", "order_status": "대기",
+         "order_date": "2025-10-06 10:00:00", "order_price": 10000,
+         "recent_price": 12000, "order_royalty_rate": 0.08},
+        {"song_name": "곡A", "order_type": "판매", "order_status": "대기",
+         "order_date": "2025-10-06 10:05:00", "order_price": 12500,
+         "recent_price": 12000, "order_royalty_rate": 0.08},
+        {"song_name": "곡A", "order_type": "판매", "order_status": "대기",
+         "order_date": "2025-10-06 10:10:00", "recent_price": 12000,
+         "order_royalty_rate": 0.08},
+        {"song_name": "곡B", "order_type": "구매", "order_status": "대기",
+         "order_date": "2025-10-06 10:15:00", "order_price": 8000},
+        {"song_name": "곡B", "order_type": "판매", "order_status": "대기",
+         "order_date": "2025-10-06 10:20:00", "recent_price": 9000,
+         "order_royalty_rate": 0.06},
+    ]
+    orders += [
+        {"order_type": "구매" if i % 2 else "판매", "order_status": "대기",
+         "order_date": "2025-10-06 11:00:00", "order_price": 9000 + i * 100,
+         "recent_price": 10000, "order_royalty_rate": 0.05}
+        for i in range(12)
+    ]
+
+    fields = ("spread_rate", "expected_yield", "liquidity_score", "fair_value", "signal")
+    batch_results = engine.calculate_batch_metrics(orders)
+
+    mismatches = 0
+    for i, (order, batch) in enumerate(zip(orders, batch_results)):
+        single = engine.calculate_order_metrics(order, orders)
+        for field in fields:
+            if batch.get(field) != single.get(field):
+                mismatches += 1
+                print(f"  ❌ 주문 {i} {field}: 배치 {batch.get(field)} / 단일 {single.get(field)}")
+
+    if mismatches == 0:
+        print(f"✅ {len(orders)}개 주문 배치/단일 결과 일치")
+
+    assert mismatches == 0
+
+
 if __name__ == "__main__":
     # 개별 지표 테스트
     test_individual_metrics()
 
+    # 배치/단일 계산 비교
+    test_batch_matches_single_order()
+
     # 전체 엔진 테스트
     success = test_metrics_engine()
 
@@ -1,11 +1,22 @@
 """
 전체 데이터로 지표 계산 엔진 테스트
 """
-import json
+import time
+from collections import Counter
 from pathlib import Path
 from datetime import datetime
-from src.calculator.metrics_engine import MetricsEngine
-from src.utils.helpers import save_json
+
+import numpy as np
+
+from src.utils.helpers import largest_n_positions, save_json
+from src.utils.serialization import load_file
+from tests._fixtures import get_metrics_engine
+
+
+# 주요 주문 출력 형식 (곡명 25자 / 아티스트 15자로 자르고 맞춤)
+PREMIUM_ROW_FORMAT = "{:2}. {:25.25} | {:15.15} | 괴리: {:>6.2f}% | 수익률: {:>5.2f}% | 유동성: {:>4.1f}".format
+YIELD_ROW_FORMAT = "{:2}. {:25.25} | {:15.15} | 수익률: {:>5.2f}% | 괴리: {:>6.2f}% | 유동성: {:>4.1f}".format
+LIQUIDITY_ROW_FORMAT = "{:2}. {:25.25} | {:15.15} | 유동성: {:>4.1f} | 괴리: {:>6.2f}% | 시그널: {}".format
 
 
 def test_full_dataset():
@@ -39,8 +50,7 @@ def test_full_dataset():
     print("\n2. 데이터 로드...")
     print("-" * 40)
 
-    with open(latest_file, 'r', encoding='utf-8') as f:
-        orders = json.load(f)
+    orders = load_file(latest_file)
 
     print(f"✅ {len(orders):,}개 주문 데이터 로드")
 
@@ -48,13 +58,12 @@ def test_full_dataset():
     print("\n3. 지표 계산 시작...")
     print("-" * 40)
 
-    engine = MetricsEngine()
-    start_time = datetime.now()
+    engine = get_metrics_engine()
+    start_time = time.perf_counter()
 
     results = engine.calculate_batch_metrics(orders)
 
-    end_time = datetime.now()
-    duration = (end_time - start_time).total_seconds()
+    duration = time.perf_counter() - start_time
 
     print(f"✅ 계산 완료: {len(results):,}개")
     print(f"  소요 시간: {duration:.2f}초")
@@ -65,51 +74,67 @@ def test_full_dataset():
     print("-" * 40)
 
     # 시그널 분포
-    signal_counts = {}
-    for r in results:
-        signal = r.get("signal", "Unknown")
-        signal_counts[signal] = signal_counts.get(signal, 0) + 1
+    signal_counts = Counter(r.get("signal", "Unknown") for r in results)
 
+    total_count = len(results)
     print("\n[시그널 분포]")
-    for signal, count in sorted(signal_counts.items(), key=lambda x: x[1], reverse=True):
-        percentage = count / len(results) * 100
+    for signal, count in signal_counts.most_common():
+        percentage = count / total_count * 100
         print(f"  {signal:20} : {count:4}개 ({percentage:5.1f}%)")
 
+    # 지표를 컬럼 배열로 한 번만 추출 (없는 값은 NaN, 유동성 점수 통계는 기본값 0)
+    count = len(results)
+    premium_col = np.fromiter(
+        (np.nan if (v := r.get("premium")) is None else v for r in results),
+        dtype=np.float64, count=count
+    )
+    yield_col = np.fromiter(
+        (np.nan if (v := r.get("normalized_yield")) is None else v for r in results),
+        dtype=np.float64, count=count
+    )
+    liquidity_col = np.fromiter(
+        (np.nan if (v := r.get("liquidity_score")) is None else v for r in results),
+        dtype=np.float64, count=count
+    )
+    liquidity_scores = np.nan_to_num(liquidity_col, nan=0.0)
+    waiting = np.fromiter(
+        (r.get("order_status") == "대기" for r in results), dtype=bool, count=count
+    )
+    premiums = premium_col[~np.isnan(premium_col)]
+    yields = yield_col[~np.isnan(yield_col)]
+
     # 프리미엄율 분석
-    premiums = [r.get("premium") for r in results if r.get("premium") is not None]
-    if premiums:
+    if premiums.size:
         print("\n[프리미엄율 통계]")
-        print(f"  평균: {sum(premiums)/len(premiums):>7.2f}%")
-        print(f"  최대: {max(premiums):>7.2f}%")
-        print(f"  최소: {min(premiums):>7.2f}%")
+        print(f"  평균: {premiums.mean():>7.2f}%")
+        print(f"  최대: {premiums.max():>7.2f}%")
+        print(f"  최소: {premiums.min():>7.2f}%")
 
         # 분포
-        high = len([p for p in premiums if p > 10])
-        low = len([p for p in premiums if p < -10])
-        normal = len(premiums) - high - low
-        print(f"  고평가 (>10%): {high}개 ({high/len(premiums)*100:.1f}%)")
-        print(f"  저평가 (<-10%): {low}개 ({low/len(premiums)*100:.1f}%)")
-        print(f"  정상 범위: {normal}개 ({normal/len(premiums)*100:.1f}%)")
+        high = int((premiums > 10).sum())
+        low = int((premiums < -10).sum())
+        normal = premiums.size - high - low
+        print(f"  고평가 (>10%): {high}개 ({high/premiums.size*100:.1f}%)")
+        print(f"  저평가 (<-10%): {low}개 ({low/premiums.size*100:.1f}%)")
+        print(f"  정상 범위: {normal}개 ({normal/premiums.size*100:.1f}%)")
 
     # 정규화 수익률 분석
-    yields = [r.get("normalized_yield") for r in results if r.get("normalized_yield") is not None]
-    if yields:
+    if yields.size:
         print("\n[정규화 수익률 통계]")
-        print(f"  평균: {sum(yields)/len(yields):>7.2f}%")
-        print(f"  최대: {max(yields):>7.2f}%")
-        print(f"  최소: {min(yields):>7.2f}%")
+        print(f"  평균: {yields.mean():>7.2f}%")
+        print(f"  최대: {yields.max():>7.2f}%")
+        print(f"  최소: {yields.min():>7.2f}%")
 
     # 유동성 분석
-    liquidity_scores = [r.get("liquidity_score", 0) for r in results]
     print("\n[유동성 점수 통계]")
-    print(f"  평균: {sum(liquidity_scores)/len(liquidity_scores):>7.1f}/100")
-    print(f"  최대: {max(liquidity_scores):>7.1f}/100")
-    print(f"  최소: {min(liquidity_scores):>7.1f}/100")
+    print(f"  평균: {liquidity_scores.mean():>7.1f}/100")
+    print(f"  최대: {liquidity_scores.max():>7.1f}/100")
+    print(f"  최소: {liquidity_scores.min():>7.1f}/100")
 
-    high_liq = len([s for s in liquidity_scores if s > 80])
-    low_liq = len([s for s in liquidity_scores if s < 30])
-    print(f"  높은 유동성 (>80): {high_liq}개 ({high_liq/len(liquidity_scores)*100:.1f}%)")
-    print(f"  낮은 유동성 (<30): {low_liq}개 ({low_liq/len(liquidity_scores)*100:.1f}%)")
+    high_liq = int((liquidity_scores > 80).sum())
+    low_liq = int((liquidity_scores < 30).sum())
+    print(f"  높은 유동성 (>80): {high_liq}개 ({high_liq/count*100:.1f}%)")
+    print(f"  낮은 유동성 (<30): {low_liq}개 ({low_liq/count*100:.1f}%)")
 
     # 5. 주요 주문 출력
     print("\n5. 주요 주문 분석...")
@@ -117,47 +142,34 @@ def test_full_dataset():
 
     # 저평가 주문 (프리미엄율 낮은 순)
     print("\n[저평가 주문 Top 10]")
-    low_premium = sorted(
-        [r for r in results if r.get("premium") is not None and r.get("order_status") == "대기"],
-        key=lambda x: x.get("premium", 0)
-    )[:10]
+    # 대기 마스크로 후보를 한 번에 거르고 부분 선택 (nsmallest 와 같은 순서)
+    candidates = np.flatnonzero(waiting & ~np.isnan(premium_col))
+    low_premium = [
+        results[i] for i in candidates[largest_n_positions(-premium_col[candidates], 10)]
+    ]
 
     for i, order in enumerate(low_premium, 1):
-        print(f"{i:2}. {order['song_name'][:25]:25} | "
-              f"{order['song_artist'][:15]:15} | "
-              f"괴리: {order['premium']:>6.2f}% | "
-              f"수익률: {order['normalized_yield']:>5.2f}% | "
-              f"유동성: {order['liquidity_score']:>4.1f}")
+        print(PREMIUM_ROW_FORMAT(i, order["song_name"], order["song_artist"], order["premium"],
+                                 order["normalized_yield"], order["liquidity_score"]))
 
     # 고수익률 주문
     print("\n[고수익률 주문 Top 10]")
-    high_yield = sorted(
-        [r for r in results if r.get("normalized_yield") is not None and r.get("order_status") == "대기"],
-        key=lambda x: x.get("normalized_yield", 0),
-        reverse=True
-    )[:10]
+    candidates = np.flatnonzero(waiting & ~np.isnan(yield_col))
+    high_yield = [
+        results[i] for i in candidates[largest_n_positions(yield_col[candidates], 10)]
+    ]
 
     for i, order in enumerate(high_yield, 1):
-        print(f"{i:2}. {order['song_name'][:25]:25} | "
-              f"{order['song_artist'][:15]:15} | "
-              f"수익률: {order['normalized_yield']:>5.2f}% | "
-              f"괴리: {order['premium']:>6.2f}% | "
-              f"유동성: {order['liquidity_score']:>4.1f}")
+        print(YIELD_ROW_FORMAT(i, order["song_name"], order["song_artist"], order["normalized_yield"],
+                               order["premium"], order["liquidity_score"]))
 
     # 고유동성 주문
     print("\n[고유동성 주문 Top 10]")
-    high_liquidity = sorted(
-        results,
-        key=lambda x: x.get("liquidity_score", 0),
-        reverse=True
-    )[:10]
+    high_liquidity = [results[i] for i in largest_n_positions(liquidity_scores, 10)]
 
     for i, order in enumerate(high_liquidity, 1):
-        print(f"{i:2}. {order['song_name'][:25]:25} | "
-              f"{order['song_artist'][:15]:15} | "
-              f"유동성: {order['liquidity_score']:>4.1f} | "
-              f"괴리: {order['premium']:>6.2f}% | "
-              f"시그널: {order['signal']}")
+        print(LIQUIDITY_ROW_FORMAT(i, order["song_name"], order["song_artist"],
+                                   order["liquidity_score"], order["premium"], order["signal"]))
 
     # 6. 결과 저장
     print("\n6. 결과 저장...")
@@ -170,6 +182,18 @@ def test_full_dataset():
         file_size = output_file.stat().st_size
         print(f"✅ 결과 저장: {output_file.name}")
         print(f"  파일 크기: {file_size:,} bytes ({file_size/1024/1024:.1f} MB)")
+
+        # 웹앱이 JSON 재파싱 없이 바로 읽을 수 있도록 컬럼 배열 사이드카 저장
+        sidecar_file = output_file.with_suffix(".npz")
+        np.savez_compressed(
+            sidecar_file,
+            premium=premium_col,
+            normalized_yield=yield_col,
+            liquidity_score=liquidity_col,
+            order_type=np.array([r.get("order_type") or "" for r in results], dtype=str),
+            order_status=np.array([r.get("order_status") or "" for r in results], dtype=str),
+        )
+        print(f"✅ 컬럼 사이드카 저장: {sidecar_file.name}")
     else:
         print("❌ 결과 저장 실패")
 
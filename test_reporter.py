@@ -2,6 +2,8 @@
 리포트 시스템 테스트
 """
 import json
+from collections import Counter
+from operator import itemgetter
 from pathlib import Path
 from datetime import datetime
 from src.reporter.tsv_exporter import TSVExporter
@@ -188,10 +190,7 @@ def test_alert_system():
     print(f"✅ {len(alerts)}개 알림 생성")
 
     # 알림 타입별 카운트
-    alert_types = {}
-    for alert in alerts:
-        alert_type = alert["type"]
-        alert_types[alert_type] = alert_types.get(alert_type, 0) + 1
+    alert_types = Counter(map(itemgetter("type"), alerts))
 
     print("\n  알림 타입별 분포:")
     for alert_type, count in alert_types.items():
@@ -0,0 +1,34 @@
+"""
+테스트 공용 객체
+
+API 클라이언트와 지표 계산 엔진을 프로세스 단위로 한 번만 생성해
+여러 테스트가 같은 HTTP 세션(연결 풀)과 엔진을 재사용하도록 한다.
+"""
+import atexit
+from functools import cache
+
+from src.collector.api_client import MusicowAPIClient
+from src.calculator.metrics_engine import MetricsEngine
+
+
+@cache
+def get_api_client() -> MusicowAPIClient:
+    """공용 API 클라이언트 (프로세스 종료 시 자동 종료)"""
+    return MusicowAPIClient()
+
+
+@cache
+def get_metrics_engine() -> MetricsEngine:
+    """공용 지표 계산 엔진"""
+    return MetricsEngine()
+
+
+@atexit.register
+def _close_api_client():
+    """생성된 API 클라이언트가 있으면 세션 종료
+
+    종료 시점에는 pytest 출력 캡처 등으로 로그 스트림이 이미 닫혀 있을 수 있으므로
+    로그를 남기는 close() 대신 세션만 직접 닫는다.
+    """
+    if get_api_client.cache_info().currsize:
+        get_api_client().session.close()
@@ -2,77 +2,296 @@
 Flask 웹 애플리케이션 - 뮤직카우 시장 분석 대시보드
 """
 import json
+import mmap
+import threading
+import time
+from collections import Counter
 from pathlib import Path
-from datetime import datetime
-from flask import Flask, render_template, jsonify
+from datetime import datetime, timezone
+
+import numpy as np
+from flask import Flask, g, render_template, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from werkzeug.http import is_resource_modified
+
+try:
+    import orjson
+except ImportError:  # orjson 은 선택 의존성
+    orjson = None
 
 # 프로젝트 루트 경로
 PROJECT_ROOT = Path(__file__).parent.parent
 
+# NumPy 배열로 추출하는 지표 필드
+METRIC_FIELDS = ("premium", "normalized_yield", "liquidity_score")
+
+# 프리미엄율 분포 구간 (하한 -20/-10 은 이상, 상한 10/20 은 이하로 포함)
+PREMIUM_RANGE_LABELS = (
+    "매우 저평가 (< -20%)",
+    "저평가 (-20% ~ -10%)",
+    "적정 (-10% ~ 10%)",
+    "고평가 (10% ~ 20%)",
+    "매우 고평가 (> 20%)",
+)
+PREMIUM_LOWER_EDGES = np.array([-20.0, -10.0])
+PREMIUM_UPPER_EDGES = np.array([10.0, 20.0])
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """orjson 기반 JSON 직렬화 (jsonify 응답용, 키 정렬은 Flask 기본과 동일)"""
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 CORS(app)
 
 
-def load_latest_data():
-    """최신 처리된 데이터 로드"""
+# 데이터 캐시 갱신 주기 (초)
+CACHE_REFRESH_SECONDS = 5
+
+# 최신 데이터 캐시 (파일 경로/수정 시각/크기가 같으면 다시 파싱하지 않음)
+# 갱신 시 dict 를 통째로 교체하므로 요청 처리 중에는 잠금 없이 참조만 읽는다
+_EMPTY_CACHE = {"key": None, "orders": None, "columns": None}
+_cache = _EMPTY_CACHE
+_cache_lock = threading.Lock()
+_refresher = None
+_refresher_lock = threading.Lock()
+
+
+def find_latest_file():
+    """최신 metrics 파일 경로와 stat 결과 (없으면 None)"""
     processed_dir = PROJECT_ROOT / "data" / "processed"
 
     if not processed_dir.exists():
         return None
 
-    # 최신 metrics 파일 찾기
-    json_files = list(processed_dir.glob("*_metrics.json"))
+    latest = None
+    for path in processed_dir.glob("*_metrics.json"):
+        stat = path.stat()
+        if latest is None or stat.st_mtime > latest[1].st_mtime:
+            latest = (path, stat)
+
+    return latest
+
+
+def read_json(path):
+    """JSON 파일을 메모리 맵으로 열어 파싱 (파일 내용을 bytes 로 복사하지 않음)"""
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            return orjson.loads(view) if orjson is not None else json.loads(view.tobytes())
+
+
+def refresh_cache():
+    """최신 metrics 파일이 바뀌었으면 다시 읽어 캐시 교체"""
+    global _cache
+
+    with _cache_lock:
+        latest = find_latest_file()
+
+        if latest is None:
+            _cache = _EMPTY_CACHE
+            return
+
+        path, stat = latest
+        key = (path, stat.st_mtime_ns, stat.st_size)
+
+        if _cache["key"] != key:
+            orders = read_json(path)
+            columns = load_sidecar_columns(path, stat, orders) or extract_columns(orders)
+            _cache = {"key": key, "orders": orders, "columns": columns}
+
+
+def _refresh_loop():
+    """백그라운드 캐시 갱신 루프 (실패 시 기존 캐시 유지)"""
+    while True:
+        time.sleep(CACHE_REFRESH_SECONDS)
+        try:
+            refresh_cache()
+        except Exception as e:
+            app.logger.warning(f"데이터 캐시 갱신 실패: {e}")
+
+
+def start_cache_refresher():
+    """캐시를 처음 채우고 백그라운드 갱신 스레드 시작 (프로세스당 한 번)"""
+    global _refresher
+
+    if _refresher is not None:
+        return
+
+    with _refresher_lock:
+        if _refresher is not None:
+            return
+        refresh_cache()
+        _refresher = threading.Thread(target=_refresh_loop, name="cache-refresher", daemon=True)
+        _refresher.start()
+
 
-    if not json_files:
+def load_latest_dataset():
+    """최신 처리된 데이터와 컬럼 배열 (없으면 (None, None))
+
+    첫 요청에서 캐시를 채운 뒤로는 백그라운드 스레드가 파일 변경을 반영한다.
+    """
+    start_cache_refresher()
+    cache = _cache
+    return cache["orders"], cache["columns"]
+
+
+def load_latest_data():
+    """최신 처리된 데이터 로드"""
+    return load_latest_dataset()[0]
+
+
+def float_column(orders, field):
+    """숫자 필드를 float64 배열로 추출 (값이 없으면 NaN)"""
+    return np.fromiter(
+        (np.nan if (value := o.get(field)) is None else value for o in orders),
+        dtype=np.float64,
+        count=len(orders)
+    )
+
+
+def add_derived_columns(columns, orders):
+    """시그널별 개수와 주문 타입/상태별 위치 배열 추가 (캐시 갱신 시 한 번만 계산)"""
+    columns["signal_counts"] = Counter(o.get("signal", "알 수 없음") for o in orders)
+    columns["buy_idx"] = np.flatnonzero(columns["order_type"] == "구매")
+    columns["sell_idx"] = np.flatnonzero(columns["order_type"] == "판매")
+    columns["wait_idx"] = np.flatnonzero(columns["order_status"] == "대기")
+    return columns
+
+
+def extract_columns(orders):
+    """주문 필드를 컬럼별 NumPy 배열로 추출 (지표 값이 없으면 NaN, 시그널 개수/위치 배열 포함)"""
+    columns = {field: float_column(orders, field) for field in METRIC_FIELDS}
+    columns["order_type"] = np.array([o.get("order_type") for o in orders], dtype=object)
+    columns["order_status"] = np.array([o.get("order_status") for o in orders], dtype=object)
+    return add_derived_columns(columns, orders)
+
+
+def load_sidecar_columns(path, stat, orders):
+    """metrics 파일과 함께 저장된 .npz 컬럼 배열 로드 (없거나 파일보다 오래됐으면 None)"""
+    sidecar = path.with_suffix(".npz")
+    try:
+        if sidecar.stat().st_mtime_ns < stat.st_mtime_ns:
+            return None
+        with np.load(sidecar) as data:
+            columns = {name: data[name] for name in (*METRIC_FIELDS, "order_type", "order_status")}
+    except (OSError, KeyError, ValueError):
+        return None
+
+    if any(len(values) != len(orders) for values in columns.values()):
         return None
 
-    latest_file = max(json_files, key=lambda f: f.stat().st_mtime)
+    return add_derived_columns(columns, orders)
+
 
-    with open(latest_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+def largest_n_positions(values, n):
+    """값이 큰 순으로 상위 n개 위치 (heapq.nlargest 와 같은 순서, 동률은 앞쪽 우선)"""
+    if n <= 0 or values.size == 0:
+        return np.empty(0, dtype=np.intp)
+    if values.size > n:
+        # argpartition 으로 경계값만 찾고, 경계값 이상 후보만 안정 정렬
+        kth = values[np.argpartition(-values, n - 1)[n - 1]]
+        candidates = np.flatnonzero(values >= kth)
+    else:
+        candidates = np.arange(values.size)
+    return candidates[np.argsort(-values[candidates], kind="stable")[:n]]
 
-    return data
 
+def select_top_orders(orders, values, n, positions=None):
+    """values 상위 n개 주문 (positions 가 있으면 해당 위치의 주문 중에서 선택)"""
+    if positions is None:
+        positions = np.arange(len(orders))
+    return [orders[i] for i in positions[largest_n_positions(values[positions], n)]]
 
-def calculate_summary_stats(orders):
+
+def nan_mean(values):
+    """NaN 을 제외한 평균 (값이 없으면 0)"""
+    valid = values[~np.isnan(values)]
+    return float(valid.mean()) if valid.size else 0
+
+
+def calculate_summary_stats(orders, columns=None):
     """요약 통계 계산"""
     if not orders:
         return {}
 
-    total_orders = len(orders)
-    buy_orders = [o for o in orders if o.get("order_type") == "구매"]
-    sell_orders = [o for o in orders if o.get("order_type") == "판매"]
-    waiting_orders = [o for o in orders if o.get("order_status") == "대기"]
+    if columns is None:
+        columns = extract_columns(orders)
 
-    premiums = [o.get("premium") for o in orders if o.get("premium") is not None]
-    yields = [o.get("normalized_yield") for o in orders if o.get("normalized_yield") is not None]
-    liquidity_scores = [o.get("liquidity_score") for o in orders if o.get("liquidity_score") is not None]
-
-    avg_premium = sum(premiums) / len(premiums) if premiums else 0
-    avg_yield = sum(yields) / len(yields) if yields else 0
-    avg_liquidity = sum(liquidity_scores) / len(liquidity_scores) if liquidity_scores else 0
+    total_orders = len(orders)
+    buy_count = len(columns["buy_idx"])
+    sell_count = len(columns["sell_idx"])
+    waiting_count = len(columns["wait_idx"])
 
-    # 시그널 분포
-    signals = {}
-    for order in orders:
-        signal = order.get("signal", "알 수 없음")
-        signals[signal] = signals.get(signal, 0) + 1
+    avg_premium = nan_mean(columns["premium"])
+    avg_yield = nan_mean(columns["normalized_yield"])
+    avg_liquidity = nan_mean(columns["liquidity_score"])
 
     return {
         "total_orders": total_orders,
-        "buy_orders": len(buy_orders),
-        "sell_orders": len(sell_orders),
-        "waiting_orders": len(waiting_orders),
+        "buy_orders": buy_count,
+        "sell_orders": sell_count,
+        "waiting_orders": waiting_count,
         "avg_premium": round(avg_premium, 2),
         "avg_yield": round(avg_yield, 2),
         "avg_liquidity": round(avg_liquidity, 1),
-        "signals": signals,
-        "buy_ratio": round(len(buy_orders) / total_orders * 100, 1) if total_orders > 0 else 0,
-        "sell_ratio": round(len(sell_orders) / total_orders * 100, 1) if total_orders > 0 else 0,
+        "signals": columns["signal_counts"],
+        "buy_ratio": round(buy_count / total_orders * 100, 1) if total_orders > 0 else 0,
+        "sell_ratio": round(sell_count / total_orders * 100, 1) if total_orders > 0 else 0,
     }
 
 
+def cache_validators():
+    """현재 캐시 데이터의 ETag 와 수정 시각 (데이터가 없으면 None)"""
+    key = _cache["key"]
+    if key is None:
+        return None
+    _, mtime_ns, size = key
+    return f"{mtime_ns:x}-{size:x}", datetime.fromtimestamp(mtime_ns / 1e9, tz=timezone.utc)
+
+
+@app.before_request
+def check_not_modified():
+    """API 요청의 데이터가 클라이언트 캐시와 같으면 응답 생성 없이 304 반환"""
+    if not request.path.startswith("/api/"):
+        return None
+
+    start_cache_refresher()
+    # 핸들러보다 먼저 기록하므로 도중에 캐시가 바뀌어도 이전 ETag 가 붙어 다음 요청에서 다시 받는다
+    g.validators = validators = cache_validators()
+    if validators is None:
+        return None
+
+    etag, last_modified = validators
+    if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        return None
+
+    return app.response_class(status=304)
+
+
+@app.after_request
+def add_cache_headers(response):
+    """API 응답에 데이터 파일 기준 ETag/Last-Modified 와 짧은 캐시 허용 헤더 추가"""
+    validators = g.get("validators")
+    if validators is not None and response.status_code in (200, 304):
+        etag, last_modified = validators
+        response.set_etag(etag)
+        response.last_modified = last_modified
+        response.cache_control.max_age = CACHE_REFRESH_SECONDS
+    return response
+
+
 @app.route('/')
 def index():
     """메인 대시보드 페이지"""
@@ -82,7 +301,7 @@ def index():
 @app.route('/api/summary')
 def api_summary():
     """요약 통계 API"""
-    orders = load_latest_data()
+    orders, columns = load_latest_dataset()
 
     if not orders:
         return jsonify({
@@ -90,7 +309,7 @@ def api_summary():
             "timestamp": datetime.now().isoformat()
         }), 404
 
-    stats = calculate_summary_stats(orders)
+    stats = calculate_summary_stats(orders, columns)
     stats["timestamp"] = datetime.now().isoformat()
     stats["data_count"] = len(orders)
 
@@ -100,18 +319,14 @@ def api_summary():
 @app.route('/api/top-yield')
 def api_top_yield():
     """고수익률 주문 API (Top 10)"""
-    orders = load_latest_data()
+    orders, columns = load_latest_dataset()
 
     if not orders:
         return jsonify({"error": "데이터를 찾을 수 없습니다"}), 404
 
-    # 구매 주문만 필터링하고 수익률 기준 정렬
-    buy_orders = [o for o in orders if o.get("order_type") == "구매"]
-    sorted_orders = sorted(
-        buy_orders,
-        key=lambda x: x.get("normalized_yield", 0),
-        reverse=True
-    )[:10]
+    # 구매 주문 중 수익률 상위 10개 선택 (전체 정렬 없이 부분 선택, 값이 없으면 0)
+    yields = np.nan_to_num(columns["normalized_yield"], nan=0.0)
+    sorted_orders = select_top_orders(orders, yields, 10, columns["buy_idx"])
 
     return jsonify(sorted_orders)
 
@@ -119,17 +334,14 @@ def api_top_yield():
 @app.route('/api/undervalued')
 def api_undervalued():
     """저평가 주문 API (Top 10)"""
-    orders = load_latest_data()
+    orders, columns = load_latest_dataset()
 
     if not orders:
         return jsonify({"error": "데이터를 찾을 수 없습니다"}), 404
 
-    # 구매 주문만 필터링하고 프리미엄율 기준 정렬 (낮은 순)
-    buy_orders = [o for o in orders if o.get("order_type") == "구매"]
-    sorted_orders = sorted(
-        buy_orders,
-        key=lambda x: x.get("premium", 0)
-    )[:10]
+    # 구매 주문 중 프리미엄율 하위 10개 선택 (낮은 순, 부호를 바꿔 상위 선택)
+    premiums = np.nan_to_num(columns["premium"], nan=0.0)
+    sorted_orders = select_top_orders(orders, -premiums, 10, columns["buy_idx"])
 
     return jsonify(sorted_orders)
 
@@ -137,16 +349,13 @@ def api_undervalued():
 @app.route('/api/high-liquidity')
 def api_high_liquidity():
     """고유동성 주문 API (Top 10)"""
-    orders = load_latest_data()
+    orders, columns = load_latest_dataset()
 
     if not orders:
         return jsonify({"error": "데이터를 찾을 수 없습니다"}), 404
 
-    sorted_orders = sorted(
-        orders,
-        key=lambda x: x.get("liquidity_score", 0),
-        reverse=True
-    )[:10]
+    liquidity_scores = np.nan_to_num(columns["liquidity_score"], nan=0.0)
+    sorted_orders = select_top_orders(orders, liquidity_scores, 10)
 
     return jsonify(sorted_orders)
 
@@ -154,25 +363,21 @@ def api_high_liquidity():
 @app.route('/api/signals')
 def api_signals():
     """시그널 분포 API"""
-    orders = load_latest_data()
+    orders, columns = load_latest_dataset()
 
     if not orders:
         return jsonify({"error": "데이터를 찾을 수 없습니다"}), 404
 
-    signals = {}
-    for order in orders:
-        signal = order.get("signal", "알 수 없음")
-        signals[signal] = signals.get(signal, 0) + 1
-
     # 비율 계산
-    total = sum(signals.values())
+    signals = columns["signal_counts"]
+    total = len(orders)
     signal_data = [
         {
             "signal": signal,
             "count": count,
             "percentage": round(count / total * 100, 1) if total > 0 else 0
         }
-        for signal, count in sorted(signals.items(), key=lambda x: x[1], reverse=True)
+        for signal, count in signals.most_common()
     ]
 
     return jsonify(signal_data)
@@ -181,39 +386,23 @@ def api_signals():
 @app.route('/api/premium-distribution')
 def api_premium_distribution():
     """프리미엄율 분포 API"""
-    orders = load_latest_data()
+    orders, columns = load_latest_dataset()
 
     if not orders:
         return jsonify({"error": "데이터를 찾을 수 없습니다"}), 404
 
-    # 프리미엄율 구간별 분포
-    ranges = {
-        "매우 저평가 (< -20%)": 0,
-        "저평가 (-20% ~ -10%)": 0,
-        "적정 (-10% ~ 10%)": 0,
-        "고평가 (10% ~ 20%)": 0,
-        "매우 고평가 (> 20%)": 0,
-    }
-
-    for order in orders:
-        premium = order.get("premium")
-        if premium is None:
-            continue
-
-        if premium < -20:
-            ranges["매우 저평가 (< -20%)"] += 1
-        elif premium < -10:
-            ranges["저평가 (-20% ~ -10%)"] += 1
-        elif premium <= 10:
-            ranges["적정 (-10% ~ 10%)"] += 1
-        elif premium <= 20:
-            ranges["고평가 (10% ~ 20%)"] += 1
-        else:
-            ranges["매우 고평가 (> 20%)"] += 1
+    # 프리미엄율 구간별 분포 (값이 없는 주문 제외)
+    premiums = columns["premium"]
+    premiums = premiums[~np.isnan(premiums)]
+    buckets = (
+        np.searchsorted(PREMIUM_LOWER_EDGES, premiums, side="right") +
+        np.searchsorted(PREMIUM_UPPER_EDGES, premiums, side="left")
+    )
+    counts = np.bincount(buckets, minlength=len(PREMIUM_RANGE_LABELS))
 
     distribution_data = [
-        {"range": range_name, "count": count}
-        for range_name, count in ranges.items()
+        {"range": range_name, "count": int(count)}
+        for range_name, count in zip(PREMIUM_RANGE_LABELS, counts)
     ]
 
     return jsonify(distribution_data)